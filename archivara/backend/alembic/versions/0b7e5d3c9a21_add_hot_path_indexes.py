@@ -0,0 +1,65 @@
+"""add_hot_path_indexes
+
+Revision ID: 0b7e5d3c9a21
+Revises: f3a9c2d81e47
+Create Date: 2026-10-19 15:08:44.215907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e5d3c9a21'
+down_revision: Union[str, None] = 'f3a9c2d81e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# name -> definition. Built CONCURRENTLY so papers stays writable; each
+# statement runs outside the migration transaction. Verify plans with
+# check_query_plans.py. Also declared in app.models (__table_args__).
+INDEXES = {
+    # list_papers: newest first, optionally by status
+    'ix_papers_created_at': 'papers (created_at DESC)',
+    'ix_papers_status_created_at': 'papers (status, created_at DESC)',
+    # Moderation feed order; tier/baseline/flag filters are applied while
+    # walking it. Not partial: the feed binds its predicates as parameters,
+    # which a generic plan cannot match against an index predicate.
+    'ix_papers_feed_score': 'papers (((quality_score + community_upvotes) - community_downvotes) DESC)',
+    'ix_papers_published_at': 'papers (published_at DESC)',
+    # My submissions
+    'ix_papers_submitter_created_at': 'papers (submitter_id, created_at DESC)',
+    # OAI-PMH keyset harvesting
+    'ix_papers_updated_at_id': 'papers (updated_at, id)',
+    # Review queue: only the few papers awaiting review
+    'ix_papers_needs_review': 'papers (flag_count DESC, created_at) WHERE needs_review',
+    # author -> papers (the PK is paper_id-first)
+    'ix_paper_authors_author_id': 'paper_authors (author_id, paper_id)',
+    'ix_submission_attempts_user_status_created': 'submission_attempts (user_id, status, created_at DESC)',
+}
+
+
+INVALID_INDEX_SQL = sa.text("""
+    SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE c.relname = :name AND NOT i.indisvalid
+""")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            # An interrupted concurrent build leaves an INVALID index behind,
+            # which IF NOT EXISTS would keep; drop it and build again
+            if bind.execute(INVALID_INDEX_SQL, {"name": name}).scalar():
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in reversed(list(INDEXES)):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,122 @@
+"""backfill_author_stats
+
+Revision ID: 4f6b8d2a0c93
+Revises: 9e4a7c2f1d68
+Create Date: 2026-10-19 21:12:44.870215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f6b8d2a0c93'
+down_revision: Union[str, None] = '9e4a7c2f1d68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # author_stats was created empty; compute every author's row with the
+    # aggregate of app.services.author_stats (REFRESH_AUTHOR_STATS_SQL) over
+    # all authors, so profiles and readiness warm-up have data on deploy.
+    # Rows already written by a refresh are kept.
+    op.execute("""
+        WITH ap AS (
+            SELECT pa.author_id, p.id AS paper_id, p.published_at, p.categories,
+                   COALESCE(p.cited_by_count, 0) AS cited_by_count
+            FROM paper_authors pa
+            JOIN papers p ON p.id = pa.paper_id
+        ),
+        totals AS (
+            SELECT authors.id AS author_id,
+                   COUNT(ap.paper_id) AS total_papers,
+                   COALESCE(SUM(ap.cited_by_count), 0) AS total_citations
+            FROM authors
+            LEFT JOIN ap ON ap.author_id = authors.id
+            GROUP BY authors.id
+        ),
+        hidx AS (
+            SELECT r.author_id, COALESCE(MAX(r.rn) FILTER (WHERE r.cited_by_count >= r.rn), 0) AS h_index
+            FROM (
+                SELECT ap.author_id, ap.cited_by_count,
+                       ROW_NUMBER() OVER (PARTITION BY ap.author_id ORDER BY ap.cited_by_count DESC) AS rn
+                FROM ap
+            ) r
+            GROUP BY r.author_id
+        ),
+        years AS (
+            SELECT y.author_id,
+                   json_agg(json_build_object('year', y.year, 'papers', y.papers, 'citations', y.citations)
+                            ORDER BY y.year DESC) AS stats_by_year
+            FROM (
+                SELECT ap.author_id,
+                       CAST(EXTRACT(YEAR FROM ap.published_at) AS integer) AS year,
+                       COUNT(*) AS papers,
+                       SUM(ap.cited_by_count) AS citations
+                FROM ap
+                WHERE ap.published_at IS NOT NULL
+                GROUP BY 1, 2
+            ) y
+            GROUP BY y.author_id
+        ),
+        areas AS (
+            SELECT a.author_id, json_agg(a.category ORDER BY a.papers DESC, a.category) AS research_areas
+            FROM (
+                SELECT ap.author_id, c.category, COUNT(*) AS papers,
+                       ROW_NUMBER() OVER (PARTITION BY ap.author_id
+                                          ORDER BY COUNT(*) DESC, c.category) AS rn
+                FROM ap
+                CROSS JOIN LATERAL jsonb_array_elements_text(
+                    CASE WHEN jsonb_typeof(ap.categories) = 'array'
+                         THEN ap.categories ELSE CAST('[]' AS jsonb) END
+                ) WITH ORDINALITY AS c(category, pos)
+                WHERE c.pos <= 2
+                GROUP BY ap.author_id, c.category
+            ) a
+            WHERE a.rn <= 10
+            GROUP BY a.author_id
+        ),
+        collab AS (
+            SELECT c.author_id,
+                   json_agg(json_build_object('id', c.id, 'name', c.name, 'papers', c.papers)
+                            ORDER BY c.papers DESC, c.name) AS collaborators
+            FROM (
+                SELECT e.author_id, co.id, co.name, e.weight AS papers,
+                       ROW_NUMBER() OVER (PARTITION BY e.author_id
+                                          ORDER BY e.weight DESC, co.name) AS rn
+                FROM (
+                    SELECT author_a AS author_id, author_b AS coauthor_id, weight FROM coauthor_edges
+                    UNION ALL
+                    SELECT author_b, author_a, weight FROM coauthor_edges
+                ) e
+                JOIN authors co ON co.id = e.coauthor_id
+            ) c
+            WHERE c.rn <= 10
+            GROUP BY c.author_id
+        )
+        INSERT INTO author_stats (
+            author_id, total_papers, total_citations, h_index,
+            research_areas, stats_by_year, collaborators, created_at, updated_at
+        )
+        SELECT totals.author_id,
+               totals.total_papers,
+               totals.total_citations,
+               COALESCE(hidx.h_index, 0),
+               COALESCE(areas.research_areas, CAST('[]' AS json)),
+               COALESCE(years.stats_by_year, CAST('[]' AS json)),
+               COALESCE(collab.collaborators, CAST('[]' AS json)),
+               now(), now()
+        FROM totals
+        LEFT JOIN hidx ON hidx.author_id = totals.author_id
+        LEFT JOIN areas ON areas.author_id = totals.author_id
+        LEFT JOIN years ON years.author_id = totals.author_id
+        LEFT JOIN collab ON collab.author_id = totals.author_id
+        ON CONFLICT (author_id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    # The rows are derived data; the table itself is dropped by b7d2f4a91c6e
+    pass
@@ -0,0 +1,65 @@
+"""normalize_paper_dois
+
+Revision ID: 5a0e2c8d4b17
+Revises: 0b7e5d3c9a21
+Create Date: 2026-10-19 18:22:51.734019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a0e2c8d4b17'
+down_revision: Union[str, None] = '0b7e5d3c9a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same rules as app.services.citations.normalize_doi
+NORMALIZED = r"nullif(lower(btrim(regexp_replace(btrim(doi), '^(https?://(dx\.)?doi\.org/|doi:)', '', 'i'))), '')"
+
+
+def upgrade() -> None:
+    # DOIs were stored as submitted; citations compare against normalized DOIs.
+    # Papers whose DOIs normalize to the same value (e.g. "10.1/A" and
+    # "https://doi.org/10.1/a") are all left as they are: normalizing any
+    # of them could violate the unique index on papers.doi.
+    op.execute(f"""
+        WITH n AS (
+            SELECT id, {NORMALIZED} AS doi FROM papers WHERE doi IS NOT NULL
+        ),
+        unique_n AS (
+            SELECT doi FROM n WHERE doi IS NOT NULL GROUP BY doi HAVING COUNT(*) = 1
+        )
+        UPDATE papers SET doi = n.doi
+        FROM n
+        WHERE papers.id = n.id
+          AND papers.doi IS DISTINCT FROM n.doi
+          AND (n.doi IS NULL OR n.doi IN (SELECT doi FROM unique_n))
+    """)
+
+    # Link references to the papers that now match, then recount (run
+    # rebuild_citation_metrics.py afterwards to refresh author h-index)
+    op.execute("""
+        UPDATE citations c SET cited_paper_id = p.id, updated_at = now()
+        FROM papers p
+        WHERE c.cited_paper_id IS NULL
+          AND lower(p.doi) = c.cited_doi
+          AND p.id <> c.citing_paper_id
+    """)
+    op.execute("""
+        UPDATE papers SET cited_by_count = i.n
+        FROM (
+            SELECT cited_paper_id AS id, COUNT(*) AS n FROM citations
+            WHERE cited_paper_id IS NOT NULL
+            GROUP BY cited_paper_id
+        ) i
+        WHERE papers.id = i.id AND papers.cited_by_count IS DISTINCT FROM i.n
+    """)
+
+
+def downgrade() -> None:
+    # The submitted spellings are not kept; normalized DOIs remain valid
+    pass
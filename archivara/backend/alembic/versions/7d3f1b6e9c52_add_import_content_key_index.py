@@ -0,0 +1,32 @@
+"""add_import_content_key_index
+
+Revision ID: 7d3f1b6e9c52
+Revises: 5a0e2c8d4b17
+Create Date: 2026-10-19 18:47:10.392846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3f1b6e9c52'
+down_revision: Union[str, None] = '5a0e2c8d4b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Bulk import dedupes records without DOI / arXiv id on this key
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_papers_content_key")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_papers_content_key ON papers ((metadata->>'content_key')) "
+            "WHERE (metadata->>'content_key') IS NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_papers_content_key")
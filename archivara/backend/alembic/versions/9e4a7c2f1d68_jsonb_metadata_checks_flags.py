@@ -0,0 +1,37 @@
+"""jsonb_metadata_checks_flags
+
+Revision ID: 9e4a7c2f1d68
+Revises: 7d3f1b6e9c52
+Create Date: 2026-10-19 19:05:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4a7c2f1d68'
+down_revision: Union[str, None] = '7d3f1b6e9c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = ['metadata', 'baseline_checks', 'red_flags']
+
+
+def upgrade() -> None:
+    # One ALTER TABLE so papers is rewritten once (under an exclusive lock).
+    # Reading one key of a json column (cards select metadata -> 'ai_tools')
+    # re-parses the whole document, base64 PDF included; jsonb doesn't.
+    op.execute(
+        "ALTER TABLE papers "
+        + ", ".join(f"ALTER COLUMN {c} TYPE jsonb USING {c}::jsonb" for c in COLUMNS)
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE papers "
+        + ", ".join(f"ALTER COLUMN {c} TYPE json USING {c}::json" for c in COLUMNS)
+    )
@@ -0,0 +1,54 @@
+"""add_unique_vote_per_user
+
+Revision ID: a3c1e9f2b7d4
+Revises: 340cdf05e14c
+Create Date: 2026-10-19 09:12:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c1e9f2b7d4'
+down_revision: Union[str, None] = '340cdf05e14c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep only the most recent vote per (paper, user)
+    op.execute("""
+        DELETE FROM paper_votes a
+        USING paper_votes b
+        WHERE a.paper_id = b.paper_id
+          AND a.user_id = b.user_id
+          AND (a.updated_at < b.updated_at
+               OR (a.updated_at = b.updated_at AND a.id < b.id))
+    """)
+
+    # Recompute denormalized counters, which may have drifted from lost updates
+    op.execute("""
+        UPDATE papers SET
+            community_upvotes = COALESCE(v.upvotes, 0),
+            community_downvotes = COALESCE(v.downvotes, 0)
+        FROM papers p
+        LEFT JOIN (
+            SELECT paper_id,
+                   COUNT(*) FILTER (WHERE vote = 1) AS upvotes,
+                   COUNT(*) FILTER (WHERE vote = -1) AS downvotes
+            FROM paper_votes
+            GROUP BY paper_id
+        ) v ON v.paper_id = p.id
+        WHERE papers.id = p.id
+    """)
+
+    op.create_unique_constraint(
+        'uq_paper_votes_paper_user', 'paper_votes', ['paper_id', 'user_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_paper_votes_paper_user', 'paper_votes', type_='unique')
@@ -0,0 +1,38 @@
+"""add_author_stats
+
+Revision ID: b7d2f4a91c6e
+Revises: a3c1e9f2b7d4
+Create Date: 2026-10-19 10:05:12.604113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2f4a91c6e'
+down_revision: Union[str, None] = 'a3c1e9f2b7d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows are backfilled by 4f6b8d2a0c93 and refreshed on submit/delete
+    op.create_table(
+        'author_stats',
+        sa.Column('author_id', sa.String(), nullable=False),
+        sa.Column('total_papers', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('research_areas', sa.JSON(), nullable=True),
+        sa.Column('stats_by_year', sa.JSON(), nullable=True),
+        sa.Column('collaborators', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['author_id'], ['authors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('author_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('author_stats')
@@ -0,0 +1,45 @@
+"""add_coauthor_edges
+
+Revision ID: c41e8a6d2f93
+Revises: b7d2f4a91c6e
+Create Date: 2026-10-19 11:21:37.902455
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e8a6d2f93'
+down_revision: Union[str, None] = 'b7d2f4a91c6e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'coauthor_edges',
+        sa.Column('author_a', sa.String(), nullable=False),
+        sa.Column('author_b', sa.String(), nullable=False),
+        sa.Column('weight', sa.Integer(), nullable=False, server_default='1'),
+        sa.ForeignKeyConstraint(['author_a'], ['authors.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['author_b'], ['authors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('author_a', 'author_b')
+    )
+    op.create_index(op.f('ix_coauthor_edges_author_b'), 'coauthor_edges', ['author_b'], unique=False)
+
+    # Materialize existing co-authorships from paper_authors
+    op.execute("""
+        INSERT INTO coauthor_edges (author_a, author_b, weight)
+        SELECT a.author_id, b.author_id, COUNT(*)
+        FROM paper_authors a
+        JOIN paper_authors b ON b.paper_id = a.paper_id AND a.author_id < b.author_id
+        GROUP BY a.author_id, b.author_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_coauthor_edges_author_b'), table_name='coauthor_edges')
+    op.drop_table('coauthor_edges')
@@ -0,0 +1,54 @@
+"""add_citation_graph
+
+Revision ID: d58b3e0c7a14
+Revises: c41e8a6d2f93
+Create Date: 2026-10-19 12:40:03.118522
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd58b3e0c7a14'
+down_revision: Union[str, None] = 'c41e8a6d2f93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'citations',
+        sa.Column('citing_paper_id', sa.String(), nullable=False),
+        sa.Column('cited_doi', sa.String(), nullable=False),
+        sa.Column('cited_paper_id', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['citing_paper_id'], ['papers.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['cited_paper_id'], ['papers.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('citing_paper_id', 'cited_doi')
+    )
+    op.create_index(op.f('ix_citations_cited_doi'), 'citations', ['cited_doi'], unique=False)
+    op.create_index(op.f('ix_citations_cited_paper_id'), 'citations', ['cited_paper_id'], unique=False)
+
+    # Cited DOIs are matched case-insensitively against hosted papers
+    op.execute("CREATE INDEX ix_papers_doi_lower ON papers (lower(doi))")
+
+    op.add_column('papers', sa.Column('citation_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('papers', sa.Column('cited_by_count', sa.Integer(), nullable=False, server_default='0'))
+
+    op.add_column('author_stats', sa.Column('total_citations', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('author_stats', sa.Column('h_index', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('author_stats', 'h_index')
+    op.drop_column('author_stats', 'total_citations')
+    op.drop_column('papers', 'cited_by_count')
+    op.drop_column('papers', 'citation_count')
+    op.execute("DROP INDEX IF EXISTS ix_papers_doi_lower")
+    op.drop_index(op.f('ix_citations_cited_paper_id'), table_name='citations')
+    op.drop_index(op.f('ix_citations_cited_doi'), table_name='citations')
+    op.drop_table('citations')
@@ -0,0 +1,36 @@
+"""jsonb_categories_tags
+
+Revision ID: f3a9c2d81e47
+Revises: e62a7c19b3f5
+Create Date: 2026-10-19 14:31:12.604218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c2d81e47'
+down_revision: Union[str, None] = 'e62a7c19b3f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # json -> jsonb rewrites the table once; containment needs jsonb
+    op.alter_column('papers', 'categories', type_=postgresql.JSONB(), postgresql_using='categories::jsonb')
+    op.alter_column('papers', 'tags', type_=postgresql.JSONB(), postgresql_using='tags::jsonb')
+
+    # jsonb_path_ops indexes serve @> only; any-of filters are ORs of @>
+    op.execute("CREATE INDEX ix_papers_categories_gin ON papers USING gin (categories jsonb_path_ops)")
+    op.execute("CREATE INDEX ix_papers_tags_gin ON papers USING gin (tags jsonb_path_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_papers_tags_gin")
+    op.execute("DROP INDEX IF EXISTS ix_papers_categories_gin")
+    op.alter_column('papers', 'tags', type_=sa.JSON(), postgresql_using='tags::json')
+    op.alter_column('papers', 'categories', type_=sa.JSON(), postgresql_using='categories::json')
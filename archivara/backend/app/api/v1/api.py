@@ -1,8 +1,10 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.v1.endpoints import papers, auth, users, search, mcp, rag, moderation, authors
+from app.api.v1.endpoints import papers, auth, users, search, mcp, rag, moderation, authors, admin, oai, graphql
+from app.services.rate_limit import rate_limit
 
-api_router = APIRouter()
+# Global per-client budget; individual routes add stricter policies
+api_router = APIRouter(dependencies=[Depends(rate_limit("default"))])
 
 # Include all endpoint routers
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
@@ -12,4 +14,7 @@ api_router.include_router(authors.router, prefix="/authors", tags=["authors"])
 api_router.include_router(search.router, prefix="/search", tags=["search"])
 api_router.include_router(rag.router, prefix="/rag", tags=["rag"])
 api_router.include_router(mcp.router, prefix="/mcp", tags=["mcp"])
-api_router.include_router(moderation.router, prefix="/moderation", tags=["moderation"]) 
\ No newline at end of file
+api_router.include_router(moderation.router, prefix="/moderation", tags=["moderation"]) 
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+api_router.include_router(oai.router, prefix="/oai", tags=["oai-pmh"])
+api_router.include_router(graphql.router, tags=["graphql"])  # Serves /graphql, imported lazily
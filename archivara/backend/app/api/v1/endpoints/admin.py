@@ -0,0 +1,111 @@
+"""
+Admin endpoints for bulk operations.
+"""
+
+import asyncio
+import os
+import shutil
+from typing import Annotated
+
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+import structlog
+
+from app.core.config import settings
+from app.db.session import get_db, get_read_db, AsyncSessionLocal
+from app.models.import_job import ImportJob, uuid_str
+from app.models.paper import PaperStatus, VisibilityTier
+from app.models.user import User
+from app.api.v1.endpoints.auth import get_current_superuser, get_current_superuser_read
+from app.schemas.import_job import ImportJobResponse
+from app.services.bulk_import import BulkImportService
+
+router = APIRouter()
+logger = structlog.get_logger()
+
+
+async def run_import_job(job_id: str, claimed: bool = False):
+    """Run an import in the background with its own session"""
+    async with AsyncSessionLocal() as db:
+        try:
+            await BulkImportService(db).run(job_id, claimed=claimed)
+        except Exception as e:
+            # Failure and checkpoint are recorded on the job for resume
+            logger.error("Background import failed", job_id=job_id, error=str(e))
+
+
+@router.post("/imports", response_model=ImportJobResponse)
+async def start_import(
+    background_tasks: BackgroundTasks,
+    current_user: Annotated[User, Depends(get_current_superuser)],
+    file: UploadFile = File(...),
+    format: str = Form("jsonl"),  # jsonl or csv (optionally .gz)
+    status: str = Form("published"),
+    visibility_tier: str = Form("main"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Upload a JSONL/CSV metadata dump and import it in the background."""
+    if format not in ("jsonl", "csv"):
+        raise HTTPException(status_code=400, detail="Format must be jsonl or csv")
+    # Caught here rather than by the enum cast in the first batch, after the upload
+    statuses = [s.value for s in PaperStatus]
+    if status not in statuses:
+        raise HTTPException(status_code=400, detail=f"Status must be one of {', '.join(statuses)}")
+    tiers = [t.value for t in VisibilityTier]
+    if visibility_tier not in tiers:
+        raise HTTPException(status_code=400, detail=f"Visibility tier must be one of {', '.join(tiers)}")
+
+    # Keep the file on disk so the job can be resumed
+    os.makedirs(settings.BULK_IMPORT_DIR, exist_ok=True)
+    suffix = ".gz" if (file.filename or "").endswith(".gz") else ""
+    path = os.path.join(settings.BULK_IMPORT_DIR, f"{uuid_str()}.{format}{suffix}")
+
+    def save():
+        with open(path, "wb") as out:
+            shutil.copyfileobj(file.file, out, length=1024 * 1024)
+
+    await asyncio.to_thread(save)
+
+    job = await BulkImportService(db).create_job(
+        path, format, status=status, visibility_tier=visibility_tier, created_by=current_user.id
+    )
+    background_tasks.add_task(run_import_job, job.id)
+    return job
+
+
+@router.get("/imports/{job_id}", response_model=ImportJobResponse)
+async def get_import(
+    job_id: str,
+    current_user: Annotated[User, Depends(get_current_superuser_read)],
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get progress of an import job."""
+    job = await db.get(ImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+
+@router.post("/imports/{job_id}/resume", response_model=ImportJobResponse)
+async def resume_import(
+    job_id: str,
+    background_tasks: BackgroundTasks,
+    current_user: Annotated[User, Depends(get_current_superuser)],
+    db: AsyncSession = Depends(get_db),
+):
+    """Resume a failed or interrupted import from its last committed batch."""
+    job = await db.get(ImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    if job.status == "completed":
+        raise HTTPException(status_code=400, detail="Import job already completed")
+    if not os.path.exists(job.source):
+        raise HTTPException(status_code=410, detail="Import source file no longer exists")
+
+    # Only one importer may run a job; claiming is a single conditional UPDATE
+    if not await BulkImportService(db).claim(job.id):
+        raise HTTPException(status_code=409, detail="Import job is already running")
+    await db.refresh(job)
+
+    background_tasks.add_task(run_import_job, job.id, True)
+    return job
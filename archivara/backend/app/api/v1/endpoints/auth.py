@@ -1,5 +1,6 @@
 from datetime import timedelta, datetime
-from typing import Annotated
+from functools import lru_cache
+from typing import Annotated, Optional
 import secrets
 
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request
@@ -7,8 +8,6 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from authlib.integrations.starlette_client import OAuth
-import httpx
 
 from app.core.config import settings
 from app.core.security import (
@@ -16,29 +15,34 @@ from app.core.security import (
     get_password_hash,
     verify_password,
 )
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, Token
+from app.services.rate_limit import rate_limit
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
-# Initialize OAuth
-oauth = OAuth()
-oauth.register(
-    name='google',
-    client_id=settings.GOOGLE_CLIENT_ID,
-    client_secret=settings.GOOGLE_CLIENT_SECRET,
-    server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
-    client_kwargs={'scope': 'openid email profile'}
-)
 
+@lru_cache(maxsize=1)
+def get_oauth():
+    """OAuth registry, built on the first Google login rather than at import"""
+    from authlib.integrations.starlette_client import OAuth
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    """Get current authenticated user."""
+    oauth = OAuth()
+    oauth.register(
+        name='google',
+        client_id=settings.GOOGLE_CLIENT_ID,
+        client_secret=settings.GOOGLE_CLIENT_SECRET,
+        server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
+        client_kwargs={'scope': 'openid email profile'}
+    )
+    return oauth
+
+
+async def _authenticate(token: str, db: AsyncSession) -> User:
+    """Resolve a bearer token to its user, or raise 401."""
     from jose import JWTError, jwt
     
     credentials_exception = HTTPException(
@@ -63,6 +67,55 @@ async def get_current_user(
     return user
 
 
+def _require_superuser(user: User) -> User:
+    if not user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return user
+
+
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """Get current authenticated user."""
+    return await _authenticate(token, db)
+
+
+async def get_current_user_read(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: AsyncSession = Depends(get_read_db)
+) -> User:
+    """Get current authenticated user from a read replica (for read-only routes)."""
+    return await _authenticate(token, db)
+
+
+async def get_optional_user_read(
+    token: Annotated[Optional[str], Depends(optional_oauth2_scheme)],
+    db: AsyncSession = Depends(get_read_db)
+) -> Optional[User]:
+    """Current user if a bearer token was sent, else None (for public read routes)."""
+    if token is None:
+        return None
+    return await _authenticate(token, db)
+
+
+async def get_current_superuser(
+    current_user: Annotated[User, Depends(get_current_user)]
+) -> User:
+    """Require an admin user."""
+    return _require_superuser(current_user)
+
+
+async def get_current_superuser_read(
+    current_user: Annotated[User, Depends(get_current_user_read)]
+) -> User:
+    """Require an admin user, looked up on a read replica."""
+    return _require_superuser(current_user)
+
+
 async def send_verification_email(email: str, token: str):
     """Send verification email using Resend API"""
     import resend
@@ -129,7 +182,7 @@ async def send_verification_email(email: str, token: str):
         pass
 
 
-@router.post("/register", response_model=UserResponse)
+@router.post("/register", response_model=UserResponse, dependencies=[Depends(rate_limit("auth:register"))])
 async def register(
     user_in: UserCreate,
     background_tasks: BackgroundTasks,
@@ -191,7 +244,7 @@ async def register(
     return user
 
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(rate_limit("auth:login"))])
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db)
@@ -230,7 +283,7 @@ async def login(
 
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(
-    current_user: Annotated[User, Depends(get_current_user)]
+    current_user: Annotated[User, Depends(get_current_user_read)]
 ):
     """Get current user."""
     return current_user
@@ -271,7 +324,7 @@ async def verify_email(
 async def google_login(request: Request):
     """Initiate Google OAuth login flow."""
     redirect_uri = f"{settings.BACKEND_URL}/api/v1/auth/google/callback"
-    return await oauth.google.authorize_redirect(request, redirect_uri)
+    return await get_oauth().google.authorize_redirect(request, redirect_uri)
 
 
 @router.get("/google/callback")
@@ -281,7 +334,7 @@ async def google_callback(
 ):
     """Handle Google OAuth callback."""
     try:
-        token = await oauth.google.authorize_access_token(request)
+        token = await get_oauth().google.authorize_access_token(request)
         user_info = token.get('userinfo')
 
         if not user_info:
@@ -348,6 +401,8 @@ async def google_token_login(
     db: AsyncSession = Depends(get_db)
 ):
     """Verify Google ID token and login (for frontend Google Sign-In)."""
+    import httpx
+
     try:
         # Verify the token with Google
         async with httpx.AsyncClient() as client:
@@ -1,22 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
-from typing import Optional
-from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
 
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.models.paper import Author, Paper, paper_authors
-from app.schemas.author import AuthorResponse, AuthorDetailResponse
+from app.schemas.author import (
+    AuthorResponse, AuthorDetailResponse, CollaboratorInfo,
+    NeighborhoodResponse, CollaborationPathResponse
+)
+from app.services.author_stats import AuthorStatsService
+from app.services.coauthor_graph import coauthor_graph_cache
+from app.services.votes import vote_aggregator
+from app.services.fieldsets import PaperFieldset, paper_fieldset
+from app.schemas.paper import PaperResponse
 
 router = APIRouter()
 
+# Fan-out bounds for graph queries
+MAX_GRAPH_NODES = 500
+MAX_GRAPH_EDGES = 2000
+MAX_PATH_VISITED = 100_000
+
+
+async def _author_names(db: AsyncSession, author_ids: Iterable[str]) -> Dict[str, str]:
+    result = await db.execute(
+        select(Author.id, Author.name).where(Author.id.in_(list(author_ids)))
+    )
+    return dict(result.all())
+
+
+async def _require_author(db: AsyncSession, author_id: str) -> None:
+    exists = await db.scalar(select(Author.id).where(Author.id == author_id))
+    if not exists:
+        raise HTTPException(status_code=404, detail="Author not found")
+
 @router.get("/{author_id}", response_model=AuthorDetailResponse)
 async def get_author(
     author_id: str,
-    db: AsyncSession = Depends(get_db)
+    fieldset: Optional[PaperFieldset] = Depends(paper_fieldset),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get detailed author information including papers, stats, and collaborators"""
+    """
+    Get detailed author information including papers, stats, and collaborators.
+
+    `fields=`/`include=` shape the recent papers (default: full papers with
+    authors, models and tools).
+    """
 
     # Get author
     query = select(Author).where(Author.id == author_id)
@@ -26,70 +57,32 @@ async def get_author(
     if not author:
         raise HTTPException(status_code=404, detail="Author not found")
 
-    # Get author's papers with all relationships
+    # Aggregates are precomputed; only the rendered papers are loaded
+    stats = await AuthorStatsService(db).get(author_id)
+
+    # Prepare recent papers (top 10)
     papers_query = (
         select(Paper)
         .join(paper_authors)
         .where(paper_authors.c.author_id == author_id)
-        .options(
-            selectinload(Paper.authors),
-            selectinload(Paper.models),
-            selectinload(Paper.tools)
-        )
+        .options(*(
+            fieldset.options() if fieldset else (
+                selectinload(Paper.authors),
+                selectinload(Paper.models),
+                selectinload(Paper.tools)
+            )
+        ))
         .order_by(Paper.published_at.desc())
+        .limit(10)
     )
     papers_result = await db.execute(papers_query)
     papers = papers_result.scalars().all()
 
-    # Calculate statistics
-    total_papers = len(papers)
-    total_citations = 0  # TODO: Add citation tracking
-
-    # Calculate h-index (simplified - would need citation data for real calculation)
-    h_index = min(total_papers, 10)  # Placeholder
-
-    # Extract research areas from paper categories
-    research_areas = set()
-    for paper in papers:
-        if paper.categories:
-            research_areas.update(paper.categories[:2])  # Take first 2 categories per paper
-
-    # Find collaborators
-    collaborator_counts = defaultdict(int)
-    collaborator_info = {}
-
-    for paper in papers:
-        for coauthor in paper.authors:
-            if coauthor.id != author_id:
-                collaborator_counts[coauthor.id] += 1
-                if coauthor.id not in collaborator_info:
-                    collaborator_info[coauthor.id] = {
-                        "id": coauthor.id,
-                        "name": coauthor.name,
-                        "papers": 0
-                    }
-                collaborator_info[coauthor.id]["papers"] = collaborator_counts[coauthor.id]
-
-    # Sort collaborators by paper count
-    top_collaborators = sorted(
-        collaborator_info.values(),
-        key=lambda x: x["papers"],
-        reverse=True
-    )[:10]
-
-    # Calculate stats by year
-    stats_by_year = defaultdict(lambda: {"year": 0, "papers": 0, "citations": 0})
-    for paper in papers:
-        year = paper.published_at.year
-        stats_by_year[year]["year"] = year
-        stats_by_year[year]["papers"] += 1
-        # TODO: Add citation data
-
-    stats_list = sorted(stats_by_year.values(), key=lambda x: x["year"], reverse=True)
-
-    # Prepare recent papers (top 10)
-    from app.schemas.paper import PaperResponse
-    recent_papers = [PaperResponse.from_paper(p) for p in papers[:10]]
+    if fieldset:
+        recent_papers = [fieldset.serialize(p) for p in papers]
+    else:
+        recent_papers = [PaperResponse.from_paper(p) for p in papers]
+    await vote_aggregator.merge_pending(recent_papers)
 
     return AuthorDetailResponse(
         id=author.id,
@@ -98,20 +91,20 @@ async def get_author(
         affiliation=author.affiliation,
         orcid=author.orcid,
         is_ai_model=author.is_ai_model,
-        h_index=h_index,
-        total_citations=total_citations,
-        total_papers=total_papers,
-        research_areas=list(research_areas)[:10],
+        h_index=stats.h_index,
+        total_citations=stats.total_citations,
+        total_papers=stats.total_papers,
+        research_areas=stats.research_areas or [],
         recent_papers=recent_papers,
-        collaborators=top_collaborators,
-        stats_by_year=stats_list[:5]
+        collaborators=stats.collaborators or [],
+        stats_by_year=(stats.stats_by_year or [])[:5]
     )
 
 @router.get("/", response_model=list[AuthorResponse])
 async def search_authors(
     query: Optional[str] = None,
     limit: int = 20,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Search for authors by name"""
 
@@ -126,3 +119,83 @@ async def search_authors(
     authors = result.scalars().all()
 
     return [AuthorResponse.from_author(a) for a in authors]
+
+
+@router.get("/{author_id}/graph/collaborators", response_model=List[CollaboratorInfo])
+async def get_top_collaborators(
+    author_id: str,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Strongest co-authors by number of shared papers"""
+    await _require_author(db, author_id)
+    graph = await coauthor_graph_cache.get(db)
+
+    collaborators = graph.top_collaborators(author_id, limit)
+    names = await _author_names(db, [cid for cid, _ in collaborators])
+    return [
+        CollaboratorInfo(id=cid, name=names.get(cid, ""), papers=weight)
+        for cid, weight in collaborators
+    ]
+
+
+@router.get("/{author_id}/graph/neighborhood", response_model=NeighborhoodResponse)
+async def get_collaboration_neighborhood(
+    author_id: str,
+    depth: int = Query(2, ge=1, le=3),
+    limit: int = Query(100, ge=1, le=MAX_GRAPH_NODES),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Authors within `depth` co-authorship hops, capped at `limit` nodes"""
+    await _require_author(db, author_id)
+    graph = await coauthor_graph_cache.get(db)
+
+    distances, truncated = graph.neighborhood(author_id, depth, limit)
+    if not distances:
+        distances = {author_id: 0}
+    edges = graph.edges_within(list(distances), MAX_GRAPH_EDGES)
+    names = await _author_names(db, distances)
+
+    return NeighborhoodResponse(
+        author_id=author_id,
+        depth=depth,
+        nodes=[
+            {"id": aid, "name": names.get(aid, ""), "distance": distance}
+            for aid, distance in sorted(distances.items(), key=lambda x: x[1])
+        ],
+        edges=[
+            {"source": source, "target": target, "weight": weight}
+            for source, target, weight in edges
+        ],
+        truncated=truncated or len(edges) >= MAX_GRAPH_EDGES
+    )
+
+
+@router.get("/{author_id}/graph/path/{other_id}", response_model=CollaborationPathResponse)
+async def get_collaboration_path(
+    author_id: str,
+    other_id: str,
+    max_depth: int = Query(6, ge=1, le=8),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Shortest chain of co-authors connecting two authors"""
+    await _require_author(db, author_id)
+    await _require_author(db, other_id)
+    graph = await coauthor_graph_cache.get(db)
+
+    path = graph.shortest_path(author_id, other_id, max_depth, MAX_PATH_VISITED)
+    if path is None:
+        return CollaborationPathResponse(
+            source_id=author_id, target_id=other_id, distance=None, path=[]
+        )
+
+    names = await _author_names(db, [aid for aid, _ in path])
+    return CollaborationPathResponse(
+        source_id=author_id,
+        target_id=other_id,
+        distance=len(path) - 1,
+        path=[
+            {"id": aid, "name": names.get(aid, ""), "shared_papers": weight}
+            for aid, weight in path
+        ]
+    )
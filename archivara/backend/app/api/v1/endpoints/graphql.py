@@ -0,0 +1,49 @@
+"""
+GraphQL endpoint, mounted lazily.
+
+strawberry, graphql-core and the schema add ~100-160 ms to `import
+app.main`, so the route is a thin ASGI app that imports
+app.graphql.router on the first GraphQL request and hands it every
+request from then on. The schema has no subscriptions, so only HTTP is
+routed.
+"""
+
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.services.rate_limit import rate_limit
+
+GRAPHQL_PATH = f"{settings.API_V1_STR}/graphql"
+
+
+class LazyGraphQLApp:
+    """Builds the strawberry router on first use"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._app: Optional[ASGIApp] = None
+        self._lock = asyncio.Lock()
+
+    async def _load(self) -> ASGIApp:
+        async with self._lock:
+            if self._app is None:
+                from app.graphql.router import router as graphql_router
+
+                # Routed by full path; api_router's dependencies don't reach
+                # a plain route, so the default rate limit is applied here
+                app = APIRouter(dependencies=[Depends(rate_limit("default"))])
+                app.include_router(graphql_router, prefix=self.path)
+                self._app = app
+        return self._app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        app = self._app or await self._load()
+        await app(scope, receive, send)
+
+
+router = APIRouter()
+router.add_route("/graphql", LazyGraphQLApp(GRAPHQL_PATH), methods=["GET", "POST"], include_in_schema=False)
@@ -5,14 +5,20 @@ Moderation API endpoints for community filtering and paper quality control.
 from typing import List, Optional, Annotated
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc
+from sqlalchemy import select, and_, or_, desc, func
 from pydantic import BaseModel
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.db.filters import jsonb_contains_all, jsonb_contains_any
 from app.models.paper import Paper, PaperVote, PaperFlag, VisibilityTier, BaselineStatus
 from app.models.user import User
-from app.api.v1.endpoints.auth import get_current_user
+from app.api.v1.endpoints.auth import get_current_user, get_current_user_read
 from app.services.moderation import ModerationService
+from app.services.rate_limit import rate_limit
+from app.services.votes import VoteService, vote_aggregator
+from app.services.paper_cards import card_query, to_cards
+from app.services.paper_cache import paper_cache
+from app.schemas.paper import PaperCardList
 
 router = APIRouter()
 
@@ -42,7 +48,7 @@ class FeedQuery(BaseModel):
     exclude_flagged: bool = True
 
 
-@router.post("/papers/{paper_id}/vote")
+@router.post("/papers/{paper_id}/vote", dependencies=[Depends(rate_limit("moderation:vote"))])
 async def vote_on_paper(
     paper_id: str,
     vote_request: VoteRequest,
@@ -61,86 +67,28 @@ async def vote_on_paper(
             detail="Vote must be -1, 0, or 1"
         )
 
-    # Get paper
-    result = await db.execute(select(Paper).where(Paper.id == paper_id))
-    paper = result.scalar_one_or_none()
-    if not paper:
+    # Upsert the vote and adjust counters atomically in one statement
+    vote_service = VoteService(db)
+    result = await vote_service.cast_vote(paper_id, current_user.id, vote_request.vote)
+    if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Paper not found"
         )
 
-    # Check if user already voted
-    result = await db.execute(
-        select(PaperVote).where(
-            and_(
-                PaperVote.paper_id == paper_id,
-                PaperVote.user_id == current_user.id
-            )
-        )
-    )
-    existing_vote = result.scalar_one_or_none()
+    await vote_service.commit()
 
     if vote_request.vote == 0:
-        # Remove vote
-        if existing_vote:
-            # Update paper vote counts
-            if existing_vote.vote == 1:
-                paper.community_upvotes = max(0, paper.community_upvotes - 1)
-            elif existing_vote.vote == -1:
-                paper.community_downvotes = max(0, paper.community_downvotes - 1)
-
-            await db.delete(existing_vote)
-            await db.commit()
-
-        return {"message": "Vote removed", "net_votes": paper.community_upvotes - paper.community_downvotes}
-
-    if existing_vote:
-        # Update existing vote
-        old_vote = existing_vote.vote
-
-        # Remove old vote from counts
-        if old_vote == 1:
-            paper.community_upvotes = max(0, paper.community_upvotes - 1)
-        elif old_vote == -1:
-            paper.community_downvotes = max(0, paper.community_downvotes - 1)
-
-        # Add new vote to counts
-        if vote_request.vote == 1:
-            paper.community_upvotes += 1
-        elif vote_request.vote == -1:
-            paper.community_downvotes += 1
-
-        existing_vote.vote = vote_request.vote
-    else:
-        # Create new vote
-        new_vote = PaperVote(
-            paper_id=paper_id,
-            user_id=current_user.id,
-            vote=vote_request.vote
-        )
-        db.add(new_vote)
-
-        # Update paper vote counts
-        if vote_request.vote == 1:
-            paper.community_upvotes += 1
-        elif vote_request.vote == -1:
-            paper.community_downvotes += 1
-
-    # Recalculate visibility tier based on new votes
-    mod_service = ModerationService(db, use_llm=False)  # Skip LLM for faster voting
-    paper.visibility_tier = await mod_service.assign_visibility_tier(paper)
-
-    await db.commit()
+        return {"message": "Vote removed", "net_votes": result.net_votes}
 
     return {
         "message": "Vote recorded",
-        "net_votes": paper.community_upvotes - paper.community_downvotes,
-        "visibility_tier": paper.visibility_tier.value
+        "net_votes": result.net_votes,
+        "visibility_tier": result.visibility_tier.value
     }
 
 
-@router.post("/papers/{paper_id}/flag")
+@router.post("/papers/{paper_id}/flag", dependencies=[Depends(rate_limit("moderation:flag"))])
 async def flag_paper(
     paper_id: str,
     flag_request: FlagRequest,
@@ -206,6 +154,7 @@ async def flag_paper(
     paper.visibility_tier = await mod_service.assign_visibility_tier(paper)
 
     await db.commit()
+    await paper_cache.invalidate([paper_id])
 
     return {
         "message": "Paper flagged for review",
@@ -217,7 +166,7 @@ async def flag_paper(
 @router.get("/papers/{paper_id}/moderation-status", response_model=ModerationStatusResponse)
 async def get_moderation_status(
     paper_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get moderation status and metrics for a paper"""
     result = await db.execute(select(Paper).where(Paper.id == paper_id))
@@ -228,6 +177,8 @@ async def get_moderation_status(
             detail="Paper not found"
         )
 
+    await vote_aggregator.merge_pending([paper])
+
     return ModerationStatusResponse(
         baseline_status=paper.baseline_status.value,
         quality_score=paper.quality_score,
@@ -241,14 +192,16 @@ async def get_moderation_status(
     )
 
 
-@router.get("/feed")
+@router.get("/feed", response_model=PaperCardList)
 async def get_feed(
     tier: Optional[str] = Query(None, description="Filter by tier: frontpage, main, raw"),
     min_score: Optional[int] = Query(None, description="Minimum quality score"),
     exclude_flagged: bool = Query(True, description="Exclude heavily flagged papers"),
+    category: Optional[List[str]] = Query(None, description="Match any of these categories"),
+    tag: Optional[List[str]] = Query(None, description="Match all of these tags"),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get paper feed with filtering by visibility tier and quality.
@@ -257,8 +210,11 @@ async def get_feed(
     - frontpage: High-quality, community-endorsed papers
     - main: Default feed, all passing papers
     - raw: Everything, including low-quality (for transparency)
+
+    `category` matches papers in any of the given categories, `tag` papers
+    carrying all of the given tags.
     """
-    query = select(Paper).where(Paper.status != "rejected")
+    query = card_query().where(Paper.status != "rejected")
 
     # Filter by tier
     if tier:
@@ -292,6 +248,11 @@ async def get_feed(
     if exclude_flagged:
         query = query.where(Paper.flag_count < 5)
 
+    if category:
+        query = query.where(jsonb_contains_any(Paper.categories, category))
+    if tag:
+        query = query.where(jsonb_contains_all(Paper.tags, tag))
+
     # Order by score (quality + community votes)
     query = query.order_by(
         desc(Paper.quality_score + Paper.community_upvotes - Paper.community_downvotes)
@@ -307,15 +268,16 @@ async def get_feed(
     query = query.offset(offset).limit(size)
 
     result = await db.execute(query)
-    papers = result.scalars().all()
-
-    return {
-        "items": papers,
-        "total": total,
-        "page": page,
-        "size": size,
-        "pages": (total + size - 1) // size
-    }
+    cards = to_cards(result.all())
+    await vote_aggregator.merge_pending(cards)
+
+    return PaperCardList(
+        items=cards,
+        total=total,
+        page=page,
+        size=size,
+        pages=(total + size - 1) // size
+    )
 
 
 @router.post("/papers/{paper_id}/reprocess")
@@ -339,6 +301,7 @@ async def reprocess_moderation(
     # Run moderation pipeline
     mod_service = ModerationService(db)
     await mod_service.process_new_submission(paper)
+    await paper_cache.invalidate([paper_id])
 
     return {
         "message": "Moderation reprocessed",
@@ -351,8 +314,8 @@ async def reprocess_moderation(
 @router.get("/papers/{paper_id}/my-vote")
 async def get_my_vote(
     paper_id: str,
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: AsyncSession = Depends(get_db)
+    current_user: Annotated[User, Depends(get_current_user_read)],
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get the current user's vote on a paper"""
     result = await db.execute(
@@ -0,0 +1,91 @@
+"""
+OAI-PMH 2.0 endpoint for metadata harvesters.
+"""
+
+from typing import Dict
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_read_db
+from app.services import oai_pmh
+from app.services.oai_pmh import OAIError
+
+router = APIRouter()
+
+XML_MEDIA_TYPE = "text/xml; charset=utf-8"
+
+# Arguments allowed per verb (besides "verb" itself)
+VERB_ARGUMENTS = {
+    "Identify": set(),
+    "ListMetadataFormats": {"identifier"},
+    "ListSets": {"resumptionToken"},
+    "GetRecord": {"identifier", "metadataPrefix"},
+    "ListIdentifiers": {"metadataPrefix", "from", "until", "set", "resumptionToken"},
+    "ListRecords": {"metadataPrefix", "from", "until", "set", "resumptionToken"},
+}
+
+
+async def _oai_arguments(request: Request) -> Dict[str, str]:
+    if request.method == "POST":
+        items = list((await request.form()).multi_items())
+    else:
+        items = list(request.query_params.multi_items())
+    args: Dict[str, str] = {}
+    for key, value in items:
+        if key in args:
+            raise OAIError("badArgument", f"Repeated argument: {key}")
+        args[key] = str(value)
+    return args
+
+
+def _validate(args: Dict[str, str]) -> str:
+    verb = args.get("verb")
+    if verb not in VERB_ARGUMENTS:
+        raise OAIError("badVerb", "Illegal or missing verb")
+    unknown = set(args) - VERB_ARGUMENTS[verb] - {"verb"}
+    if unknown:
+        raise OAIError("badArgument", f"Illegal arguments: {', '.join(sorted(unknown))}")
+    if verb == "GetRecord":
+        if not args.get("identifier") or not args.get("metadataPrefix"):
+            raise OAIError("badArgument", "identifier and metadataPrefix are required")
+        if args["metadataPrefix"] not in oai_pmh.METADATA_FORMATS:
+            raise OAIError("cannotDisseminateFormat", f"Unsupported metadataPrefix: {args['metadataPrefix']}")
+    return verb
+
+
+@router.api_route("", methods=["GET", "POST"])
+async def oai_pmh_endpoint(request: Request, db: AsyncSession = Depends(get_read_db)):
+    """
+    OAI-PMH 2.0 request handler (oai_dc metadata).
+
+    ListRecords/ListIdentifiers are streamed; resumption tokens carry the
+    (updated_at, id) position of the last record returned.
+    """
+    base_url = str(request.url.replace(query=""))
+    args: Dict[str, str] = {}
+    try:
+        args = await _oai_arguments(request)
+        verb = _validate(args)
+
+        if verb == "Identify":
+            body = await oai_pmh.identify(db, base_url, args)
+        elif verb == "ListMetadataFormats":
+            if args.get("identifier"):
+                await oai_pmh.get_record(db, base_url, {**args, "metadataPrefix": oai_pmh.OAI_DC_PREFIX})
+            body = oai_pmh.list_metadata_formats(base_url, args)
+        elif verb == "ListSets":
+            body = await oai_pmh.list_sets(db, base_url, args)
+        elif verb == "GetRecord":
+            body = await oai_pmh.get_record(db, base_url, args)
+        else:
+            state = oai_pmh.harvest_state(args)
+            return StreamingResponse(
+                oai_pmh.stream_list(base_url, args, state, with_metadata=verb == "ListRecords"),
+                media_type=XML_MEDIA_TYPE,
+            )
+    except OAIError as e:
+        body = oai_pmh.error_response(base_url, args, e)
+
+    return Response(content=body, media_type=XML_MEDIA_TYPE)
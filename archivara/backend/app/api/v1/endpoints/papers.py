@@ -1,60 +1,85 @@
-from typing import List, Optional, Annotated
-from datetime import datetime
+from typing import List, Optional, Annotated, Tuple
+from datetime import datetime, timedelta, timezone
 import json
 import io
 import base64
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import String, any_, cast, select, func
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import selectinload
 from uuid import UUID
 
-from app.db.session import get_db
-from app.models.paper import Paper, Author, Model, Tool, SubmissionAttempt, BaselineStatus, paper_authors
+from app.db.session import get_db, get_read_db, replica_router
+from app.db.filters import jsonb_contains_all, jsonb_contains_any
+from app.models.paper import (
+    Paper, Model, Tool, SubmissionAttempt, BaselineStatus, PaperStatus, VisibilityTier
+)
 from app.models.user import User
 from app.lib.verification import isVerifiedEmailDomain
-from app.schemas.paper import PaperCreate, PaperResponse, PaperList, PaperUpdate
+from app.schemas.paper import (
+    PaperCreate, PaperResponse, PaperCardList, PaperUpdate, PaperBatchRequest, PaperBatchResponse
+)
 from app.services.storage import storage_service
 from app.services.embeddings import embedding_service
 from app.services.moderation import ModerationService
+from app.services.authors import AuthorResolutionService
+from app.services.author_stats import AuthorStatsService
+from app.services.coauthor_graph import CoauthorGraphService, coauthor_graph_cache
+from app.services.citations import CitationService, normalize_doi
+from app.services.rate_limit import (
+    Policy, RateLimitResult, check_log, rate_limiter, rate_limit, SUBMISSION_COOLDOWN
+)
+from app.services.votes import vote_aggregator
+from app.services.paper_cards import card_query, to_cards
+from app.services.fieldsets import PaperFieldset, paper_fieldset
+from app.services.paper_cache import paper_cache, without_bulky_meta
+from app.services.export import (
+    ExportFilters, parse_columns, stream_export, export_media_type, export_filename
+)
 # from app.services.vector_db import vector_db_service  # TODO: Reimplement vector DB service
 from app.core.config import settings
-from app.api.v1.endpoints.auth import get_current_user
+from app.api.v1.endpoints.auth import get_current_user, get_current_user_read, get_optional_user_read
 from fastapi.responses import StreamingResponse, RedirectResponse
 from urllib.parse import urlparse
 
 router = APIRouter()
 
+MAX_BATCH_IDS = 300
 
-@router.get("/", response_model=PaperList)
+
+@router.get("/", response_model=None, responses={200: {"model": PaperCardList}})
 async def list_papers(
     page: int = 1,
     size: int = 20,
     status: Optional[str] = None,
-    domain: Optional[List[str]] = None,
-    db: AsyncSession = Depends(get_db)
+    category: Optional[List[str]] = Query(None, description="Match any of these categories"),
+    domain: Optional[List[str]] = Query(None, deprecated=True, description="Alias of category"),
+    tag: Optional[List[str]] = Query(None, description="Match all of these tags"),
+    fieldset: Optional[PaperFieldset] = Depends(paper_fieldset),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List papers with pagination and filtering"""
-    # Build query with eager loading
-    query = select(Paper).options(
-        selectinload(Paper.authors),
-        selectinload(Paper.models),
-        selectinload(Paper.tools)
-    )
-    
+    """
+    List papers with pagination and filtering.
+
+    Returns paper cards by default; `fields=`/`include=` select exactly the
+    columns and relationships to return instead.
+    """
+    query = select(Paper).options(*fieldset.options()) if fieldset else card_query()
+
+    filters = []
     if status:
-        query = query.where(Paper.status == status)
-    
-    if domain:
-        # Filter by any matching domain
-        for d in domain:
-            query = query.where(Paper.domain.contains([d]))
+        filters.append(Paper.status == status)
+    categories = (category or []) + (domain or [])
+    if categories:
+        filters.append(jsonb_contains_any(Paper.categories, categories))
+    if tag:
+        filters.append(jsonb_contains_all(Paper.tags, tag))
+    query = query.where(*filters)
     
     # Get total count
-    count_query = select(func.count()).select_from(Paper)
-    if status:
-        count_query = count_query.where(Paper.status == status)
+    count_query = select(func.count()).select_from(Paper).where(*filters)
     
     result = await db.execute(count_query)
     total = result.scalar()
@@ -65,24 +90,148 @@ async def list_papers(
     
     # Execute query
     result = await db.execute(query)
-    papers = result.scalars().all()
+    if fieldset:
+        items = [fieldset.serialize(paper) for paper in result.scalars().all()]
+    else:
+        items = to_cards(result.all())
+    await vote_aggregator.merge_pending(items)
     
-    return PaperList(
-        items=[PaperResponse.from_paper(paper) for paper in papers],
-        total=total,
-        page=page,
-        size=size,
-        pages=(total + size - 1) // size
+    page_info = dict(total=total, page=page, size=size, pages=(total + size - 1) // size)
+    if fieldset:
+        return {"items": items, **page_info}
+    return PaperCardList(items=items, **page_info)
+
+
+@router.get("/export", dependencies=[Depends(rate_limit("papers:export"))])
+async def export_papers(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = False,
+    columns: Optional[str] = Query(None, description="Comma-separated column projection"),
+    status: Optional[str] = None,
+    visibility_tier: Optional[str] = None,
+    category: Optional[List[str]] = Query(None, description="Match any of these categories"),
+    updated_since: Optional[datetime] = None,
+    updated_until: Optional[datetime] = None,
+    min_quality: Optional[int] = None,
+    current_user: Optional[User] = Depends(get_optional_user_read),
+):
+    """
+    Stream the paper catalogue as NDJSON or CSV (optionally gzipped).
+
+    Exports the papers OAI-PMH exposes (not rejected, not hidden). Admins
+    filtering by status or visibility tier see every paper, including
+    rejected and hidden ones.
+    """
+    is_admin = current_user is not None and current_user.is_superuser
+    if not is_admin and (
+        status == PaperStatus.REJECTED.value or visibility_tier == VisibilityTier.HIDDEN.value
+    ):
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    try:
+        selected = parse_columns(columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filters = ExportFilters(
+        status=status,
+        visibility_tier=visibility_tier,
+        categories=category,
+        updated_since=updated_since,
+        updated_until=updated_until,
+        min_quality=min_quality,
+        public_only=not (is_admin and (status or visibility_tier)),
+    )
+    return StreamingResponse(
+        stream_export(selected, filters, fmt=format, compress=gzip),
+        media_type=export_media_type(format, gzip),
+        headers={
+            "Content-Disposition": f'attachment; filename="{export_filename(format, gzip)}"'
+        },
     )
 
 
-@router.get("/my-submissions", response_model=List[PaperResponse])
+async def _load_paper_responses(
+    db: AsyncSession, paper_ids: List[str]
+) -> Tuple[List[PaperResponse], List[str]]:
+    """
+    Papers in request order, read through the paper cache. Misses are
+    loaded with one `id = ANY(:ids)` query plus one batched load per
+    relationship. Returns (found, missing ids).
+    """
+    cached = await paper_cache.get_many(paper_ids)
+    misses = [i for i in paper_ids if i not in cached]
+    if misses:
+        result = await db.execute(
+            select(Paper)
+            .where(Paper.id == any_(cast(misses, ARRAY(String))))
+            .options(
+                selectinload(Paper.authors),
+                selectinload(Paper.models),
+                selectinload(Paper.tools)
+            )
+        )
+        loaded = [without_bulky_meta(PaperResponse.from_paper(p)) for p in result.scalars().all()]
+        # A lagging replica could re-cache a version an edit just invalidated
+        if not replica_router.may_be_stale(db):
+            await paper_cache.set_many(loaded)
+        cached.update({str(p.id): p for p in loaded})
+
+    found = [cached[i] for i in paper_ids if i in cached]
+    missing = [i for i in paper_ids if i not in cached]
+    return found, missing
+
+
+async def _batch_response(db: AsyncSession, ids: List[str]) -> PaperBatchResponse:
+    # De-duplicate, keeping first occurrence order
+    paper_ids = list(dict.fromkeys(i.strip() for i in ids if i and i.strip()))
+    if not paper_ids:
+        raise HTTPException(status_code=400, detail="No paper ids given")
+    if len(paper_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request")
+
+    items, missing = await _load_paper_responses(db, paper_ids)
+    await vote_aggregator.merge_pending(items)
+    return PaperBatchResponse(items=items, missing=missing)
+
+
+@router.get("/batch", response_model=PaperBatchResponse)
+async def get_papers_batch(
+    ids: List[str] = Query(..., description="Paper ids, repeated or comma-separated"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Fetch many papers at once, in the requested order"""
+    return await _batch_response(db, [i for value in ids for i in value.split(",")])
+
+
+@router.post("/batch", response_model=PaperBatchResponse)
+async def post_papers_batch(
+    batch: PaperBatchRequest,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Fetch many papers at once (for id lists too long for a query string)"""
+    return await _batch_response(db, batch.ids)
+
+
+@router.get("/my-submissions", response_model=None, responses={200: {"model": List[PaperResponse]}})
 async def get_my_submissions(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: AsyncSession = Depends(get_db),
+    current_user: Annotated[User, Depends(get_current_user_read)],
+    fieldset: Optional[PaperFieldset] = Depends(paper_fieldset),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get current user's paper submissions."""
-    query = select(Paper).where(Paper.submitter_id == current_user.id).options(
+    """Get current user's paper submissions (sparse with `fields=`/`include=`)."""
+    query = (
+        select(Paper)
+        .where(Paper.submitter_id == current_user.id)
+        .order_by(Paper.created_at.desc())
+    )
+    if fieldset:
+        query = query.options(*fieldset.options())
+        result = await db.execute(query)
+        items = [fieldset.serialize(paper) for paper in result.scalars().all()]
+        await vote_aggregator.merge_pending(items)
+        return items
+
+    query = query.options(
         selectinload(Paper.authors),
         selectinload(Paper.models),
         selectinload(Paper.tools)
@@ -90,12 +239,32 @@ async def get_my_submissions(
     
     result = await db.execute(query)
     papers = result.scalars().all()
+    await vote_aggregator.merge_pending(papers)
     
     # Convert to PaperResponse with safe defaults
     return [PaperResponse.from_paper(paper) for paper in papers]
 
 
-@router.post("/submit", response_model=PaperResponse)
+async def _cooldown_from_attempts(db: AsyncSession, user_id: str, policy: Policy) -> RateLimitResult:
+    """The submission cooldown recomputed from recent rejected SubmissionAttempt rows"""
+    since = datetime.now(timezone.utc) - timedelta(seconds=policy.window)
+    result = await db.execute(
+        select(SubmissionAttempt.created_at, SubmissionAttempt.rejection_reason)
+        .where(SubmissionAttempt.user_id == user_id)
+        .where(SubmissionAttempt.status == 'rejected')
+        .where(SubmissionAttempt.created_at >= since)
+        .order_by(SubmissionAttempt.created_at.desc())
+        .limit(policy.limit)
+    )
+    rows = result.all()
+    return check_log(
+        policy,
+        [row.created_at.timestamp() for row in rows],
+        meta=rows[0].rejection_reason if rows else None,
+    )
+
+
+@router.post("/submit", response_model=PaperResponse, dependencies=[Depends(rate_limit("papers:submit"))])
 async def submit_paper(
     current_user: Annotated[User, Depends(get_current_user)],
     title: str = Form(...),
@@ -106,53 +275,38 @@ async def submit_paper(
     generation_method: str = Form(...),
     code_url: Optional[str] = Form(None),
     data_url: Optional[str] = Form(None),
+    citation_dois: Optional[str] = Form(None),  # JSON string
     pdf_file: UploadFile = File(...),
     tex_file: Optional[UploadFile] = File(None),
     db: AsyncSession = Depends(get_db),
 ):
     """Submit a new paper."""
-    # Check submission cooldown
+    # Check submission cooldown (recent rejections, one cache lookup)
     is_verified = isVerifiedEmailDomain(current_user.email)
-
-    # Get recent rejected submissions
-    from datetime import timedelta
-    six_hours_ago = datetime.utcnow() - timedelta(hours=6)
-    recent_rejections = await db.execute(
-        select(SubmissionAttempt)
-        .where(SubmissionAttempt.user_id == current_user.id)
-        .where(SubmissionAttempt.status == 'rejected')
-        .where(SubmissionAttempt.created_at >= six_hours_ago)
-        .order_by(SubmissionAttempt.created_at.desc())
-    )
-    recent_rejections_list = recent_rejections.scalars().all()
+    cooldown_policy = SUBMISSION_COOLDOWN["verified" if is_verified else "unverified"]
+    cooldown_key = f"submission-rejections:{current_user.id}"
+    cooldown = await rate_limiter.hit(cooldown_key, cooldown_policy, consume=False)
+    if cooldown.allowed and cooldown.fallback:
+        # Memory only knows this worker's rejections since it started
+        cooldown = await _cooldown_from_attempts(db, current_user.id, cooldown_policy)
 
     # Check cooldown rules
-    if is_verified:
-        # Verified users get 4 tries
-        if len(recent_rejections_list) >= 4:
-            last_rejection = recent_rejections_list[0]
-            time_remaining = (last_rejection.created_at + timedelta(hours=6)) - datetime.utcnow()
-            minutes_remaining = int(time_remaining.total_seconds() / 60)
-            raise HTTPException(
-                status_code=429,
-                detail=f"You have exceeded 4 submission attempts. Please wait {minutes_remaining} minutes before trying again. Last rejection reason: {last_rejection.rejection_reason}"
-            )
-    else:
-        # Unverified users get 1 try
-        if len(recent_rejections_list) >= 1:
-            last_rejection = recent_rejections_list[0]
-            time_remaining = (last_rejection.created_at + timedelta(hours=6)) - datetime.utcnow()
-            minutes_remaining = int(time_remaining.total_seconds() / 60)
-            raise HTTPException(
-                status_code=429,
-                detail=f"Your submission was rejected. Please wait {minutes_remaining} minutes before trying again. Rejection reason: {last_rejection.rejection_reason}"
-            )
+    if not cooldown.allowed:
+        minutes_remaining = int(cooldown.retry_after / 60)
+        if is_verified:
+            # Verified users get 4 tries
+            detail = f"You have exceeded 4 submission attempts. Please wait {minutes_remaining} minutes before trying again. Last rejection reason: {cooldown.meta}"
+        else:
+            # Unverified users get 1 try
+            detail = f"Your submission was rejected. Please wait {minutes_remaining} minutes before trying again. Rejection reason: {cooldown.meta}"
+        raise HTTPException(status_code=429, detail=detail, headers=cooldown.headers())
 
     try:
         # Parse JSON fields
         authors_list = json.loads(authors)
         categories_list = json.loads(categories)
         ai_tools_list = json.loads(ai_tools)
+        citation_dois_list = json.loads(citation_dois) if citation_dois else []
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON in form fields")
 
@@ -229,6 +383,7 @@ async def submit_paper(
         )
         db.add(submission_attempt)
         await db.commit()
+        await rate_limiter.hit(cooldown_key, cooldown_policy, meta=rejection_text)
 
         raise HTTPException(
             status_code=422,
@@ -243,39 +398,15 @@ async def submit_paper(
     db.add(paper)
     await db.flush()  # Get paper ID without committing
 
-    # Create authors with explicit ordering
-    for idx, author_data in enumerate(authors_list):
-        # Check if author already exists by email
-        existing_author = None
-        if author_data.get("email"):
-            result = await db.execute(
-                select(Author).where(Author.email == author_data["email"])
-            )
-            existing_author = result.scalar_one_or_none()
-
-        if existing_author:
-            author_id = existing_author.id
-        else:
-            author = Author(
-                name=author_data["name"],
-                email=author_data.get("email"),
-                affiliation=author_data.get("affiliation"),
-                is_ai_model=author_data.get("isAI", False),
-            )
-            db.add(author)
-            await db.flush()
-            author_id = author.id
-
-        # Insert into paper_authors with order
-        await db.execute(
-            paper_authors.insert().values(
-                paper_id=paper.id,
-                author_id=author_id,
-                order=idx
-            )
-        )
+    # Resolve and link all authors with explicit ordering in bulk
+    await AuthorResolutionService(db).attach_to_paper(paper.id, authors_list)
+    await CoauthorGraphService(db).add_paper(paper.id)
+    cited = await CitationService(db).add_paper(paper.id, None, citation_dois_list)
+    await AuthorStatsService(db).refresh_for_papers([paper.id, *cited])
 
     await db.commit()
+    coauthor_graph_cache.invalidate()
+    await paper_cache.invalidate(cited)
     await db.refresh(paper)
 
     # Record successful submission
@@ -301,24 +432,29 @@ async def submit_paper(
     return loaded_paper
 
 
-@router.get("/{paper_id}", response_model=PaperResponse)
+@router.get("/{paper_id}", response_model=None, responses={200: {"model": PaperResponse}})
 async def get_paper(
     paper_id: str,
-    db: AsyncSession = Depends(get_db)
+    fieldset: Optional[PaperFieldset] = Depends(paper_fieldset),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get a specific paper by ID"""
-    query = select(Paper).where(Paper.id == paper_id).options(
-        selectinload(Paper.authors),
-        selectinload(Paper.models),
-        selectinload(Paper.tools)
-    )
-    result = await db.execute(query)
-    paper = result.scalar_one_or_none()
-
-    if not paper:
-        raise HTTPException(status_code=404, detail="Paper not found")
+    """Get a specific paper by ID (sparse with `fields=`/`include=`)"""
+    if fieldset:
+        result = await db.execute(
+            select(Paper).where(Paper.id == paper_id).options(*fieldset.options())
+        )
+        paper = result.scalar_one_or_none()
+        if not paper:
+            raise HTTPException(status_code=404, detail="Paper not found")
+        response = fieldset.serialize(paper)
+    else:
+        items, _ = await _load_paper_responses(db, [paper_id])
+        if not items:
+            raise HTTPException(status_code=404, detail="Paper not found")
+        response = items[0]
 
-    return PaperResponse.from_paper(paper)
+    await vote_aggregator.merge_pending([response])
+    return response
 
 
 @router.post("/", response_model=PaperResponse)
@@ -362,7 +498,7 @@ async def create_paper(
     paper = Paper(
         title=paper_create.title,
         abstract=paper_create.abstract,
-        doi=paper_create.doi,
+        doi=normalize_doi(paper_create.doi),
         arxiv_id=paper_create.arxiv_id,
         published_at=paper_create.published_at,
         pdf_url=pdf_url,
@@ -382,21 +518,14 @@ async def create_paper(
     db.add(paper)
     await db.flush()  # Get the paper ID
     
-    # Add authors
-    for i, author_data in enumerate(paper_create.authors):
-        # Check if author exists by ORCID
-        author = None
-        if author_data.orcid:
-            query = select(Author).where(Author.orcid == author_data.orcid)
-            result = await db.execute(query)
-            author = result.scalar_one_or_none()
-        
-        if not author:
-            author = Author(**author_data.dict())
-            db.add(author)
-        
-        # Link author to paper
-        paper.authors.append(author)
+    # Add authors (resolved by ORCID/email in bulk)
+    await AuthorResolutionService(db).attach_to_paper(
+        paper.id,
+        [author_data.model_dump() for author_data in paper_create.authors]
+    )
+    await CoauthorGraphService(db).add_paper(paper.id)
+    cited = await CitationService(db).add_paper(paper.id, paper.doi, paper_create.citation_dois)
+    await AuthorStatsService(db).refresh_for_papers([paper.id, *cited])
     
     # Add models
     for model_data in paper_create.models:
@@ -428,6 +557,8 @@ async def create_paper(
     # )
     
     await db.commit()
+    coauthor_graph_cache.invalidate()
+    await paper_cache.invalidate(cited)
     await db.refresh(paper)
 
     # Re-fetch the paper with relationships eagerly loaded to prevent lazy-loading errors
@@ -462,18 +593,29 @@ async def update_paper(
     
     # Update fields
     update_data = paper_update.dict(exclude_unset=True)
+    if "doi" in update_data:
+        update_data["doi"] = normalize_doi(update_data["doi"])
+    old_doi = paper.doi
     for field, value in update_data.items():
         setattr(paper, field, value)
-    
+
+    # Citations of the old DOI no longer count; the new one may already be cited
+    if paper.doi != old_doi:
+        await db.flush()
+        if await CitationService(db).change_doi(paper.id, paper.doi):
+            await AuthorStatsService(db).refresh_for_paper(paper.id)
+
     await db.commit()
-    await db.refresh(paper)
-    
-    # Convert to response
-    paper_dict = paper.__dict__
-    paper_dict["citation_count"] = len(paper.citations) if paper.citations else 0
-    paper_dict["cited_by_count"] = len(paper.cited_by) if paper.cited_by else 0
-    
-    return PaperResponse(**paper_dict)
+    await paper_cache.invalidate([paper.id])
+
+    result = await db.execute(
+        select(Paper).where(Paper.id == paper.id).options(
+            selectinload(Paper.authors),
+            selectinload(Paper.models),
+            selectinload(Paper.tools)
+        )
+    )
+    return PaperResponse.from_paper(result.scalar_one())
 
 
 @router.delete("/{paper_id}")
@@ -494,8 +636,16 @@ async def delete_paper(
     # await vector_db_service.delete_paper(paper_id)
 
     # Delete from database (cascade will handle related records)
+    author_stats = AuthorStatsService(db)
+    cited = await CitationService(db).remove_paper(paper.id)
+    author_ids = await author_stats.author_ids_for_papers([paper.id, *cited])
+    await CoauthorGraphService(db).remove_paper(paper.id)
     await db.delete(paper)
+    await db.flush()
+    await author_stats.refresh(author_ids)
     await db.commit()
+    coauthor_graph_cache.invalidate()
+    await paper_cache.invalidate([paper_id, *cited])
 
     return {"message": "Paper deleted successfully"}
 
@@ -503,7 +653,7 @@ async def delete_paper(
 @router.get("/{paper_id}/pdf")
 async def get_paper_pdf(
     paper_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Redirect to paper PDF (Supabase public URL or direct URL)"""
     # Get paper
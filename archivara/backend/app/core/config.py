@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Dict
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import PostgresDsn, field_validator, HttpUrl, Field
 
@@ -14,6 +14,11 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     WORKERS: int = 4
+    WORKER_MAX_REQUESTS: int = 10000  # Recycle a worker after this many requests; 0 disables
+    WORKER_MAX_REQUESTS_JITTER: int = 1000  # Random extra requests so workers don't recycle together
+    WORKER_MAX_RSS_MB: int = 1024  # Recycle a worker whose resident memory exceeds this; 0 disables
+    WORKER_CHECK_INTERVAL_SECONDS: float = 5.0
+    GRACEFUL_TIMEOUT_SECONDS: int = 120  # In-flight requests (e.g. LLM moderation) get this long on drain
     
     # Database
     POSTGRES_SERVER: str = "localhost"
@@ -39,6 +44,22 @@ class Settings(BaseSettings):
             path=values.get("POSTGRES_DB"),
         )
     
+    # Connection pools (per engine, per worker process)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_MAX_CONNECTIONS: int = 80  # Per database server across all WORKERS; pools are cut to fit. 0 disables
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds a request waits for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Replace connections older than this; -1 disables
+    DB_PRE_PING_IDLE_SECONDS: float = 30.0  # Ping on checkout only after this much idle time; 0 pings every checkout
+    DB_PGBOUNCER: bool = False  # Behind PgBouncer transaction pooling: no statement caches, unique statement names
+
+    # Read replicas (empty disables routing; every read uses the primary)
+    DATABASE_REPLICA_URLS: List[str] = []  # JSON list, e.g. ["postgresql://...@replica1/archivara"]
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # Lagging replicas are skipped until they catch up
+    REPLICA_CHECK_INTERVAL_SECONDS: float = 5.0  # How often a replica's health and lag are probed
+    REPLICA_STICKY_SECONDS: int = 10  # Reads go to the primary this long after the client's own write
+    REPLICA_STICKY_BACKEND: str = "memory"  # "memory" (per worker) or "redis" (shared; use with several workers)
+
     # Security
     SECRET_KEY: str = Field(default="your-secret-key-here-change-in-production")
     ALGORITHM: str = Field(default="HS256")
@@ -46,6 +67,30 @@ class Settings(BaseSettings):
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Rate limiting
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_REDIS_URL: Optional[str] = None  # Defaults to REDIS_URL; memory fallback if unreachable
+    RATE_LIMIT_OVERRIDES: Dict[str, str] = {}  # e.g. {"papers:submit:unverified": "5/3600"}
+    # Peers (CIDRs) whose X-Forwarded-For is honoured; the client is the right-most hop outside them
+    RATE_LIMIT_TRUSTED_PROXIES: List[str] = [
+        "127.0.0.0/8", "10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16", "100.64.0.0/10", "::1/128", "fc00::/7",
+    ]
+
+    # Vote aggregation
+    VOTE_WRITE_BEHIND: bool = False  # Buffer counter deltas and flush them in batches
+    VOTE_WRITE_BEHIND_BACKEND: str = "memory"  # "memory" (per worker) or "redis" (shared)
+    VOTE_FLUSH_INTERVAL_SECONDS: float = 2.0
+
+    # Paper read cache
+    PAPER_CACHE_ENABLED: Optional[bool] = None  # Unset: on, except the memory backend with several WORKERS
+    PAPER_CACHE_BACKEND: str = "memory"  # "memory" (per worker) or "redis" (shared)
+    PAPER_CACHE_TTL_SECONDS: int = 60  # Upper bound on staleness missed by invalidation
+    PAPER_CACHE_MAX_ENTRIES: int = 10000  # Memory backend only
+    PAPER_CACHE_MAX_MB: int = 64  # Memory backend only, per worker
+
+    # Co-authorship graph
+    COAUTHOR_GRAPH_TTL_SECONDS: int = 300  # Per-process CSR cache lifetime
     
     # Supabase Storage (simpler than S3)
     SUPABASE_URL: str = ""
@@ -93,6 +138,7 @@ class Settings(BaseSettings):
     # OpenRouter (for moderation LLM)
     OPENROUTER_API_KEY: Optional[str] = None
     OPENROUTER_MODEL: str = "openai/gpt-4o"
+    OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"  # e.g. http://localhost:8100 for fake_openrouter.py
 
     # Frontend URL (for email verification links)
     FRONTEND_URL: str = "http://localhost:3001"
@@ -117,6 +163,19 @@ class Settings(BaseSettings):
     # Monitoring
     SENTRY_DSN: Optional[str] = None
     PROMETHEUS_ENABLED: bool = True
+
+    # Readiness (/health/ready): warm-up, then dependency probes
+    READINESS_PREFILL_CONNECTIONS: int = 5  # Pooled connections opened per engine before ready
+    READINESS_WARM_FEED_PAGES: int = 3  # First feed pages requested in-process
+    READINESS_WARM_TOP_AUTHORS: int = 10  # Most prolific authors' profiles requested in-process
+    READINESS_WARMUP_TIMEOUT_SECONDS: float = 60.0  # Cache warming stops here; the pool must still prefill
+    # Unconfigured ones are skipped; "redis_fallback" (rate limits, stickiness) only marks the instance degraded
+    READINESS_REQUIRED_PROBES: List[str] = ["database", "redis", "storage"]
+    READINESS_PROBE_TIMEOUT_SECONDS: float = 2.0
+    READINESS_PROBE_INTERVAL_SECONDS: float = 2.0  # Probe results are reused this long
+    READINESS_DB_MAX_LATENCY_MS: float = 250.0
+    READINESS_REDIS_MAX_LATENCY_MS: float = 50.0
+    READINESS_STORAGE_MAX_LATENCY_MS: float = 1000.0
     
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
@@ -125,6 +184,23 @@ class Settings(BaseSettings):
     # File Upload
     MAX_UPLOAD_SIZE: int = 500 * 1024 * 1024  # 500MB
     ALLOWED_EXTENSIONS: List[str] = [".pdf", ".zip", ".ipynb", ".yaml", ".json", ".safetensors"]
+
+    # Bulk import
+    BULK_IMPORT_DIR: str = "/tmp/archivara-imports"  # Uploaded import files (kept for resume)
+    BULK_IMPORT_BATCH_SIZE: int = 5000
+    BULK_IMPORT_STALE_SECONDS: int = 900  # A running job without a checkpoint for this long was interrupted
+
+    # OAI-PMH
+    OAI_REPOSITORY_IDENTIFIER: str = "archivara.org"  # Namespace of oai:<id>:<paper_id> identifiers
+    OAI_ADMIN_EMAIL: str = "admin@archivara.org"
+    OAI_PAGE_SIZE: int = 100  # Records per ListRecords page (ListIdentifiers uses 5x)
+
+    # GraphQL
+    GRAPHQL_MAX_DEPTH: int = 8
+    GRAPHQL_MAX_COMPLEXITY: int = 2000  # Estimated fields resolved, list sizes multiplied through
+    GRAPHQL_PERSISTED_QUERIES_FILE: Optional[str] = None  # JSON {sha256: query} manifest
+    GRAPHQL_PERSISTED_QUERIES_ONLY: bool = False  # Reject queries not in the manifest
+    GRAPHQL_APQ_CACHE_SIZE: int = 1000  # Automatic persisted queries kept per process
     
     # Clustering
     MIN_CLUSTER_SIZE: int = 5
@@ -1,7 +1,6 @@
 from datetime import datetime, timedelta
 from typing import Any, Union
 
-from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
@@ -13,6 +12,8 @@ def create_access_token(
     data: dict[str, Any], expires_delta: Union[timedelta, None] = None
 ) -> str:
     """Create JWT access token."""
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
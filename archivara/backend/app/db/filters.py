@@ -0,0 +1,33 @@
+"""
+Query helpers for JSONB list columns (papers.categories, papers.tags).
+
+Both columns carry GIN jsonb_path_ops indexes, which serve the containment
+operator (@>) only. Any-of filters are therefore written as an OR of
+single-element containments, which Postgres answers with a BitmapOr over
+the same index instead of the unindexable ?| operator.
+"""
+
+from typing import Iterable, List
+
+from sqlalchemy import false, or_, true
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def _values(values: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(v for v in values if v))
+
+
+def jsonb_contains_all(column, values: Iterable[str]) -> ColumnElement:
+    """Rows whose list contains every value: column @> '["a", "b"]'"""
+    values = _values(values)
+    if not values:
+        return true()
+    return column.contains(values)
+
+
+def jsonb_contains_any(column, values: Iterable[str]) -> ColumnElement:
+    """Rows whose list contains at least one value"""
+    values = _values(values)
+    if not values:
+        return false()
+    return or_(*(column.contains([v]) for v in values))
@@ -0,0 +1,145 @@
+"""
+Connection pool configuration and telemetry.
+
+Implements:
+1. Engine options from settings (pool size, overflow, checkout timeout,
+   recycle), with size and overflow cut so that settings.WORKERS pools fit
+   within DB_MAX_CONNECTIONS on each database server
+2. A PgBouncer mode for transaction pooling: asyncpg and SQLAlchemy statement
+   caches are off and prepared statements get unique names, so statements
+   never collide on a server connection shared with other clients
+3. Pre-ping on checkout only for connections idle longer than
+   settings.DB_PRE_PING_IDLE_SECONDS, instead of a round trip on every checkout
+4. Prometheus metrics per pool: checkout wait time, checkouts, connections
+   open and in use, pings and invalidations
+"""
+
+import time
+from typing import Any, Dict, Tuple
+from uuid import uuid4
+
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+
+CHECKOUT_WAIT = Histogram(
+    "archivara_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+CHECKOUTS = Counter("archivara_db_pool_checkouts", "Connections checked out", ["pool"])
+CONNECTS = Counter("archivara_db_pool_connects", "New database connections opened", ["pool"])
+INVALIDATIONS = Counter("archivara_db_pool_invalidations", "Connections invalidated", ["pool", "soft"])
+PINGS = Counter("archivara_db_pool_pings", "Pre-pings of idle connections", ["pool", "result"])
+OPEN = Gauge("archivara_db_pool_connections", "Open connections", ["pool"], multiprocess_mode="livesum")
+IN_USE = Gauge("archivara_db_pool_in_use", "Connections checked out", ["pool"], multiprocess_mode="livesum")
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            CHECKOUT_WAIT.labels(self._orig_logging_name or "default").observe(time.perf_counter() - start)
+
+
+def _statement_name() -> str:
+    return f"__asyncpg_{uuid4().hex}__"
+
+
+def pool_limits() -> Tuple[int, int]:
+    """
+    (pool_size, max_overflow) for one worker's engine. Every worker opens
+    its own pool per database, so DB_MAX_CONNECTIONS is split between them.
+    """
+    size, overflow = settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    if settings.DB_MAX_CONNECTIONS <= 0:
+        return size, overflow
+    budget = max(settings.DB_MAX_CONNECTIONS // max(settings.WORKERS, 1), 1)
+    size = min(size, budget)
+    return size, max(min(overflow, budget - size), 0)
+
+
+def engine_options(name: str) -> Dict[str, Any]:
+    """Keyword arguments for create_async_engine; `name` labels the pool's metrics"""
+    pool_size, max_overflow = pool_limits()
+    options: Dict[str, Any] = dict(
+        echo=settings.DEBUG,
+        poolclass=InstrumentedPool,
+        pool_logging_name=name,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        # Replaced by the idle-time ping in instrument()
+        pool_pre_ping=False,
+    )
+    if settings.DB_PGBOUNCER:
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _statement_name,
+        }
+    return options
+
+
+def instrument(engine: AsyncEngine, name: str) -> AsyncEngine:
+    """Attach idle-time pre-ping and metrics to an engine's pool"""
+    sync_engine = engine.sync_engine
+    idle_threshold = settings.DB_PRE_PING_IDLE_SECONDS
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, record):
+        record.info["checked_in_at"] = time.monotonic()
+        CONNECTS.labels(name).inc()
+        OPEN.labels(name).inc()
+
+    @event.listens_for(sync_engine, "close")
+    def on_close(dbapi_connection, record):
+        OPEN.labels(name).dec()
+
+    @event.listens_for(sync_engine, "close_detached")
+    def on_close_detached(dbapi_connection):
+        OPEN.labels(name).dec()
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, record, proxy):
+        idle = time.monotonic() - record.info.get("checked_in_at", 0.0)
+        if idle >= idle_threshold:
+            try:
+                sync_engine.dialect.do_ping(dbapi_connection)
+            except Exception as e:
+                PINGS.labels(name, "failed").inc()
+                logger.warning("Pooled connection failed pre-ping", pool=name, idle=round(idle, 1), error=str(e))
+                # The pool discards this connection and retries with a new one
+                raise exc.DisconnectionError() from e
+            PINGS.labels(name, "ok").inc()
+        CHECKOUTS.labels(name).inc()
+        IN_USE.labels(name).inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, record):
+        record.info["checked_in_at"] = time.monotonic()
+        IN_USE.labels(name).dec()
+
+    @event.listens_for(sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, record, exception):
+        INVALIDATIONS.labels(name, "false").inc()
+
+    @event.listens_for(sync_engine, "soft_invalidate")
+    def on_soft_invalidate(dbapi_connection, record, exception):
+        INVALIDATIONS.labels(name, "true").inc()
+
+    return engine
+
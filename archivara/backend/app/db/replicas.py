@@ -0,0 +1,250 @@
+"""
+Read-replica routing.
+
+Implements:
+1. One async engine per configured replica (settings.DATABASE_REPLICA_URLS)
+2. Round-robin selection among replicas that are up and within
+   settings.REPLICA_MAX_LAG_SECONDS, probed at most once per check interval
+3. Read-your-writes stickiness: after a successful write, reads by the same
+   subject (the bearer token's user, else the client IP) go to the primary
+   for REPLICA_STICKY_SECONDS. Recorded server-side, in process or in Redis
+   (settings.REPLICA_STICKY_BACKEND), since the frontend sends no cookies
+4. Fallback to the primary when no replica qualifies or a connection fails
+
+Sessions handed out here are read-only (BEGIN READ ONLY). Without replicas
+configured every read session comes from the primary pool.
+"""
+
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+import structlog
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.db.pool import engine_options, instrument
+
+logger = structlog.get_logger()
+
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Replay lag in seconds; a replica that has replayed everything it received
+# reports 0 even when the primary has been idle for a while.
+LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+PROBE_TIMEOUT_SECONDS = 1.0
+
+
+class Replica:
+    """A replica engine plus its last observed health"""
+
+    def __init__(self, name: str, url: str):
+        # url must already use the async driver
+        self.name = name
+        self.engine = instrument(create_async_engine(url, **engine_options(name)), name)
+        self.session_factory = async_sessionmaker(
+            self.engine.execution_options(postgresql_readonly=True),
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+            info={"read_only": True},
+        )
+        self.healthy = True
+        self.lag: Optional[float] = None
+        self.checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def usable(self) -> bool:
+        return self.healthy and (self.lag is None or self.lag <= settings.REPLICA_MAX_LAG_SECONDS)
+
+    def mark_down(self, error: Exception) -> None:
+        if self.healthy:
+            logger.warning("Read replica unavailable", replica=self.name, error=str(error))
+        self.healthy = False
+        self.checked_at = time.monotonic()
+
+    async def _lag(self) -> float:
+        async with self.engine.connect() as conn:
+            return await conn.scalar(LAG_SQL)
+
+    async def check(self) -> bool:
+        """Probe health and lag if the last probe is older than the check interval"""
+        if time.monotonic() - self.checked_at < settings.REPLICA_CHECK_INTERVAL_SECONDS:
+            return self.usable()
+        async with self._lock:
+            if time.monotonic() - self.checked_at < settings.REPLICA_CHECK_INTERVAL_SECONDS:
+                return self.usable()
+            try:
+                lag = await asyncio.wait_for(self._lag(), PROBE_TIMEOUT_SECONDS)
+            except Exception as e:
+                self.mark_down(e)
+                return False
+            was_usable = self.usable()
+            self.healthy = True
+            self.lag = float(lag or 0)
+            self.checked_at = time.monotonic()
+            if was_usable != self.usable():
+                logger.info("Read replica state changed", replica=self.name, usable=self.usable(), lag=self.lag)
+            return self.usable()
+
+
+def request_subject(request: Request) -> str:
+    """Who made the request: the bearer token's subject, else the client IP"""
+    if hasattr(request.state, "replica_subject"):
+        return request.state.replica_subject
+    subject = None
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        from jose import JWTError, jwt
+
+        try:
+            subject = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]).get("sub")
+        except JWTError:
+            pass
+    if subject:
+        subject = f"user:{subject}"
+    else:
+        from app.services.rate_limit import get_client_ip
+
+        subject = f"ip:{get_client_ip(request)}"
+    request.state.replica_subject = subject
+    return subject
+
+
+class MemoryStickyStore:
+    """Recent writers per worker process"""
+
+    MAX_ENTRIES = 100000
+
+    def __init__(self):
+        self._until: Dict[str, float] = {}
+
+    async def mark(self, subject: str, seconds: int) -> None:
+        if len(self._until) >= self.MAX_ENTRIES:
+            now = time.monotonic()
+            self._until = {k: v for k, v in self._until.items() if v > now}
+        self._until[subject] = time.monotonic() + seconds
+
+    async def recent(self, subject: str) -> bool:
+        until = self._until.get(subject)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            self._until.pop(subject, None)
+            return False
+        return True
+
+
+class RedisStickyStore:
+    """Recent writers shared by all workers and instances (keys expire on their own)"""
+
+    PREFIX = "replica:sticky:"
+
+    def __init__(self, url: str):
+        import redis.asyncio as aioredis
+
+        self.client = aioredis.from_url(url, decode_responses=True)
+
+    async def mark(self, subject: str, seconds: int) -> None:
+        try:
+            await self.client.set(self.PREFIX + subject, 1, ex=seconds)
+        except Exception as e:
+            logger.warning("Could not record write for read-your-writes", error=str(e))
+
+    async def recent(self, subject: str) -> bool:
+        try:
+            return bool(await self.client.exists(self.PREFIX + subject))
+        except Exception as e:
+            # Unknown, so assume a recent write: the primary always has it
+            logger.warning("Could not check recent writes, reading from the primary", error=str(e))
+            return True
+
+
+class ReplicaRouter:
+    """Hands out read sessions from replicas, falling back to the primary"""
+
+    def __init__(self, urls: List[str], primary: Callable[[], AsyncSession]):
+        self.primary = primary
+        self.replicas = [Replica(f"replica-{i}", url) for i, url in enumerate(urls)]
+        self._order = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+        self.sticky = (
+            RedisStickyStore(settings.REDIS_URL)
+            if self.replicas and settings.REPLICA_STICKY_BACKEND == "redis"
+            else MemoryStickyStore()
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    async def wants_primary(self, request: Optional[Request]) -> bool:
+        """The client wrote recently, so only the primary is known to have it"""
+        return request is not None and await self.sticky.recent(request_subject(request))
+
+    async def choose(self, request: Optional[Request] = None) -> Optional[Replica]:
+        if not self.enabled or await self.wants_primary(request):
+            return None
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._order)]
+            if await replica.check():
+                return replica
+        return None
+
+    async def open_session(self, request: Optional[Request] = None) -> AsyncSession:
+        """
+        A session bound to a usable replica, connected eagerly so that a dead
+        replica is detected here and the request falls back to the primary.
+        Replica sessions carry their name and last probed lag in session.info.
+        """
+        replica = await self.choose(request)
+        if replica is not None:
+            session = replica.session_factory()
+            session.info.update(replica=replica.name, replica_lag=replica.lag)
+            try:
+                await session.connection()
+                return session
+            except Exception as e:
+                await session.close()
+                replica.mark_down(e)
+        return self.primary()
+
+    @asynccontextmanager
+    async def session(self, request: Optional[Request] = None) -> AsyncIterator[AsyncSession]:
+        """open_session() as a context manager; usable as a session_factory"""
+        session = await self.open_session(request)
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    async def mark_write(self, request: Request, response: Response) -> None:
+        """Pin the client to the primary after a successful write"""
+        if (
+            self.enabled
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            await self.sticky.mark(request_subject(request), settings.REPLICA_STICKY_SECONDS)
+
+    @staticmethod
+    def may_be_stale(session: AsyncSession) -> bool:
+        """Reads from this session may predate writes already on the primary"""
+        return bool(session.info.get("replica_lag", 0))
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
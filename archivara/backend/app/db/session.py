@@ -1,24 +1,26 @@
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.pool import engine_options, instrument
+from app.db.replicas import ReplicaRouter
 
-# Convert DATABASE_URL to async driver (postgresql+asyncpg)
-database_url = str(settings.DATABASE_URL)
-if database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-elif database_url.startswith("postgres://"):
-    database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
-
-# Create async engine
-engine = create_async_engine(
-    database_url,
-    echo=settings.DEBUG,
-    future=True,
-    pool_size=20,
-    max_overflow=40,
-    pool_pre_ping=True,
-)
+
+def async_database_url(url: str) -> str:
+    """Convert a database URL to the async driver (postgresql+asyncpg)"""
+    url = str(url)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    return url
+
+
+database_url = async_database_url(settings.DATABASE_URL)
+
+# Create async engine (pool sizing, PgBouncer mode and pre-ping: app/db/pool.py)
+engine = instrument(create_async_engine(database_url, **engine_options("primary")), "primary")
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -29,6 +31,22 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Read-only sessions: asyncpg opens their transactions with BEGIN READ ONLY,
+# so the mode costs no extra round trip. Characteristics reset on checkin.
+ReadSessionLocal = async_sessionmaker(
+    engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+    info={"read_only": True},
+)
+
+# Read replicas; with none configured reads use ReadSessionLocal
+replica_router = ReplicaRouter(
+    [async_database_url(url) for url in settings.DATABASE_REPLICA_URLS],
+    primary=ReadSessionLocal,
+)
+
 # Dependency to get DB session
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
@@ -39,4 +57,12 @@ async def get_db() -> AsyncSession:
             await session.rollback()
             raise
         finally:
-            await session.close() 
\ No newline at end of file
+            await session.close()
+
+
+# Dependency for GET endpoints: a read-only transaction on a healthy replica
+# (or the primary, see replica_router) that is never committed. Closing
+# rolls it back and returns the connection once the response is built.
+async def get_read_db(request: Request) -> AsyncSession:
+    async with replica_router.session(request) as session:
+        yield session
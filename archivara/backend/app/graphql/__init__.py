@@ -0,0 +1,7 @@
+"""
+GraphQL API over papers, authors and votes.
+
+Resolvers go through per-request DataLoaders so a page that asks for a
+paper, its authors, the viewer's vote and moderation status runs a bounded
+number of batched SQL statements regardless of how many papers it lists.
+"""
@@ -0,0 +1,111 @@
+"""
+Query complexity limit.
+
+Each resolved field costs 1, multiplied by the estimated size of every
+list it is nested in, so `papers(ids: [...100]) { authors { recentPapers
+{ authors { name } } } }` is priced by its fan-out rather than its depth.
+
+Runs as a schema extension rather than a validation rule so `ids` passed
+as a variable (how the frontend sends a page's ids) is priced by the
+request's actual list, not by the cap.
+"""
+
+from typing import Any, Dict, Iterator, Optional, Set
+
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    InlineFragmentNode,
+    ListValueNode,
+    SelectionSetNode,
+    VariableNode,
+)
+from graphql.utilities import get_operation_ast
+from strawberry.extensions import SchemaExtension
+
+from app.graphql.context import RECENT_PAPERS_LIMIT
+
+MAX_IDS = 100
+AUTHORS_PER_PAPER_ESTIMATE = 10
+
+# Estimated items per list field (GraphQL field names)
+LIST_FIELD_SIZES = {
+    "papers": MAX_IDS,
+    "authors": AUTHORS_PER_PAPER_ESTIMATE,
+    "recentPapers": RECENT_PAPERS_LIMIT,
+}
+
+
+def _list_size(field: FieldNode, variables: Dict[str, Any]) -> int:
+    size = LIST_FIELD_SIZES.get(field.name.value, 1)
+    if field.name.value == "papers":
+        for argument in field.arguments or ():
+            if argument.name.value != "ids":
+                continue
+            value = argument.value
+            # Priced by the list actually sent; anything else by the cap
+            if isinstance(value, ListValueNode):
+                size = max(len(value.values), 1)
+            elif isinstance(value, VariableNode) and isinstance(variables.get(value.name.value), list):
+                size = max(len(variables[value.name.value]), 1)
+    return size
+
+
+def query_cost(
+    selection_set: Optional[SelectionSetNode],
+    fragments: Dict[str, FragmentDefinitionNode],
+    variables: Dict[str, Any],
+    multiplier: int = 1,
+    seen: Optional[Set[str]] = None,
+) -> int:
+    """Estimated fields resolved by a selection set"""
+    if selection_set is None:
+        return 0
+    seen = seen or set()
+    cost = 0
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            cost += multiplier
+            if selection.selection_set is not None:
+                cost += query_cost(
+                    selection.selection_set, fragments, variables,
+                    multiplier * _list_size(selection, variables), seen,
+                )
+        elif isinstance(selection, InlineFragmentNode):
+            cost += query_cost(selection.selection_set, fragments, variables, multiplier, seen)
+        elif isinstance(selection, FragmentSpreadNode):
+            name = selection.name.value
+            fragment = fragments.get(name)
+            if fragment is not None and name not in seen:
+                cost += query_cost(fragment.selection_set, fragments, variables, multiplier, seen | {name})
+    return cost
+
+
+class ComplexityLimiter(SchemaExtension):
+    """Reject operations whose estimated cost exceeds max_complexity, before validation"""
+
+    def __init__(self, max_complexity: int):
+        self.max_complexity = max_complexity
+
+    def on_validate(self) -> Iterator[None]:
+        context = self.execution_context
+        document = context.graphql_document
+        operation = get_operation_ast(document, context.operation_name) if document else None
+        if operation is not None and context.errors is None:
+            fragments = {
+                definition.name.value: definition
+                for definition in document.definitions
+                if isinstance(definition, FragmentDefinitionNode)
+            }
+            cost = query_cost(operation.selection_set, fragments, context.variables or {})
+            if cost > self.max_complexity:
+                # Set before validation runs, so the operation is never executed
+                context.errors = [
+                    GraphQLError(
+                        f"Query complexity {cost} exceeds the maximum of {self.max_complexity}",
+                        operation,
+                    )
+                ]
+        yield
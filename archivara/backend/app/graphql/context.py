@@ -0,0 +1,176 @@
+"""
+Per-request GraphQL context and DataLoaders.
+
+Every loader batches the keys requested in one event-loop tick into a
+single statement. All loaders share the request's AsyncSession, which does
+not allow concurrent statements, so execution is serialized by a lock.
+"""
+
+import asyncio
+from collections import defaultdict
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import Depends, Request
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from strawberry.dataloader import DataLoader
+from strawberry.fastapi import BaseContext
+
+from app.db.session import get_read_db
+from app.models.paper import Author, AuthorStats, Paper, PaperVote, paper_authors
+from app.models.user import User
+from app.services.author_stats import schedule_refresh
+from app.services.rate_limit import get_token_subject
+from app.services.votes import vote_aggregator
+
+RECENT_PAPERS_LIMIT = 10
+
+MODERATION_COLUMNS = [
+    Paper.id,
+    Paper.baseline_status,
+    Paper.quality_score,
+    Paper.visibility_tier,
+    Paper.needs_review,
+    Paper.flag_count,
+    Paper.red_flags,
+]
+
+
+class GraphQLContext(BaseContext):
+    def __init__(self, db: AsyncSession, user_email: Optional[str]):
+        super().__init__()
+        self.db = db
+        self.user_email = user_email
+        self.lock = asyncio.Lock()
+        self._user_id: Optional[str] = None
+        self._user_resolved = False
+
+        self.papers = DataLoader(partial(load_papers, self))
+        self.authors = DataLoader(partial(load_authors, self))
+        self.authors_by_paper = DataLoader(partial(load_authors_by_paper, self))
+        self.recent_papers_by_author = DataLoader(partial(load_recent_papers_by_author, self))
+        self.stats_by_author = DataLoader(partial(load_stats_by_author, self))
+        self.moderation = DataLoader(partial(load_moderation, self))
+        self.my_votes = DataLoader(partial(load_my_votes, self))
+
+    async def execute(self, statement):
+        async with self.lock:
+            return await self.db.execute(statement)
+
+    async def user_id(self) -> Optional[str]:
+        """Viewer's user id, looked up once per request"""
+        if not self._user_resolved:
+            if self.user_email:
+                result = await self.execute(select(User.id).where(User.email == self.user_email))
+                self._user_id = result.scalar_one_or_none()
+            self._user_resolved = True
+        return self._user_id
+
+    def prime_papers(self, papers: List[Paper]) -> None:
+        """Papers loaded by another loader also answer papers/moderation lookups"""
+        for paper in papers:
+            self.papers.prime(paper.id, paper)
+            self.moderation.prime(paper.id, paper)
+
+
+async def load_papers(ctx: GraphQLContext, ids: List[str]) -> List[Optional[Paper]]:
+    result = await ctx.execute(select(Paper).where(Paper.id.in_(ids)).options(raiseload("*")))
+    papers = result.scalars().all()
+    await vote_aggregator.merge_pending(papers)
+    for paper in papers:
+        ctx.moderation.prime(paper.id, paper)
+    by_id = {p.id: p for p in papers}
+    return [by_id.get(i) for i in ids]
+
+
+async def load_authors(ctx: GraphQLContext, ids: List[str]) -> List[Optional[Author]]:
+    result = await ctx.execute(select(Author).where(Author.id.in_(ids)).options(raiseload("*")))
+    by_id = {a.id: a for a in result.scalars().all()}
+    return [by_id.get(i) for i in ids]
+
+
+async def load_authors_by_paper(ctx: GraphQLContext, paper_ids: List[str]) -> List[List[Author]]:
+    result = await ctx.execute(
+        select(paper_authors.c.paper_id, Author)
+        .join(Author, Author.id == paper_authors.c.author_id)
+        .where(paper_authors.c.paper_id.in_(paper_ids))
+        .order_by(paper_authors.c.paper_id, paper_authors.c.order)
+        .options(raiseload("*"))
+    )
+    grouped: Dict[str, List[Author]] = defaultdict(list)
+    for paper_id, author in result.all():
+        grouped[paper_id].append(author)
+        ctx.authors.prime(author.id, author)
+    return [grouped.get(i, []) for i in paper_ids]
+
+
+async def load_recent_papers_by_author(ctx: GraphQLContext, author_ids: List[str]) -> List[List[Paper]]:
+    ranked = (
+        select(
+            paper_authors.c.author_id,
+            paper_authors.c.paper_id,
+            func.row_number().over(
+                partition_by=paper_authors.c.author_id,
+                order_by=Paper.published_at.desc(),
+            ).label("rank"),
+        )
+        .join(Paper, Paper.id == paper_authors.c.paper_id)
+        .where(paper_authors.c.author_id.in_(author_ids))
+        .subquery()
+    )
+    result = await ctx.execute(
+        select(ranked.c.author_id, Paper)
+        .join(Paper, Paper.id == ranked.c.paper_id)
+        .where(ranked.c.rank <= RECENT_PAPERS_LIMIT)
+        .order_by(ranked.c.author_id, ranked.c.rank)
+        .options(raiseload("*"))
+    )
+    rows = result.all()
+    papers = list({paper.id: paper for _, paper in rows}.values())
+    await vote_aggregator.merge_pending(papers)
+    ctx.prime_papers(papers)
+
+    grouped: Dict[str, List[Paper]] = defaultdict(list)
+    for author_id, paper in rows:
+        grouped[author_id].append(paper)
+    return [grouped.get(i, []) for i in author_ids]
+
+
+async def load_stats_by_author(ctx: GraphQLContext, author_ids: List[str]) -> List[Optional[AuthorStats]]:
+    query = select(AuthorStats).where(AuthorStats.author_id.in_(author_ids))
+    result = await ctx.execute(query)
+    by_id = {s.author_id: s for s in result.scalars().all()}
+
+    # Missing stats are computed in the background, as get_author does;
+    # the stats field resolves to null until then
+    missing = [i for i in author_ids if i not in by_id]
+    if missing:
+        schedule_refresh(missing)
+    return [by_id.get(i) for i in author_ids]
+
+
+async def load_moderation(ctx: GraphQLContext, paper_ids: List[str]) -> List[Optional[Tuple]]:
+    result = await ctx.execute(select(*MODERATION_COLUMNS).where(Paper.id.in_(paper_ids)))
+    by_id = {row.id: row for row in result.all()}
+    return [by_id.get(i) for i in paper_ids]
+
+
+async def load_my_votes(ctx: GraphQLContext, paper_ids: List[str]) -> List[int]:
+    user_id = await ctx.user_id()
+    if not user_id:
+        return [0] * len(paper_ids)
+    result = await ctx.execute(
+        select(PaperVote.paper_id, PaperVote.vote).where(
+            PaperVote.user_id == user_id,
+            PaperVote.paper_id.in_(paper_ids),
+        )
+    )
+    votes = dict(result.all())
+    return [votes.get(i, 0) for i in paper_ids]
+
+
+async def get_context(request: Request, db: AsyncSession = Depends(get_read_db)) -> GraphQLContext:
+    # The schema has no mutations: every query runs on a read-only session
+    return GraphQLContext(db, get_token_subject(request))
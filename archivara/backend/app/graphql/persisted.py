@@ -0,0 +1,106 @@
+"""
+Persisted queries.
+
+Supports the Apollo automatic persisted query protocol
+(`extensions.persistedQuery.sha256Hash`): clients send only the hash and
+register the full query on a miss. A manifest of known queries can be
+loaded from GRAPHQL_PERSISTED_QUERIES_FILE, and with
+GRAPHQL_PERSISTED_QUERIES_ONLY arbitrary queries are rejected.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+
+class PersistedQueryError(Exception):
+    def __init__(self, code: str, message: str):
+        self.code = code
+        self.message = message
+        super().__init__(message)
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class PersistedQueryStore:
+    """Manifest queries plus a bounded LRU of automatically registered ones"""
+
+    def __init__(self, manifest_path: Optional[str], cache_size: int, persisted_only: bool):
+        self.manifest: Dict[str, str] = {}
+        self.cache: "OrderedDict[str, str]" = OrderedDict()
+        self.cache_size = cache_size
+        self.persisted_only = persisted_only
+        if manifest_path:
+            self.load_manifest(manifest_path)
+
+    def load_manifest(self, path: str) -> None:
+        with open(path) as f:
+            entries = json.load(f)
+        for digest, query in entries.items():
+            if query_hash(query) != digest:
+                raise ValueError(f"Persisted query hash mismatch for {digest}")
+        self.manifest.update(entries)
+        logger.info("Loaded persisted GraphQL queries", count=len(entries), path=path)
+
+    def _get(self, digest: str) -> Optional[str]:
+        if digest in self.manifest:
+            return self.manifest[digest]
+        query = self.cache.get(digest)
+        if query is not None:
+            self.cache.move_to_end(digest)
+        return query
+
+    def _remember(self, digest: str, query: str) -> None:
+        self.cache[digest] = query
+        self.cache.move_to_end(digest)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def resolve(self, query: Optional[str], extensions: Optional[dict]) -> Optional[str]:
+        """Return the query text to execute, or raise PersistedQueryError"""
+        persisted = (extensions or {}).get("persistedQuery")
+        if not persisted:
+            if query and self.persisted_only:
+                raise PersistedQueryError(
+                    "PERSISTED_QUERY_REQUIRED", "Only persisted queries are allowed"
+                )
+            return query
+
+        digest = str(persisted.get("sha256Hash") or "").lower()
+        if not digest:
+            raise PersistedQueryError("PERSISTED_QUERY_INVALID", "Missing sha256Hash")
+
+        if not query:
+            known = self._get(digest)
+            if known is None:
+                raise PersistedQueryError("PERSISTED_QUERY_NOT_FOUND", "PersistedQueryNotFound")
+            return known
+
+        if query_hash(query) != digest:
+            raise PersistedQueryError(
+                "PERSISTED_QUERY_INVALID", "provided sha does not match query"
+            )
+        if digest not in self.manifest:
+            if self.persisted_only:
+                raise PersistedQueryError(
+                    "PERSISTED_QUERY_REQUIRED", "Only persisted queries are allowed"
+                )
+            self._remember(digest, query)
+        return query
+
+
+# Singleton instance
+persisted_queries = PersistedQueryStore(
+    settings.GRAPHQL_PERSISTED_QUERIES_FILE,
+    settings.GRAPHQL_APQ_CACHE_SIZE,
+    settings.GRAPHQL_PERSISTED_QUERIES_ONLY,
+)
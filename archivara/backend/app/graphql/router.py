@@ -0,0 +1,59 @@
+"""
+GraphQL router with persisted query support.
+
+Imported on the first GraphQL request by app.api.v1.endpoints.graphql,
+so strawberry, graphql-core and the schema stay out of startup.
+"""
+
+import dataclasses
+import json
+
+from graphql import GraphQLError
+from strawberry.fastapi import GraphQLRouter
+from strawberry.http import GraphQLRequestData
+from strawberry.types import ExecutionResult
+
+from app.core.config import settings
+from app.graphql.context import get_context
+from app.graphql.persisted import PersistedQueryError, persisted_queries
+from app.graphql.schema import schema
+
+
+class PersistedQueryRouter(GraphQLRouter):
+    """GraphQLRouter that resolves `extensions.persistedQuery` before execution"""
+
+    async def parse_http_body(self, request) -> GraphQLRequestData:
+        data = await super().parse_http_body(request)
+
+        if request.method == "GET":
+            extensions = request.query_params.get("extensions")
+        else:
+            try:
+                extensions = json.loads(await request.get_body()).get("extensions")
+            except (ValueError, AttributeError):
+                extensions = None
+        if isinstance(extensions, str):
+            try:
+                extensions = json.loads(extensions)
+            except ValueError:
+                extensions = None
+
+        query = persisted_queries.resolve(data.query, extensions)
+        return dataclasses.replace(data, query=query)
+
+    async def execute_operation(self, request, context, root_value):
+        try:
+            return await super().execute_operation(request, context, root_value)
+        except PersistedQueryError as e:
+            # Reported as a GraphQL error so APQ clients can retry with the full query
+            return ExecutionResult(
+                data=None,
+                errors=[GraphQLError(e.message, extensions={"code": e.code})],
+            )
+
+
+router = PersistedQueryRouter(
+    schema,
+    context_getter=get_context,
+    graphql_ide="graphiql" if settings.DEBUG else None,
+)
@@ -0,0 +1,163 @@
+"""
+GraphQL schema: papers, authors, the viewer's votes and moderation status.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+import strawberry
+from strawberry.extensions import QueryDepthLimiter
+from strawberry.types import Info
+
+from app.core.config import settings
+from app.graphql.complexity import ComplexityLimiter
+from app.graphql.context import GraphQLContext
+
+MAX_IDS_PER_QUERY = 100
+
+
+@strawberry.type
+class ModerationStatus:
+    baseline_status: str
+    quality_score: int
+    visibility_tier: str
+    needs_review: bool
+    flag_count: int
+    red_flags: List[str]
+
+
+@strawberry.type
+class AuthorStats:
+    total_papers: int
+    total_citations: int
+    h_index: int
+    research_areas: List[str]
+
+
+@strawberry.type
+class Author:
+    id: strawberry.ID
+    name: str
+    affiliation: Optional[str]
+    orcid: Optional[str]
+    is_ai_model: bool
+
+    @classmethod
+    def from_model(cls, author) -> "Author":
+        return cls(
+            id=author.id,
+            name=author.name,
+            affiliation=author.affiliation,
+            orcid=author.orcid,
+            is_ai_model=bool(author.is_ai_model),
+        )
+
+    @strawberry.field
+    async def stats(self, info: Info[GraphQLContext, None]) -> Optional[AuthorStats]:
+        stats = await info.context.stats_by_author.load(self.id)
+        if stats is None:
+            return None
+        return AuthorStats(
+            total_papers=stats.total_papers or 0,
+            total_citations=stats.total_citations or 0,
+            h_index=stats.h_index or 0,
+            research_areas=stats.research_areas or [],
+        )
+
+    @strawberry.field(description="Most recent papers, newest first (up to 10)")
+    async def recent_papers(self, info: Info[GraphQLContext, None]) -> List["Paper"]:
+        papers = await info.context.recent_papers_by_author.load(self.id)
+        return [Paper.from_model(p) for p in papers]
+
+
+@strawberry.type
+class Paper:
+    id: strawberry.ID
+    title: str
+    abstract: str
+    doi: Optional[str]
+    arxiv_id: Optional[str]
+    status: str
+    categories: List[str]
+    generation_method: Optional[str]
+    pdf_url: Optional[str]
+    published_at: Optional[datetime]
+    created_at: datetime
+    community_upvotes: int
+    community_downvotes: int
+    citation_count: int
+    cited_by_count: int
+
+    @classmethod
+    def from_model(cls, paper) -> "Paper":
+        return cls(
+            id=paper.id,
+            title=paper.title,
+            abstract=paper.abstract,
+            doi=paper.doi,
+            arxiv_id=paper.arxiv_id,
+            status=paper.status.value,
+            categories=paper.categories or [],
+            generation_method=paper.generation_method,
+            pdf_url=paper.pdf_url,
+            published_at=paper.published_at,
+            created_at=paper.created_at,
+            community_upvotes=paper.community_upvotes or 0,
+            community_downvotes=paper.community_downvotes or 0,
+            citation_count=paper.citation_count or 0,
+            cited_by_count=paper.cited_by_count or 0,
+        )
+
+    @strawberry.field
+    async def authors(self, info: Info[GraphQLContext, None]) -> List[Author]:
+        authors = await info.context.authors_by_paper.load(self.id)
+        return [Author.from_model(a) for a in authors]
+
+    @strawberry.field(description="Viewer's vote: 1, -1, or 0 (none or anonymous)")
+    async def my_vote(self, info: Info[GraphQLContext, None]) -> int:
+        return await info.context.my_votes.load(self.id)
+
+    @strawberry.field
+    async def moderation(self, info: Info[GraphQLContext, None]) -> Optional[ModerationStatus]:
+        row = await info.context.moderation.load(self.id)
+        if row is None:
+            return None
+        return ModerationStatus(
+            baseline_status=row.baseline_status.value,
+            quality_score=row.quality_score or 0,
+            visibility_tier=row.visibility_tier.value,
+            needs_review=bool(row.needs_review),
+            flag_count=row.flag_count or 0,
+            red_flags=row.red_flags or [],
+        )
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def paper(self, info: Info[GraphQLContext, None], id: strawberry.ID) -> Optional[Paper]:
+        paper = await info.context.papers.load(id)
+        return Paper.from_model(paper) if paper else None
+
+    @strawberry.field(description=f"Papers by id, in request order (max {MAX_IDS_PER_QUERY})")
+    async def papers(
+        self, info: Info[GraphQLContext, None], ids: List[strawberry.ID]
+    ) -> List[Optional[Paper]]:
+        if len(ids) > MAX_IDS_PER_QUERY:
+            raise ValueError(f"At most {MAX_IDS_PER_QUERY} ids per query")
+        papers = await info.context.papers.load_many(ids)
+        return [Paper.from_model(p) if p else None for p in papers]
+
+    @strawberry.field
+    async def author(self, info: Info[GraphQLContext, None], id: strawberry.ID) -> Optional[Author]:
+        author = await info.context.authors.load(id)
+        return Author.from_model(author) if author else None
+
+
+schema = strawberry.Schema(
+    query=Query,
+    extensions=[
+        QueryDepthLimiter(max_depth=settings.GRAPHQL_MAX_DEPTH),
+        ComplexityLimiter(max_complexity=settings.GRAPHQL_MAX_COMPLEXITY),
+    ],
+)
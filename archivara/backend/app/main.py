@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from starlette.middleware.sessions import SessionMiddleware
@@ -8,8 +9,10 @@ import structlog
 from app.core.config import settings
 from app.api.v1.api import api_router
 from app.core.logging import configure_logging
-from app.db.session import engine
+from app.db.session import engine, replica_router
 from app.db.base_class import Base
+from app.services.votes import vote_aggregator
+from app.services.readiness import readiness
 
 
 # Configure structured logging
@@ -26,11 +29,21 @@ async def lifespan(app: FastAPI):
     # Note: Database tables are created via Alembic migrations in start.sh
     # Do not use Base.metadata.create_all as it bypasses migration tracking
 
+    vote_aggregator.start()
+    # Pre-fill pools and warm caches in the background; /health/ready gates traffic
+    readiness.start(app)
+    if readiness.warm_before_serving:
+        # Under app.server: this worker accepts connections only once warm
+        await readiness.wait()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Archivara API")
+    await readiness.stop()
+    await vote_aggregator.stop()
     await engine.dispose()
+    await replica_router.dispose()
 
 
 # Create FastAPI app
@@ -71,6 +84,8 @@ async def trust_railway_proxy(request, call_next):
     )
 
     response = await call_next(request)
+    # Read-your-writes: keep this client's reads on the primary for a while
+    await replica_router.mark_write(request, response)
     return response
 
 # Configure CORS - allow specific origins in production
@@ -109,13 +124,21 @@ app.add_middleware(
 #     instrumentator = Instrumentator()
 #     instrumentator.instrument(app).expose(app)
 
+if settings.PROMETHEUS_ENABLED:
+    from app.core.metrics import metrics_response
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics (database pool telemetry)"""
+        return metrics_response()
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (liveness only; use /health/ready to gate traffic)"""
     return {
         "status": "healthy",
         "version": settings.APP_VERSION,
@@ -123,6 +146,19 @@ async def health_check():
     }
 
 
+@app.get("/health/live")
+async def liveness():
+    """Liveness: the process is serving requests. No I/O."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness: pools pre-filled, hot caches warm, dependencies within latency budgets"""
+    ready, details = await readiness.status()
+    return JSONResponse(details, status_code=200 if ready else 503)
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
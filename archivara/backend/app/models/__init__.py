@@ -1,3 +1,3 @@
 from .paper import *
 from .user import *
-
+from .import_job import *
@@ -0,0 +1,24 @@
+import uuid
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON
+
+from app.db.base_class import Base
+
+def uuid_str():
+    return str(uuid.uuid4())
+
+class ImportJob(Base):
+    """Bulk metadata import; records_processed is the resume checkpoint"""
+    __tablename__ = "import_jobs"
+
+    id = Column(String, primary_key=True, default=uuid_str)
+    source = Column(String, nullable=False)  # File path the import reads from
+    format = Column(String, nullable=False)  # 'jsonl' or 'csv'
+    status = Column(String, nullable=False, default="pending")  # pending, running, completed, failed
+    records_processed = Column(Integer, nullable=False, default=0)
+    inserted = Column(Integer, nullable=False, default=0)
+    duplicates = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, default=list)  # First validation errors, for inspection
+    options = Column(JSON, default=dict)  # status / visibility_tier for imported papers
+    created_by = Column(String, ForeignKey("users.id"), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
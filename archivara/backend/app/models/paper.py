@@ -1,8 +1,9 @@
 import uuid
 from sqlalchemy import (
     Column, String, Text, DateTime, ForeignKey, Table, JSON,
-    Boolean, Integer, Float, Enum
+    Boolean, Integer, Float, Enum, UniqueConstraint, Index, text
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -37,7 +38,9 @@ paper_authors = Table(
     Base.metadata,
     Column("paper_id", String, ForeignKey("papers.id"), primary_key=True),
     Column("author_id", String, ForeignKey("authors.id"), primary_key=True),
-    Column("order", Integer, default=0)
+    Column("order", Integer, default=0),
+    # author -> papers (the PK is paper_id-first)
+    Index("ix_paper_authors_author_id", "author_id", "paper_id"),
 )
 paper_models = Table(
     "paper_models",
@@ -54,6 +57,24 @@ paper_tools = Table(
 
 class Paper(Base):
     __tablename__ = "papers"
+    # Indexes Column(index=True) can't express; created by migrations (some
+    # CONCURRENTLY), declared here so autogenerate leaves them alone
+    __table_args__ = (
+        Index("ix_papers_doi_lower", text("lower(doi)")),
+        Index("ix_papers_categories_gin", "categories", postgresql_using="gin", postgresql_ops={"categories": "jsonb_path_ops"}),
+        Index("ix_papers_tags_gin", "tags", postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"}),
+        Index("ix_papers_created_at", text("created_at DESC")),
+        Index("ix_papers_status_created_at", "status", text("created_at DESC")),
+        Index("ix_papers_feed_score", text("((quality_score + community_upvotes) - community_downvotes) DESC")),
+        Index("ix_papers_published_at", text("published_at DESC")),
+        Index("ix_papers_submitter_created_at", "submitter_id", text("created_at DESC")),
+        Index("ix_papers_updated_at_id", "updated_at", "id"),
+        Index("ix_papers_needs_review", text("flag_count DESC"), "created_at", postgresql_where=text("needs_review")),
+        Index(
+            "ix_papers_content_key", text("(metadata->>'content_key')"),
+            postgresql_where=text("(metadata->>'content_key') IS NOT NULL"),
+        ),
+    )
     id = Column(String, primary_key=True, default=uuid_str)
     title = Column(String, nullable=False, index=True)
     abstract = Column(Text, nullable=False)
@@ -69,23 +90,27 @@ class Paper(Base):
     code_url = Column(String)
     data_url = Column(String)
     # Metadata
-    categories = Column(JSON, default=list)
-    tags = Column(JSON, default=list)
+    categories = Column(JSONB, default=list)  # GIN (jsonb_path_ops) indexed, see app.db.filters
+    tags = Column(JSONB, default=list)
     generation_method = Column(String)
-    meta = Column("metadata", JSON, default=dict)
+    meta = Column("metadata", JSONB, default=dict)
     # Status and submission
     status = Column(Enum(PaperStatus, values_callable=lambda x: [e.value for e in x]), default=PaperStatus.SUBMITTED.value, nullable=False)
     submitter_id = Column(String, ForeignKey("users.id"), nullable=True)
 
     # Moderation fields
     baseline_status = Column(Enum(BaselineStatus, values_callable=lambda x: [e.value for e in x]), default=BaselineStatus.PENDING.value, nullable=False)
-    baseline_checks = Column(JSON, default=dict)  # Store detailed check results
+    baseline_checks = Column(JSONB, default=dict)  # Store detailed check results
     quality_score = Column(Integer, default=0)  # 0-100
     needs_review = Column(Boolean, default=False)
-    red_flags = Column(JSON, default=list)  # Store detected issues
+    red_flags = Column(JSONB, default=list)  # Store detected issues
     community_upvotes = Column(Integer, default=0)
     community_downvotes = Column(Integer, default=0)
     flag_count = Column(Integer, default=0)
+
+    # Citation counts (maintained incrementally from the citations table)
+    citation_count = Column(Integer, default=0, nullable=False, server_default="0")  # Papers this one cites
+    cited_by_count = Column(Integer, default=0, nullable=False, server_default="0")  # Archivara papers citing this one
     visibility_tier = Column(Enum(VisibilityTier, values_callable=lambda x: [e.value for e in x]), default=VisibilityTier.RAW.value, nullable=False)
     moderation_notes = Column(Text, nullable=True)
 
@@ -109,6 +134,33 @@ class Author(Base):
     model_version = Column(String)
     papers = relationship("Paper", secondary=paper_authors, back_populates="authors")
 
+class AuthorStats(Base):
+    """Precomputed profile statistics, refreshed when an author's papers change"""
+    __tablename__ = "author_stats"
+    author_id = Column(String, ForeignKey("authors.id", ondelete="CASCADE"), primary_key=True)
+    total_papers = Column(Integer, default=0, nullable=False)
+    total_citations = Column(Integer, default=0, nullable=False)
+    h_index = Column(Integer, default=0, nullable=False)
+    research_areas = Column(JSON, default=list)  # Most frequent categories first
+    stats_by_year = Column(JSON, default=list)  # [{"year", "papers", "citations"}], newest first
+    collaborators = Column(JSON, default=list)  # [{"id", "name", "papers"}], most frequent first
+
+coauthor_edges = Table(
+    "coauthor_edges",
+    Base.metadata,
+    # Undirected edge stored once with author_a < author_b
+    Column("author_a", String, ForeignKey("authors.id", ondelete="CASCADE"), primary_key=True),
+    Column("author_b", String, ForeignKey("authors.id", ondelete="CASCADE"), primary_key=True, index=True),
+    Column("weight", Integer, nullable=False, default=1)  # Number of shared papers
+)
+
+class Citation(Base):
+    """A reference from one paper to a DOI, linked to the cited paper when we host it"""
+    __tablename__ = "citations"
+    citing_paper_id = Column(String, ForeignKey("papers.id", ondelete="CASCADE"), primary_key=True)
+    cited_doi = Column(String, primary_key=True, index=True)  # Normalized (lowercase, no resolver prefix)
+    cited_paper_id = Column(String, ForeignKey("papers.id", ondelete="SET NULL"), nullable=True, index=True)
+
 class Model(Base):
     __tablename__ = "models"
     id = Column(String, primary_key=True, default=uuid_str)
@@ -140,6 +192,9 @@ class Embedding(Base):
 class PaperVote(Base):
     """Track user votes on papers (upvote/downvote)"""
     __tablename__ = "paper_votes"
+    __table_args__ = (
+        UniqueConstraint("paper_id", "user_id", name="uq_paper_votes_paper_user"),
+    )
 
     id = Column(String, primary_key=True, default=uuid_str)
     paper_id = Column(String, ForeignKey("papers.id"), nullable=False, index=True)
@@ -173,6 +228,9 @@ class PaperFlag(Base):
 class SubmissionAttempt(Base):
     """Track submission attempts for spam prevention and cooldown"""
     __tablename__ = "submission_attempts"
+    __table_args__ = (
+        Index("ix_submission_attempts_user_status_created", "user_id", "status", text("created_at DESC")),
+    )
 
     id = Column(String, primary_key=True, default=uuid_str)
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
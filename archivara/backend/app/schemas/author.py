@@ -35,6 +35,34 @@ class YearStats(BaseModel):
     papers: int
     citations: int
 
+class GraphNode(BaseModel):
+    id: str
+    name: str
+    distance: int
+
+class GraphEdge(BaseModel):
+    source: str
+    target: str
+    weight: int
+
+class NeighborhoodResponse(BaseModel):
+    author_id: str
+    depth: int
+    nodes: List[GraphNode]
+    edges: List[GraphEdge]
+    truncated: bool
+
+class PathStep(BaseModel):
+    id: str
+    name: str
+    shared_papers: int  # With the previous author on the path
+
+class CollaborationPathResponse(BaseModel):
+    source_id: str
+    target_id: str
+    distance: Optional[int]
+    path: List[PathStep]
+
 class AuthorDetailResponse(AuthorBase):
     id: str
     h_index: int
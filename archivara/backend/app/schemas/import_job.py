@@ -0,0 +1,18 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+
+class ImportJobResponse(BaseModel):
+    id: str
+    source: str
+    format: str
+    status: str
+    records_processed: int
+    inserted: int
+    duplicates: int
+    failed: int
+    errors: List[Dict[str, Any]] = []
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
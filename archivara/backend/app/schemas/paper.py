@@ -109,13 +109,13 @@ class PaperUpdate(BaseModel):
 
 class PaperInDB(PaperBase):
     id: UUID
-    pdf_url: str
+    pdf_url: Optional[str] = None  # None for bulk-imported metadata
     pdf_hash: Optional[str] = None
     tex_hash: Optional[str] = None
     status: str = "pending"
     cluster_id: Optional[int] = None
     cluster_confidence: Optional[float] = None
-    submitter_id: UUID
+    submitter_id: Optional[UUID] = None  # None for bulk-imported papers
     created_at: datetime
     updated_at: datetime
     
@@ -163,17 +163,60 @@ class PaperResponse(PaperInDB):
             authors=paper.authors,
             models=paper.models,
             tools=paper.tools,
-            citation_count=0,
-            cited_by_count=0,
+            citation_count=paper.citation_count or 0,
+            cited_by_count=paper.cited_by_count or 0,
             community_upvotes=paper.community_upvotes or 0,
             community_downvotes=paper.community_downvotes or 0
         )
 
 
+class PaperBatchRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1)
+
+
+class PaperBatchResponse(BaseModel):
+    """Papers in request order plus the ids that were not found"""
+    items: List[PaperResponse]
+    missing: List[str] = Field(default_factory=list)
+
+
 class PaperList(BaseModel):
     """Response model for paper list endpoints"""
     items: List[PaperResponse]
     total: int
     page: int
     size: int
-    pages: int 
\ No newline at end of file
+    pages: int
+
+class CardAuthor(BaseModel):
+    id: str
+    name: str
+
+
+class PaperCard(BaseModel):
+    """Compact paper summary for list and feed views"""
+    id: str
+    title: str
+    abstract: str  # Truncated, see abstract_truncated
+    abstract_truncated: bool = False
+    authors: List[CardAuthor] = Field(default_factory=list)
+    categories: List[str] = Field(default_factory=list)
+    meta: Dict[str, Any] = Field(default_factory=dict)  # {"ai_tools": [...]} only
+    generation_method: Optional[str] = None
+    status: str
+    visibility_tier: Optional[str] = None
+    published_at: Optional[datetime] = None
+    created_at: datetime
+    quality_score: int = 0
+    community_upvotes: int = 0
+    community_downvotes: int = 0
+    citation_count: int = 0
+
+
+class PaperCardList(BaseModel):
+    """Response model for card list endpoints"""
+    items: List[PaperCard]
+    total: int
+    page: int
+    size: int
+    pages: int
@@ -0,0 +1,366 @@
+"""
+Production server: a preforking supervisor around uvicorn.
+
+Implements:
+1. settings.WORKERS worker processes sharing one listening socket, forked
+   from a parent that has already imported the app (preload), so workers
+   start without re-importing and share the parent's memory pages
+2. Worker recycling after WORKER_MAX_REQUESTS requests (plus jitter, so
+   workers don't restart together) or once resident memory exceeds
+   WORKER_MAX_RSS_MB; workers count requests in shared memory, and in both
+   cases a replacement is started and the old worker drains only once the
+   replacement is warm
+3. Graceful drain on SIGTERM/SIGINT: workers stop accepting, finish
+   in-flight requests (including the inline moderation of submissions) and
+   run lifespan shutdown (vote flush, pool disposal), bounded by
+   GRACEFUL_TIMEOUT_SECONDS. SIGHUP replaces every worker the same way
+4. Shared state across workers: Prometheus multiprocess mode through
+   PROMETHEUS_MULTIPROC_DIR, and a startup check that rate limits reach
+   Redis instead of falling back to per-worker memory
+5. Warm workers only: each worker completes readiness warm-up in its
+   lifespan startup, before accepting on the shared socket, and signals the
+   supervisor through an Event
+
+Run with `python -m app.server` (after migrations; see start.sh).
+"""
+
+import argparse
+import glob
+import multiprocessing
+import multiprocessing.synchronize
+import os
+import random
+import shutil
+import signal
+import socket
+import tempfile
+import time
+from multiprocessing.connection import wait
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# A worker that exits non-zero this soon after starting failed to boot
+BOOT_WINDOW_SECONDS = 5.0
+
+
+def prepare_metrics_dir() -> bool:
+    """
+    Point prometheus_client at a multiprocess directory; must run before
+    anything imports it. Returns True if the directory was created here
+    (and should be removed on exit).
+    """
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="archivara-metrics-")
+        return True
+    os.makedirs(path, exist_ok=True)
+    # Files left by a previous run would be aggregated with this one's
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+    return False
+
+
+def check_shared_state(workers: int) -> None:
+    """Warn about state that each worker keeps to itself"""
+    if workers < 2:
+        return
+    if settings.RATE_LIMIT_ENABLED:
+        import redis
+
+        url = settings.RATE_LIMIT_REDIS_URL or settings.REDIS_URL
+        try:
+            redis.Redis.from_url(url, socket_connect_timeout=1, socket_timeout=1).ping()
+        except Exception as e:
+            logger.warning(
+                "Redis unreachable; rate limits fall back to per-worker memory",
+                workers=workers, error=str(e),
+            )
+    from app.db.pool import pool_limits
+
+    pool_size, max_overflow = pool_limits()
+    if (pool_size, max_overflow) != (settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW):
+        logger.warning(
+            "Database pools cut to fit DB_MAX_CONNECTIONS across workers",
+            workers=workers, max_connections=settings.DB_MAX_CONNECTIONS,
+            pool_size=pool_size, max_overflow=max_overflow,
+        )
+    if settings.DATABASE_REPLICA_URLS and settings.REPLICA_STICKY_BACKEND == "memory":
+        logger.warning(
+            "Read-your-writes stickiness is per worker; set REPLICA_STICKY_BACKEND=redis",
+            workers=workers,
+        )
+    from app.services.paper_cache import paper_cache
+
+    if paper_cache.enabled and settings.PAPER_CACHE_BACKEND == "memory":
+        logger.warning(
+            "Paper cache is per worker; invalidations don't reach other workers until the TTL expires",
+            workers=workers, ttl=settings.PAPER_CACHE_TTL_SECONDS,
+        )
+    if settings.VOTE_WRITE_BEHIND and settings.VOTE_WRITE_BEHIND_BACKEND == "memory":
+        logger.warning(
+            "Pending votes are per worker; counts and a voter's own vote differ between "
+            "workers until each flushes. Set VOTE_WRITE_BEHIND_BACKEND=redis",
+            workers=workers, flush_interval=settings.VOTE_FLUSH_INTERVAL_SECONDS,
+        )
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB (Linux /proc; None elsewhere)"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def count_requests(app, served):
+    """ASGI wrapper counting HTTP requests into a shared value the supervisor reads"""
+    async def counted(scope, receive, send):
+        if scope["type"] == "http":
+            served.value += 1
+        await app(scope, receive, send)
+    return counted
+
+
+def serve_worker(app, sock: socket.socket, served, warm) -> None:
+    """Worker process body: run uvicorn on the inherited socket until told to drain"""
+    import uvicorn
+
+    from app.db.session import engine, replica_router
+    from app.services.readiness import readiness
+
+    # Own process group, so a terminal Ctrl+C reaches only the supervisor,
+    # which then drains workers with a single SIGTERM (a second one would
+    # make uvicorn skip the graceful wait)
+    os.setpgrp()
+    signal.set_wakeup_fd(-1)
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+        signal.signal(sig, signal.SIG_DFL)
+
+    # Pools are empty after preload, but never reuse a connection across fork
+    engine.sync_engine.dispose(close=False)
+    for replica in replica_router.replicas:
+        replica.engine.sync_engine.dispose(close=False)
+
+    # uvicorn accepts only after lifespan startup, which now waits for warm-up
+    readiness.warm_before_serving = True
+    readiness.on_warm = warm.set
+
+    # No limit_max_requests: the supervisor replaces the worker at its
+    # request limit, so it only drains once the replacement is warm
+    config = uvicorn.Config(
+        count_requests(app, served),
+        lifespan="on",
+        timeout_graceful_shutdown=settings.GRACEFUL_TIMEOUT_SECONDS,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Supervisor:
+    """Keep `workers` processes serving; recycle, replace and drain them"""
+
+    def __init__(self, app, sock: socket.socket, workers: int):
+        self.app = app
+        self.sock = sock
+        self.size = workers
+        self.context = multiprocessing.get_context("fork")
+        self.active: Dict[int, multiprocessing.Process] = {}
+        self.started: Dict[int, float] = {}
+        self.retiring: Dict[int, float] = {}  # pid -> kill deadline
+        self.warm: Dict[int, multiprocessing.synchronize.Event] = {}
+        self.served: Dict[int, Any] = {}  # pid -> shared request counter
+        self.max_requests: Dict[int, int] = {}
+        self.replacing: Dict[int, int] = {}  # new pid -> pid it replaces once warm
+        self.processes: Dict[int, multiprocessing.Process] = {}
+        self.signals: List[int] = []
+        self.draining = False
+
+    def spawn(self) -> int:
+        max_requests = None
+        if settings.WORKER_MAX_REQUESTS > 0:
+            max_requests = settings.WORKER_MAX_REQUESTS + random.randint(0, settings.WORKER_MAX_REQUESTS_JITTER)
+        warm = self.context.Event()
+        # Only the worker writes it; the supervisor just reads
+        served = self.context.Value("L", 0, lock=False)
+        process = self.context.Process(
+            target=serve_worker, args=(self.app, self.sock, served, warm), name="archivara-worker"
+        )
+        process.start()
+        self.active[process.pid] = process
+        self.processes[process.pid] = process
+        self.started[process.pid] = time.monotonic()
+        self.warm[process.pid] = warm
+        self.served[process.pid] = served
+        if max_requests is not None:
+            self.max_requests[process.pid] = max_requests
+        logger.info("Worker started", pid=process.pid, max_requests=max_requests)
+        return process.pid
+
+    def retire(self, pid: int, reason: str) -> None:
+        """Ask a worker to drain: stop accepting and finish in-flight requests"""
+        process = self.active.pop(pid, None)
+        if process is None:
+            return
+        logger.info("Draining worker", pid=pid, reason=reason)
+        self.retiring[pid] = time.monotonic() + settings.GRACEFUL_TIMEOUT_SECONDS + 10
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def replace(self, pid: int, reason: str) -> None:
+        """
+        Start a replacement and drain the old worker once the replacement is
+        warm (see check), so capacity doesn't dip and no traffic lands on a
+        cold worker
+        """
+        if pid in self.replacing.values():
+            return
+        logger.info("Replacing worker", pid=pid, reason=reason)
+        self.replacing[self.spawn()] = pid
+
+    def reap(self) -> None:
+        from prometheus_client import multiprocess
+
+        for pid, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+            process.join()
+            del self.processes[pid]
+            self.retiring.pop(pid, None)
+            self.warm.pop(pid, None)
+            self.served.pop(pid, None)
+            self.max_requests.pop(pid, None)
+            multiprocess.mark_process_dead(pid)
+            uptime = time.monotonic() - self.started.pop(pid)
+            replaces = self.replacing.pop(pid, None)
+            if self.active.pop(pid, None) is None or self.draining:
+                logger.info("Worker exited", pid=pid, code=process.exitcode)
+                continue
+            replaced_by = next((new for new, old in self.replacing.items() if old == pid), None)
+            if replaced_by is not None:
+                # Its replacement is already starting
+                del self.replacing[replaced_by]
+                logger.info("Worker exited before its replacement was warm", pid=pid, code=process.exitcode)
+                continue
+            if process.exitcode == 0:
+                logger.warning("Worker exited unexpectedly", pid=pid, uptime=round(uptime))
+            else:
+                logger.error("Worker died", pid=pid, code=process.exitcode, uptime=round(uptime, 1))
+                if uptime < BOOT_WINDOW_SECONDS:
+                    # Don't spin on an app that can't start
+                    time.sleep(1)
+            if replaces is not None and replaces in self.active:
+                # A replacement died before it was warm; try again
+                self.replace(replaces, "replacement died")
+            else:
+                self.spawn()
+
+    def check(self) -> None:
+        for pid, old_pid in list(self.replacing.items()):
+            if self.warm[pid].is_set():
+                del self.replacing[pid]
+                self.retire(old_pid, "replaced")
+        now = time.monotonic()
+        for pid, deadline in list(self.retiring.items()):
+            if now >= deadline:
+                logger.error("Worker did not drain in time, killing", pid=pid)
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                self.retiring.pop(pid)
+        if self.draining:
+            return
+        for pid in list(self.active):
+            limit = self.max_requests.get(pid)
+            if limit is not None and self.served[pid].value >= limit:
+                self.replace(pid, f"served {limit} requests")
+                continue
+            if settings.WORKER_MAX_RSS_MB <= 0:
+                continue
+            rss = rss_mb(pid)
+            if rss is not None and rss > settings.WORKER_MAX_RSS_MB:
+                self.replace(pid, f"rss {rss:.0f} MB > {settings.WORKER_MAX_RSS_MB} MB")
+
+    def handle_signals(self) -> None:
+        while self.signals:
+            sig = self.signals.pop(0)
+            if sig in (signal.SIGTERM, signal.SIGINT) and not self.draining:
+                logger.info("Draining all workers", signal=signal.Signals(sig).name, workers=len(self.active))
+                self.draining = True
+                self.replacing.clear()
+                for pid in list(self.active):
+                    self.retire(pid, "shutdown")
+            elif sig == signal.SIGHUP and not self.draining:
+                logger.info("Replacing all workers")
+                for pid in list(self.active):
+                    self.replace(pid, "reload")
+
+    def run(self) -> None:
+        wakeup_read, wakeup_write = os.pipe()
+        os.set_blocking(wakeup_read, False)
+        os.set_blocking(wakeup_write, False)
+        signal.set_wakeup_fd(wakeup_write)
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sig, lambda signum, frame: self.signals.append(signum))
+
+        for _ in range(self.size):
+            self.spawn()
+
+        while not (self.draining and not self.processes):
+            sentinels = [p.sentinel for p in self.processes.values()]
+            wait([*sentinels, wakeup_read], timeout=settings.WORKER_CHECK_INTERVAL_SECONDS)
+            try:
+                os.read(wakeup_read, 512)
+            except BlockingIOError:
+                pass
+            self.handle_signals()
+            self.reap()
+            self.check()
+        logger.info("All workers stopped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the Archivara API with multiple workers")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--workers", type=int, default=settings.WORKERS)
+    args = parser.parse_args()
+
+    # Anything sized by the worker count (e.g. the paper cache) reads it at import
+    settings.WORKERS = args.workers
+    created_metrics_dir = prepare_metrics_dir()
+    sock = bind_socket(args.host, args.port)
+
+    # Preload: import the app (and everything it imports) once, before forking
+    from app.main import app
+
+    check_shared_state(args.workers)
+    logger.info("Starting supervisor", host=args.host, port=args.port, workers=args.workers)
+    try:
+        Supervisor(app, sock, args.workers).run()
+    finally:
+        sock.close()
+        if created_metrics_dir:
+            shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
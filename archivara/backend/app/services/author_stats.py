@@ -0,0 +1,245 @@
+"""
+Precomputed author profile statistics.
+
+Author pages used to load every paper an author wrote (with all
+relationships) and aggregate in Python on each request. Instead:
+1. Stats are computed with SQL aggregates (GROUP BY year, category
+   frequency, h-index over cited_by_count) for a set of authors;
+   collaborators come from the materialized coauthor_edges table
+2. Results are upserted into author_stats under a per-author advisory
+   lock, so concurrent refreshes of one author apply in commit order
+   instead of overwriting each other with stale totals
+3. Paper submit/delete refreshes the stats of that paper's authors.
+   Existing authors are backfilled by migration 4f6b8d2a0c93; a row that
+   is still missing is scheduled for a background refresh on the primary
+   on first read, which returns empty stats meanwhile
+"""
+
+import asyncio
+from typing import Iterable, List, Set
+
+import structlog
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.models.paper import AuthorStats, paper_authors
+
+logger = structlog.get_logger()
+
+MAX_RESEARCH_AREAS = 10
+MAX_COLLABORATORS = 10
+
+# Taken in sorted order so two transactions refreshing overlapping author
+# sets cannot deadlock. Held until commit; the refresh statement runs after
+# it and so sees any stats transaction that finished while we waited.
+LOCK_AUTHORS_SQL = text("""
+SELECT pg_advisory_xact_lock(hashtext(a.id))
+FROM unnest(CAST(:author_ids AS varchar[])) AS a(id)
+ORDER BY a.id
+""")
+
+# Research areas count the first two categories of each paper, as the
+# profile page always has.
+REFRESH_AUTHOR_STATS_SQL = text("""
+WITH targets AS (
+    SELECT authors.id AS author_id FROM authors
+    WHERE authors.id = ANY(CAST(:author_ids AS varchar[]))
+),
+ap AS (
+    SELECT pa.author_id, p.id AS paper_id, p.published_at, p.categories,
+           COALESCE(p.cited_by_count, 0) AS cited_by_count
+    FROM paper_authors pa
+    JOIN papers p ON p.id = pa.paper_id
+    WHERE pa.author_id = ANY(CAST(:author_ids AS varchar[]))
+),
+totals AS (
+    SELECT targets.author_id,
+           COUNT(ap.paper_id) AS total_papers,
+           COALESCE(SUM(ap.cited_by_count), 0) AS total_citations
+    FROM targets
+    LEFT JOIN ap ON ap.author_id = targets.author_id
+    GROUP BY targets.author_id
+),
+hidx AS (
+    -- h = largest rank r such that the r-th most cited paper has >= r citations
+    SELECT r.author_id, COALESCE(MAX(r.rn) FILTER (WHERE r.cited_by_count >= r.rn), 0) AS h_index
+    FROM (
+        SELECT ap.author_id, ap.cited_by_count,
+               ROW_NUMBER() OVER (PARTITION BY ap.author_id ORDER BY ap.cited_by_count DESC) AS rn
+        FROM ap
+    ) r
+    GROUP BY r.author_id
+),
+years AS (
+    SELECT y.author_id,
+           json_agg(json_build_object('year', y.year, 'papers', y.papers, 'citations', y.citations)
+                    ORDER BY y.year DESC) AS stats_by_year
+    FROM (
+        SELECT ap.author_id,
+               CAST(EXTRACT(YEAR FROM ap.published_at) AS integer) AS year,
+               COUNT(*) AS papers,
+               SUM(ap.cited_by_count) AS citations
+        FROM ap
+        WHERE ap.published_at IS NOT NULL
+        GROUP BY 1, 2
+    ) y
+    GROUP BY y.author_id
+),
+areas AS (
+    SELECT a.author_id, json_agg(a.category ORDER BY a.papers DESC, a.category) AS research_areas
+    FROM (
+        SELECT ap.author_id, c.category, COUNT(*) AS papers,
+               ROW_NUMBER() OVER (PARTITION BY ap.author_id
+                                  ORDER BY COUNT(*) DESC, c.category) AS rn
+        FROM ap
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(ap.categories) = 'array'
+                 THEN ap.categories ELSE CAST('[]' AS jsonb) END
+        ) WITH ORDINALITY AS c(category, pos)
+        WHERE c.pos <= 2
+        GROUP BY ap.author_id, c.category
+    ) a
+    WHERE a.rn <= :max_areas
+    GROUP BY a.author_id
+),
+collab AS (
+    SELECT c.author_id,
+           json_agg(json_build_object('id', c.id, 'name', c.name, 'papers', c.papers)
+                    ORDER BY c.papers DESC, c.name) AS collaborators
+    FROM (
+        SELECT e.author_id, co.id, co.name, e.weight AS papers,
+               ROW_NUMBER() OVER (PARTITION BY e.author_id
+                                  ORDER BY e.weight DESC, co.name) AS rn
+        FROM (
+            SELECT author_a AS author_id, author_b AS coauthor_id, weight FROM coauthor_edges
+            WHERE author_a = ANY(CAST(:author_ids AS varchar[]))
+            UNION ALL
+            SELECT author_b, author_a, weight FROM coauthor_edges
+            WHERE author_b = ANY(CAST(:author_ids AS varchar[]))
+        ) e
+        JOIN authors co ON co.id = e.coauthor_id
+    ) c
+    WHERE c.rn <= :max_collaborators
+    GROUP BY c.author_id
+)
+INSERT INTO author_stats (
+    author_id, total_papers, total_citations, h_index,
+    research_areas, stats_by_year, collaborators, created_at, updated_at
+)
+SELECT totals.author_id,
+       totals.total_papers,
+       totals.total_citations,
+       COALESCE(hidx.h_index, 0),
+       COALESCE(areas.research_areas, CAST('[]' AS json)),
+       COALESCE(years.stats_by_year, CAST('[]' AS json)),
+       COALESCE(collab.collaborators, CAST('[]' AS json)),
+       now(), now()
+FROM totals
+LEFT JOIN hidx ON hidx.author_id = totals.author_id
+LEFT JOIN areas ON areas.author_id = totals.author_id
+LEFT JOIN years ON years.author_id = totals.author_id
+LEFT JOIN collab ON collab.author_id = totals.author_id
+ON CONFLICT (author_id) DO UPDATE SET
+    total_papers = EXCLUDED.total_papers,
+    total_citations = EXCLUDED.total_citations,
+    h_index = EXCLUDED.h_index,
+    research_areas = EXCLUDED.research_areas,
+    stats_by_year = EXCLUDED.stats_by_year,
+    collaborators = EXCLUDED.collaborators,
+    updated_at = now()
+""")
+
+
+class AuthorStatsService:
+    """Maintain and read the author_stats table"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def refresh(self, author_ids: Iterable[str]) -> None:
+        """Recompute stats for the given authors in one statement"""
+        author_ids = sorted(set(author_ids))
+        if not author_ids:
+            return
+        await self.db.execute(LOCK_AUTHORS_SQL, {"author_ids": author_ids})
+        await self.db.execute(
+            REFRESH_AUTHOR_STATS_SQL,
+            {
+                "author_ids": author_ids,
+                "max_areas": MAX_RESEARCH_AREAS,
+                "max_collaborators": MAX_COLLABORATORS,
+            },
+        )
+
+    async def author_ids_for_paper(self, paper_id: str) -> List[str]:
+        result = await self.db.execute(
+            select(paper_authors.c.author_id).where(paper_authors.c.paper_id == paper_id)
+        )
+        return list(result.scalars().all())
+
+    async def author_ids_for_papers(self, paper_ids: Iterable[str]) -> List[str]:
+        paper_ids = list(set(paper_ids))
+        if not paper_ids:
+            return []
+        result = await self.db.execute(
+            select(paper_authors.c.author_id)
+            .where(paper_authors.c.paper_id.in_(paper_ids))
+            .distinct()
+        )
+        return list(result.scalars().all())
+
+    async def refresh_for_paper(self, paper_id: str) -> None:
+        """Refresh everyone on a paper (their collaborator lists change together)"""
+        await self.refresh(await self.author_ids_for_paper(paper_id))
+
+    async def refresh_for_papers(self, paper_ids: Iterable[str]) -> None:
+        """Refresh the authors of several papers, e.g. papers whose citation counts changed"""
+        await self.refresh(await self.author_ids_for_papers(paper_ids))
+
+    async def get(self, author_id: str) -> AuthorStats:
+        """Return an author's stats; missing rows read as empty until computed"""
+        stats = await self.db.get(AuthorStats, author_id)
+        if stats is None:
+            schedule_refresh([author_id])
+            stats = empty_stats(author_id)
+        return stats
+
+
+def empty_stats(author_id: str) -> AuthorStats:
+    """Transient placeholder for an author whose stats are not computed yet"""
+    return AuthorStats(
+        author_id=author_id,
+        total_papers=0,
+        total_citations=0,
+        h_index=0,
+        research_areas=[],
+        stats_by_year=[],
+        collaborators=[],
+    )
+
+
+_pending: Set[str] = set()
+_tasks: Set[asyncio.Task] = set()
+
+
+def schedule_refresh(author_ids: Iterable[str]) -> None:
+    """Compute stats on the primary outside the request that asked for them"""
+    author_ids = sorted(set(author_ids) - _pending)
+    if not author_ids:
+        return
+    _pending.update(author_ids)
+    task = asyncio.create_task(_refresh_in_background(author_ids))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def _refresh_in_background(author_ids: List[str]) -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            await AuthorStatsService(db).refresh(author_ids)
+            await db.commit()
+    except Exception as e:
+        logger.warning("Author stats refresh failed", authors=len(author_ids), error=str(e))
+    finally:
+        _pending.difference_update(author_ids)
@@ -0,0 +1,188 @@
+"""
+Bulk author resolution for paper submission.
+
+Resolves a paper's author list against the authors table in a constant
+number of round trips regardless of how many authors the paper has:
+1. One SELECT ... WHERE email IN (...) OR orcid IN (...) for known authors
+2. One INSERT ... ON CONFLICT DO NOTHING RETURNING for new authors
+3. One executemany INSERT for the ordered paper_authors rows
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.paper import Author, paper_authors, uuid_str
+
+
+def _normalize_email(email: Optional[str]) -> Optional[str]:
+    email = (email or "").strip()
+    return email or None
+
+
+def _normalize_orcid(orcid: Optional[str]) -> Optional[str]:
+    orcid = (orcid or "").strip()
+    return orcid or None
+
+
+class AuthorResolutionService:
+    """Resolve and attach authors to papers using set-based queries"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def resolve_authors(self, authors: Sequence[Dict]) -> List[str]:
+        """
+        Resolve author payloads to author ids, creating missing authors.
+
+        Each payload is a dict with 'name' and optional 'email', 'orcid',
+        'affiliation' and 'is_ai_model' (or the submit form's 'isAI').
+        Existing authors are matched by email first, then ORCID.
+
+        Returns author ids in the same order as the input.
+        """
+        entries = [
+            {
+                "name": a.get("name"),
+                "email": _normalize_email(a.get("email")),
+                "orcid": _normalize_orcid(a.get("orcid")),
+                "affiliation": a.get("affiliation"),
+                "is_ai_model": bool(a.get("is_ai_model", a.get("isAI", False))),
+            }
+            for a in authors
+        ]
+
+        emails = {e["email"] for e in entries if e["email"]}
+        orcids = {e["orcid"] for e in entries if e["orcid"]}
+
+        by_email: Dict[str, str] = {}
+        by_orcid: Dict[str, str] = {}
+        if emails or orcids:
+            await self._load_existing(emails, orcids, by_email, by_orcid)
+
+        # Collect authors that still need a row, one per distinct key
+        pending: List[Dict] = []
+        pending_keys = set()
+        for entry in entries:
+            if self._lookup(entry, by_email, by_orcid):
+                continue
+            key = self._key(entry)
+            if key is not None and key in pending_keys:
+                continue
+            if key is not None:
+                pending_keys.add(key)
+            entry["id"] = uuid_str()
+            pending.append(entry)
+
+        if pending:
+            await self._insert_missing(pending, by_email, by_orcid)
+
+        return [self._lookup(entry, by_email, by_orcid) or entry.get("id") for entry in entries]
+
+    async def attach_to_paper(self, paper_id: str, authors: Sequence[Dict]) -> List[str]:
+        """
+        Resolve authors and link them to a paper with explicit ordering.
+
+        Duplicate authors keep their first position. Returns the ordered
+        list of linked author ids.
+        """
+        author_ids = await self.resolve_authors(authors)
+
+        ordered_ids: List[str] = []
+        seen = set()
+        for author_id in author_ids:
+            if author_id not in seen:
+                seen.add(author_id)
+                ordered_ids.append(author_id)
+
+        if ordered_ids:
+            await self.db.execute(
+                paper_authors.insert(),
+                [
+                    {"paper_id": paper_id, "author_id": author_id, "order": idx}
+                    for idx, author_id in enumerate(ordered_ids)
+                ],
+            )
+
+        return ordered_ids
+
+    async def _load_existing(
+        self,
+        emails: set,
+        orcids: set,
+        by_email: Dict[str, str],
+        by_orcid: Dict[str, str],
+    ) -> None:
+        """Fetch existing authors matching any email or ORCID in one query"""
+        conditions = []
+        if emails:
+            conditions.append(Author.email.in_(emails))
+        if orcids:
+            conditions.append(Author.orcid.in_(orcids))
+
+        result = await self.db.execute(
+            select(Author.id, Author.email, Author.orcid).where(or_(*conditions))
+        )
+        for author_id, email, orcid in result.all():
+            self._remember(author_id, email, orcid, by_email, by_orcid)
+
+    async def _insert_missing(
+        self,
+        pending: List[Dict],
+        by_email: Dict[str, str],
+        by_orcid: Dict[str, str],
+    ) -> None:
+        """
+        Insert new authors, tolerating rows created concurrently by
+        another submission (ON CONFLICT DO NOTHING + re-select).
+        """
+        stmt = (
+            pg_insert(Author)
+            .values(pending)
+            .on_conflict_do_nothing()
+            .returning(Author.id, Author.email, Author.orcid)
+        )
+        result = await self.db.execute(stmt)
+        inserted = set()
+        for author_id, email, orcid in result.all():
+            inserted.add(author_id)
+            self._remember(author_id, email, orcid, by_email, by_orcid)
+
+        # Rows skipped by the conflict clause were inserted by a concurrent
+        # request between our SELECT and INSERT; pick up their ids.
+        lost = [p for p in pending if p["id"] not in inserted]
+        lost_emails = {p["email"] for p in lost if p["email"]}
+        lost_orcids = {p["orcid"] for p in lost if p["orcid"]}
+        if lost_emails or lost_orcids:
+            await self._load_existing(lost_emails, lost_orcids, by_email, by_orcid)
+
+    @staticmethod
+    def _key(entry: Dict) -> Optional[Tuple[str, str]]:
+        if entry["email"]:
+            return ("email", entry["email"])
+        if entry["orcid"]:
+            return ("orcid", entry["orcid"])
+        return None
+
+    @staticmethod
+    def _lookup(entry: Dict, by_email: Dict[str, str], by_orcid: Dict[str, str]) -> Optional[str]:
+        if entry["email"] and entry["email"] in by_email:
+            return by_email[entry["email"]]
+        if entry["orcid"] and entry["orcid"] in by_orcid:
+            return by_orcid[entry["orcid"]]
+        return None
+
+    @staticmethod
+    def _remember(
+        author_id: str,
+        email: Optional[str],
+        orcid: Optional[str],
+        by_email: Dict[str, str],
+        by_orcid: Dict[str, str],
+    ) -> None:
+        if email:
+            by_email[email] = author_id
+        if orcid:
+            by_orcid[orcid] = author_id
@@ -0,0 +1,506 @@
+"""
+Bulk import of paper metadata.
+
+Implements:
+1. Streaming JSONL/CSV parsing (arXiv metadata dump fields are mapped onto
+   PaperCreate) with per-record validation
+2. asyncpg COPY of each batch into temporary staging tables
+3. Set-based merges into papers, authors, paper_authors, coauthor_edges and
+   citations, deduplicated by DOI / arXiv id, or for records with neither by
+   a content key (normalized title, first author, year) stored in
+   papers.metadata
+4. A per-batch checkpoint on the import job, committed with the batch, so
+   an interrupted import resumes exactly where it stopped
+5. Atomic claiming of a job, so only one importer runs it at a time
+"""
+
+import asyncio
+import csv
+import gzip
+import hashlib
+import io
+import json
+import re
+from datetime import datetime, timezone
+from typing import Dict, IO, Iterator, List, Optional, Tuple
+
+import structlog
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.import_job import ImportJob
+from app.models.paper import uuid_str
+from app.schemas.paper import PaperCreate
+from app.services.citations import normalize_doi
+from app.services.coauthor_graph import coauthor_graph_cache
+
+logger = structlog.get_logger()
+
+MAX_STORED_ERRORS = 100
+
+STAGING_DDL = [
+    """
+    CREATE TEMP TABLE import_papers (
+        line integer, key text, id text, title text, abstract text, doi text,
+        arxiv_id text, published_at timestamptz, categories text[],
+        generation_method text, meta text
+    ) ON COMMIT DROP
+    """,
+    """
+    CREATE TEMP TABLE import_authors (
+        paper_id text, position integer, name text, email text, orcid text,
+        affiliation text, is_ai_model boolean, author_id text
+    ) ON COMMIT DROP
+    """,
+    "CREATE TEMP TABLE import_citations (paper_id text, doi text) ON COMMIT DROP",
+    "CREATE TEMP TABLE import_new_papers (id text PRIMARY KEY) ON COMMIT DROP",
+]
+
+PAPER_COLUMNS = [
+    "line", "key", "id", "title", "abstract", "doi", "arxiv_id", "published_at",
+    "categories", "generation_method", "meta",
+]
+AUTHOR_COLUMNS = ["paper_id", "position", "name", "email", "orcid", "affiliation", "is_ai_model", "author_id"]
+CITATION_COLUMNS = ["paper_id", "doi"]
+
+# A job is claimed by moving it to running; a running job whose checkpoint
+# hasn't advanced for stale_seconds was interrupted and may be claimed again
+CLAIM_JOB_SQL = text("""
+UPDATE import_jobs SET status = 'running', updated_at = now()
+WHERE id = :job_id
+  AND (status IN ('pending', 'failed')
+       OR (status = 'running' AND updated_at < now() - make_interval(secs => :stale_seconds)))
+RETURNING id
+""")
+
+# Serializes concurrent imports so email/ORCID author matching stays consistent
+IMPORT_LOCK_SQL = text("SELECT pg_advisory_xact_lock(hashtext('archivara_bulk_import'))")
+
+MERGE_PAPERS_SQL = text("""
+WITH src AS (
+    SELECT DISTINCT ON (s.key) s.*
+    FROM import_papers s
+    ORDER BY s.key, s.line
+),
+ins AS (
+    INSERT INTO papers (
+        id, title, abstract, doi, arxiv_id, published_at, categories, tags,
+        generation_method, metadata, status, baseline_status, visibility_tier,
+        baseline_checks, red_flags, quality_score, needs_review, flag_count,
+        community_upvotes, community_downvotes, citation_count, cited_by_count,
+        created_at, updated_at
+    )
+    SELECT src.id, src.title, src.abstract, src.doi, src.arxiv_id,
+           COALESCE(src.published_at, now()), to_jsonb(src.categories), CAST('[]' AS jsonb),
+           src.generation_method, CAST(src.meta AS jsonb),
+           CAST(:status AS paperstatus), CAST('pending' AS baselinestatus),
+           CAST(:visibility_tier AS visibilitytier),
+           CAST('{}' AS jsonb), CAST('[]' AS jsonb), 0, false, 0, 0, 0, 0, 0, now(), now()
+    FROM src
+    WHERE NOT EXISTS (
+        SELECT 1 FROM papers p WHERE src.doi IS NOT NULL AND lower(p.doi) = src.doi
+    )
+    AND NOT EXISTS (
+        SELECT 1 FROM papers p WHERE src.arxiv_id IS NOT NULL AND p.arxiv_id = src.arxiv_id
+    )
+    AND NOT EXISTS (
+        SELECT 1 FROM papers p WHERE src.key LIKE 'content:%' AND p.metadata->>'content_key' = src.key
+    )
+    ON CONFLICT DO NOTHING
+    RETURNING id
+)
+INSERT INTO import_new_papers (id) SELECT id FROM ins
+""")
+
+# Authors match by email, then ORCID, as on submission
+# (AuthorResolutionService). Authors with neither are never matched by name:
+# build_batch gives each one a fresh author_id, so two different people
+# named "Wei Zhang" stay two authors.
+MATCH_AUTHOR = """
+COALESCE(
+    (SELECT a.id FROM authors a WHERE s.email IS NOT NULL AND a.email = s.email LIMIT 1),
+    (SELECT a.id FROM authors a WHERE s.orcid IS NOT NULL AND a.orcid = s.orcid LIMIT 1)
+)
+"""
+
+# Child rows reference the staging paper row they came from, so a duplicate
+# dropped by MERGE_PAPERS_SQL contributes no authors or citations
+NEW_AUTHOR_ROWS = """
+SELECT s.* FROM import_authors s
+JOIN import_new_papers n ON n.id = s.paper_id
+"""
+
+MERGE_AUTHORS_SQL = text("""
+WITH s AS (""" + NEW_AUTHOR_ROWS + """),
+missing AS (
+    SELECT DISTINCT ON (ident) s.*
+    FROM (
+        SELECT s.*, COALESCE('email:' || s.email, 'orcid:' || s.orcid, 'id:' || s.author_id) AS ident
+        FROM s
+    ) s
+    WHERE s.author_id IS NOT NULL OR """ + MATCH_AUTHOR + """ IS NULL
+    ORDER BY ident
+)
+INSERT INTO authors (id, name, email, orcid, affiliation, is_ai_model, created_at, updated_at)
+SELECT COALESCE(author_id, CAST(gen_random_uuid() AS varchar)), name, email, orcid, affiliation,
+       is_ai_model, now(), now()
+FROM missing
+ON CONFLICT DO NOTHING
+""")
+
+LINK_AUTHORS_SQL = text("""
+INSERT INTO paper_authors (paper_id, author_id, "order")
+SELECT DISTINCT ON (linked.paper_id, linked.author_id) linked.paper_id, linked.author_id, linked.position
+FROM (
+    SELECT n.id AS paper_id, s.position, COALESCE(s.author_id, """ + MATCH_AUTHOR + """) AS author_id
+    FROM import_authors s
+    JOIN import_new_papers n ON n.id = s.paper_id
+) linked
+WHERE linked.author_id IS NOT NULL
+ORDER BY linked.paper_id, linked.author_id, linked.position
+ON CONFLICT DO NOTHING
+""")
+
+MERGE_COAUTHOR_EDGES_SQL = text("""
+INSERT INTO coauthor_edges (author_a, author_b, weight)
+SELECT a.author_id, b.author_id, COUNT(*)
+FROM import_new_papers n
+JOIN paper_authors a ON a.paper_id = n.id
+JOIN paper_authors b ON b.paper_id = n.id AND a.author_id < b.author_id
+GROUP BY a.author_id, b.author_id
+ORDER BY a.author_id, b.author_id
+ON CONFLICT (author_a, author_b) DO UPDATE
+SET weight = coauthor_edges.weight + EXCLUDED.weight
+""")
+
+MERGE_CITATIONS_SQL = text("""
+INSERT INTO citations (citing_paper_id, cited_doi, cited_paper_id, created_at, updated_at)
+SELECT DISTINCT ON (n.id, c.doi) n.id, c.doi, cited.id, now(), now()
+FROM import_citations c
+JOIN import_new_papers n ON n.id = c.paper_id
+LEFT JOIN papers cited ON lower(cited.doi) = c.doi AND cited.id <> n.id
+ORDER BY n.id, c.doi, cited.id
+ON CONFLICT DO NOTHING
+""")
+
+# Earlier references to the new papers' DOIs
+LINK_INCOMING_CITATIONS_SQL = text("""
+UPDATE citations c SET cited_paper_id = p.id, updated_at = now()
+FROM import_new_papers n
+JOIN papers p ON p.id = n.id
+WHERE p.doi IS NOT NULL
+  AND c.cited_doi = lower(p.doi)
+  AND c.cited_paper_id IS NULL
+  AND c.citing_paper_id <> p.id
+""")
+
+RECOUNT_CITATIONS_SQL = text("""
+WITH affected AS (
+    SELECT n.id FROM import_new_papers n
+    UNION
+    SELECT c.cited_paper_id FROM citations c
+    JOIN import_new_papers n ON n.id = c.citing_paper_id
+    WHERE c.cited_paper_id IS NOT NULL
+)
+UPDATE papers SET
+    citation_count = (SELECT COUNT(*) FROM citations WHERE citing_paper_id = papers.id),
+    cited_by_count = (SELECT COUNT(*) FROM citations WHERE cited_paper_id = papers.id)
+FROM affected
+WHERE papers.id = affected.id
+RETURNING papers.id
+""")
+
+# Stats of touched authors are recomputed lazily on their next profile view
+INVALIDATE_AUTHOR_STATS_SQL = text("""
+DELETE FROM author_stats
+WHERE author_id IN (
+    SELECT pa.author_id FROM paper_authors pa
+    WHERE pa.paper_id = ANY(CAST(:paper_ids AS varchar[]))
+)
+""")
+
+ARXIV_AUTHOR_SPLIT = re.compile(r",\s*|\s+and\s+")
+
+
+def _split_list(value) -> List[str]:
+    """Accept a list, a JSON list string, or a space/semicolon separated string"""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    value = str(value).strip()
+    if value.startswith("["):
+        try:
+            return _split_list(json.loads(value))
+        except json.JSONDecodeError:
+            pass
+    separator = ";" if ";" in value else None
+    return [v.strip() for v in value.split(separator) if v.strip()]
+
+
+def _authors(record: Dict) -> List[Dict]:
+    if record.get("authors_parsed"):
+        # arXiv dump: [["Last", "First", "Suffix"], ...]
+        return [
+            {"name": " ".join(p for p in (parts[1], parts[0], *parts[2:]) if p).strip()}
+            for parts in record["authors_parsed"]
+            if parts and any(parts)
+        ]
+    authors = record.get("authors")
+    if isinstance(authors, str) and authors.strip().startswith("["):
+        try:
+            authors = json.loads(authors)
+        except json.JSONDecodeError:
+            pass
+    if isinstance(authors, str):
+        # "A; B" (CSV) or arXiv's "A, B and C"
+        names = authors.split(";") if ";" in authors else ARXIV_AUTHOR_SPLIT.split(authors)
+        return [{"name": n.strip()} for n in names if n.strip()]
+    return [a if isinstance(a, dict) else {"name": str(a)} for a in (authors or [])]
+
+
+def _published_at(record: Dict) -> Optional[str]:
+    for field in ("published_at", "published", "update_date", "created"):
+        if record.get(field):
+            return record[field]
+    versions = record.get("versions")
+    if versions and isinstance(versions[0], dict) and versions[0].get("created"):
+        # arXiv: "Mon, 2 Apr 2007 19:18:42 GMT"
+        try:
+            return datetime.strptime(versions[0]["created"], "%a, %d %b %Y %H:%M:%S %Z").isoformat()
+        except ValueError:
+            return None
+    return None
+
+
+def to_paper_create(record: Dict) -> PaperCreate:
+    """Map a raw JSONL/CSV record (native or arXiv dump fields) onto PaperCreate"""
+    arxiv_id = record.get("arxiv_id") or (record.get("id") if "authors_parsed" in record or "versions" in record else None)
+    return PaperCreate(
+        title=" ".join(str(record.get("title") or "").split()),
+        abstract=" ".join(str(record.get("abstract") or "").split()),
+        doi=normalize_doi(record.get("doi")),
+        arxiv_id=(arxiv_id or "").strip() or None,
+        published_at=_published_at(record),
+        generation_method=record.get("generation_method"),
+        domain=_split_list(record.get("categories") or record.get("domain")),
+        authors=_authors(record),
+        citation_dois=_split_list(record.get("citation_dois")),
+    )
+
+
+def open_source(path: str) -> IO[str]:
+    """Open an import file as text, transparently decompressing .gz"""
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def iter_records(stream: IO[str], fmt: str) -> Iterator[Dict]:
+    """Yield raw records one at a time (blank JSONL lines yield None to keep numbering)"""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if not line:
+            yield None
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {"__error__": f"Invalid JSON: {e.msg}"}
+
+
+def _normalize_text(value: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", value.lower()).split())
+
+
+def _dedupe_key(paper: PaperCreate) -> str:
+    if paper.doi:
+        return f"doi:{paper.doi}"
+    if paper.arxiv_id:
+        return f"arxiv:{paper.arxiv_id}"
+    # Stable across runs, so re-running or resuming doesn't insert the record again
+    first_author = _normalize_text(paper.authors[0].name) if paper.authors else ""
+    content = "|".join((_normalize_text(paper.title), first_author, str(paper.published_at.year)))
+    return f"content:{hashlib.sha256(content.encode()).hexdigest()[:32]}"
+
+
+def build_batch(records: List[Tuple[int, Dict]], job_id: str) -> Tuple[List, List, List, List[Dict]]:
+    """Validate a batch and build COPY rows. Runs in a worker thread."""
+    papers, authors, citations, errors = [], [], [], []
+    for line, record in records:
+        if record is None:
+            continue
+        if "__error__" in record:
+            errors.append({"line": line, "error": record["__error__"]})
+            continue
+        try:
+            paper = to_paper_create(record)
+        except (ValidationError, ValueError, TypeError) as e:
+            errors.append({"line": line, "error": str(e)[:500]})
+            continue
+
+        key = _dedupe_key(paper)
+        paper_id = uuid_str()
+        published_at = paper.published_at
+        if published_at.tzinfo is None:
+            published_at = published_at.replace(tzinfo=timezone.utc)
+        meta = {"import_job_id": job_id}
+        if key.startswith("content:"):
+            meta["content_key"] = key
+        papers.append((
+            line, key, paper_id, paper.title, paper.abstract, paper.doi, paper.arxiv_id,
+            published_at, paper.domain, paper.generation_method, json.dumps(meta),
+        ))
+        for position, author in enumerate(paper.authors):
+            email = (author.email or "").strip() or None
+            orcid = (author.orcid or "").strip() or None
+            authors.append((
+                paper_id, position, author.name.strip(), email, orcid,
+                author.affiliation, False,
+                # Without an identifier every entry is a new author, as on submission
+                None if email or orcid else uuid_str(),
+            ))
+        for doi in {normalize_doi(d) for d in paper.citation_dois} - {None}:
+            citations.append((paper_id, doi))
+    return papers, authors, citations, errors
+
+
+class BulkImportService:
+    """Run (or resume) an import job batch by batch"""
+
+    def __init__(self, db: AsyncSession, batch_size: Optional[int] = None):
+        self.db = db
+        self.batch_size = batch_size or settings.BULK_IMPORT_BATCH_SIZE
+
+    async def create_job(
+        self,
+        source: str,
+        fmt: str,
+        status: str = "published",
+        visibility_tier: str = "main",
+        created_by: Optional[str] = None,
+    ) -> ImportJob:
+        job = ImportJob(
+            source=source,
+            format=fmt,
+            status="pending",
+            errors=[],
+            options={"status": status, "visibility_tier": visibility_tier},
+            created_by=created_by,
+        )
+        self.db.add(job)
+        await self.db.commit()
+        return job
+
+    async def claim(self, job_id: str) -> bool:
+        """Mark a pending, failed or interrupted job as running; False if it can't be claimed"""
+        result = await self.db.execute(
+            CLAIM_JOB_SQL, {"job_id": job_id, "stale_seconds": settings.BULK_IMPORT_STALE_SECONDS}
+        )
+        claimed = result.scalar_one_or_none() is not None
+        await self.db.commit()
+        return claimed
+
+    async def run(self, job_id: str, claimed: bool = False) -> ImportJob:
+        """Import from the job's checkpoint to the end of its source file"""
+        if not claimed and not await self.claim(job_id):
+            job = await self.db.get(ImportJob, job_id)
+            if job is None:
+                raise ValueError(f"Import job {job_id} not found")
+            raise ValueError(f"Import job {job_id} is {job.status}")
+
+        job = await self.db.get(ImportJob, job_id, populate_existing=True)
+        skip = job.records_processed
+
+        try:
+            with open_source(job.source) as stream:
+                batch: List[Tuple[int, Dict]] = []
+                for line, record in enumerate(iter_records(stream, job.format), start=1):
+                    if line <= skip:
+                        continue
+                    batch.append((line, record))
+                    if len(batch) >= self.batch_size:
+                        await self._import_batch(job, batch)
+                        batch = []
+                if batch:
+                    await self._import_batch(job, batch)
+        except Exception as e:
+            await self.db.rollback()
+            job = await self.db.get(ImportJob, job_id)
+            job.status = "failed"
+            job.errors = (job.errors or []) + [{"line": job.records_processed + 1, "error": str(e)[:500]}]
+            await self.db.commit()
+            logger.error("Bulk import failed", job_id=job_id, error=str(e))
+            raise
+
+        job.status = "completed"
+        job.finished_at = datetime.now(timezone.utc)
+        await self.db.commit()
+        coauthor_graph_cache.invalidate()
+        logger.info(
+            "Bulk import completed",
+            job_id=job_id,
+            inserted=job.inserted,
+            duplicates=job.duplicates,
+            failed=job.failed,
+        )
+        return job
+
+    async def _import_batch(self, job: ImportJob, batch: List[Tuple[int, Dict]]) -> None:
+        papers, authors, citations, errors = await asyncio.to_thread(build_batch, batch, job.id)
+        options = job.options or {}
+
+        inserted = 0
+        if papers:
+            await self.db.execute(IMPORT_LOCK_SQL)
+            for ddl in STAGING_DDL:
+                await self.db.execute(text(ddl))
+
+            # COPY straight into the staging tables on the session's connection
+            connection = await self.db.connection()
+            raw = await connection.get_raw_connection()
+            driver = raw.driver_connection
+            await driver.copy_records_to_table("import_papers", records=papers, columns=PAPER_COLUMNS)
+            if authors:
+                await driver.copy_records_to_table("import_authors", records=authors, columns=AUTHOR_COLUMNS)
+            if citations:
+                await driver.copy_records_to_table("import_citations", records=citations, columns=CITATION_COLUMNS)
+
+            result = await self.db.execute(
+                MERGE_PAPERS_SQL,
+                {
+                    "status": options.get("status", "published"),
+                    "visibility_tier": options.get("visibility_tier", "main"),
+                },
+            )
+            inserted = result.rowcount
+            if inserted:
+                await self.db.execute(MERGE_AUTHORS_SQL)
+                await self.db.execute(LINK_AUTHORS_SQL)
+                await self.db.execute(MERGE_COAUTHOR_EDGES_SQL)
+                await self.db.execute(MERGE_CITATIONS_SQL)
+                await self.db.execute(LINK_INCOMING_CITATIONS_SQL)
+                changed = (await self.db.execute(RECOUNT_CITATIONS_SQL)).scalars().all()
+                await self.db.execute(INVALIDATE_AUTHOR_STATS_SQL, {"paper_ids": list(changed)})
+
+        # Checkpoint commits together with the batch
+        job.records_processed = batch[-1][0]
+        job.inserted += inserted
+        job.duplicates += len(papers) - inserted
+        job.failed += len(errors)
+        if errors and len(job.errors or []) < MAX_STORED_ERRORS:
+            job.errors = (job.errors or []) + errors[: MAX_STORED_ERRORS - len(job.errors or [])]
+        await self.db.commit()
+
+        logger.info(
+            "Imported batch",
+            job_id=job.id,
+            line=job.records_processed,
+            inserted=inserted,
+            failed=len(errors),
+        )
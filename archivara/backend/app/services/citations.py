@@ -0,0 +1,207 @@
+"""
+Citation graph with incrementally maintained counts.
+
+Implements:
+1. A citations edge table keyed by (citing paper, normalized cited DOI),
+   linked to the cited paper when Archivara hosts it. papers.doi is stored
+   normalized too, so both sides compare equal
+2. Denormalized papers.citation_count / cited_by_count, adjusted by the
+   same statement that inserts or removes edges
+3. The set of papers whose cited_by_count changed, so callers refresh
+   h-index only for the authors of those papers
+4. A batched full rebuild for drift repair and backfills
+"""
+
+import re
+from typing import Iterable, List, Optional, Set
+
+import structlog
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.paper import Author
+from app.services.author_stats import AuthorStatsService
+
+logger = structlog.get_logger()
+
+DOI_PREFIX = re.compile(r"^(https?://(dx\.)?doi\.org/|doi:)", re.IGNORECASE)
+
+
+def normalize_doi(doi: Optional[str]) -> Optional[str]:
+    """Lowercase a DOI and strip resolver prefixes ("https://doi.org/", "doi:")"""
+    doi = DOI_PREFIX.sub("", (doi or "").strip()).strip().lower()
+    return doi or None
+
+
+ADD_CITATIONS_SQL = text("""
+WITH v AS (
+    SELECT DISTINCT unnest(CAST(:dois AS varchar[])) AS doi
+),
+ins AS (
+    INSERT INTO citations (citing_paper_id, cited_doi, cited_paper_id, created_at, updated_at)
+    SELECT DISTINCT ON (v.doi) CAST(:paper_id AS varchar), v.doi, p.id, now(), now()
+    FROM v
+    LEFT JOIN papers p ON lower(p.doi) = v.doi AND p.id <> CAST(:paper_id AS varchar)
+    ORDER BY v.doi, p.id
+    ON CONFLICT (citing_paper_id, cited_doi) DO NOTHING
+    RETURNING cited_paper_id
+),
+citing AS (
+    UPDATE papers SET citation_count = COALESCE(papers.citation_count, 0) + (SELECT COUNT(*) FROM ins)
+    WHERE papers.id = CAST(:paper_id AS varchar)
+    RETURNING papers.id
+),
+cited AS (
+    UPDATE papers SET cited_by_count = COALESCE(papers.cited_by_count, 0) + c.n
+    FROM (
+        SELECT cited_paper_id, COUNT(*) AS n FROM ins
+        WHERE cited_paper_id IS NOT NULL
+        GROUP BY cited_paper_id
+    ) c
+    WHERE papers.id = c.cited_paper_id
+    RETURNING papers.id
+)
+SELECT id FROM cited
+""")
+
+# Earlier papers may already cite this paper's DOI
+LINK_INCOMING_SQL = text("""
+WITH linked AS (
+    UPDATE citations SET cited_paper_id = CAST(:paper_id AS varchar), updated_at = now()
+    WHERE cited_doi = CAST(:doi AS varchar)
+      AND cited_paper_id IS NULL
+      AND citing_paper_id <> CAST(:paper_id AS varchar)
+    RETURNING citing_paper_id
+)
+UPDATE papers SET cited_by_count = COALESCE(papers.cited_by_count, 0) + (SELECT COUNT(*) FROM linked)
+WHERE papers.id = CAST(:paper_id AS varchar) AND EXISTS (SELECT 1 FROM linked)
+RETURNING papers.id
+""")
+
+# A paper's DOI changed: edges that reached it through the old DOI no
+# longer point at it
+UNLINK_INCOMING_SQL = text("""
+WITH unlinked AS (
+    UPDATE citations SET cited_paper_id = NULL, updated_at = now()
+    WHERE cited_paper_id = CAST(:paper_id AS varchar)
+      AND cited_doi IS DISTINCT FROM CAST(:doi AS varchar)
+    RETURNING citing_paper_id
+)
+UPDATE papers SET cited_by_count = GREATEST(COALESCE(papers.cited_by_count, 0) - (SELECT COUNT(*) FROM unlinked), 0)
+WHERE papers.id = CAST(:paper_id AS varchar) AND EXISTS (SELECT 1 FROM unlinked)
+RETURNING papers.id
+""")
+
+# Run before deleting a paper: its outgoing edges cascade away, incoming
+# edges are unlinked by ON DELETE SET NULL.
+REMOVE_CITATIONS_SQL = text("""
+WITH outgoing AS (
+    SELECT cited_paper_id, COUNT(*) AS n FROM citations
+    WHERE citing_paper_id = CAST(:paper_id AS varchar) AND cited_paper_id IS NOT NULL
+    GROUP BY cited_paper_id
+)
+UPDATE papers SET cited_by_count = GREATEST(COALESCE(papers.cited_by_count, 0) - outgoing.n, 0)
+FROM outgoing
+WHERE papers.id = outgoing.cited_paper_id
+RETURNING papers.id
+""")
+
+RELINK_ALL_SQL = text("""
+UPDATE citations c SET cited_paper_id = p.id, updated_at = now()
+FROM papers p
+WHERE c.cited_paper_id IS NULL
+  AND lower(p.doi) = c.cited_doi
+  AND p.id <> c.citing_paper_id
+""")
+
+RECOUNT_ALL_SQL = text("""
+UPDATE papers SET
+    citation_count = COALESCE(o.n, 0),
+    cited_by_count = COALESCE(i.n, 0)
+FROM papers p
+LEFT JOIN (
+    SELECT citing_paper_id AS id, COUNT(*) AS n FROM citations GROUP BY citing_paper_id
+) o ON o.id = p.id
+LEFT JOIN (
+    SELECT cited_paper_id AS id, COUNT(*) AS n FROM citations
+    WHERE cited_paper_id IS NOT NULL
+    GROUP BY cited_paper_id
+) i ON i.id = p.id
+WHERE papers.id = p.id
+  AND (papers.citation_count IS DISTINCT FROM COALESCE(o.n, 0)
+       OR papers.cited_by_count IS DISTINCT FROM COALESCE(i.n, 0))
+""")
+
+
+class CitationService:
+    """Maintain citation edges and the counts derived from them"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add_paper(
+        self, paper_id: str, doi: Optional[str], cited_dois: Iterable[str]
+    ) -> Set[str]:
+        """
+        Record a new paper's references and link earlier references to it.
+
+        Returns ids of papers whose cited_by_count changed; their authors'
+        h-index needs a refresh.
+        """
+        changed: Set[str] = set()
+
+        dois = sorted({d for d in (normalize_doi(d) for d in cited_dois) if d})
+        if dois:
+            result = await self.db.execute(ADD_CITATIONS_SQL, {"paper_id": paper_id, "dois": dois})
+            changed.update(result.scalars().all())
+
+        doi = normalize_doi(doi)
+        if doi:
+            result = await self.db.execute(LINK_INCOMING_SQL, {"paper_id": paper_id, "doi": doi})
+            changed.update(result.scalars().all())
+
+        return changed
+
+    async def change_doi(self, paper_id: str, doi: Optional[str]) -> Set[str]:
+        """
+        Relink incoming citations after a paper's DOI changed (or was removed):
+        unlink edges citing the old DOI and link earlier references to the
+        new one. Returns changed paper ids.
+        """
+        doi = normalize_doi(doi)
+        result = await self.db.execute(UNLINK_INCOMING_SQL, {"paper_id": paper_id, "doi": doi})
+        changed = set(result.scalars().all())
+        changed.update(await self.add_paper(paper_id, doi, []))
+        return changed
+
+    async def remove_paper(self, paper_id: str) -> Set[str]:
+        """Uncount a paper's references before it is deleted. Returns changed paper ids."""
+        result = await self.db.execute(REMOVE_CITATIONS_SQL, {"paper_id": paper_id})
+        return set(result.scalars().all())
+
+    async def rebuild(self, batch_size: int = 500) -> int:
+        """
+        Recompute all citation links and counts, then refresh author stats
+        in batches, committing after each. Returns the number of authors.
+        """
+        await self.db.execute(RELINK_ALL_SQL)
+        await self.db.execute(RECOUNT_ALL_SQL)
+        await self.db.commit()
+
+        author_stats = AuthorStatsService(self.db)
+        last_id = ""
+        refreshed = 0
+        while True:
+            result = await self.db.execute(
+                select(Author.id).where(Author.id > last_id).order_by(Author.id).limit(batch_size)
+            )
+            author_ids: List[str] = list(result.scalars().all())
+            if not author_ids:
+                break
+            await author_stats.refresh(author_ids)
+            await self.db.commit()
+            refreshed += len(author_ids)
+            last_id = author_ids[-1]
+            logger.info("Rebuilt author citation metrics", authors=refreshed)
+
+        return refreshed
@@ -0,0 +1,310 @@
+"""
+Co-authorship graph.
+
+Implements:
+1. A weighted edge table (coauthor_edges) materialized from paper_authors,
+   updated incrementally when papers are submitted or deleted
+2. A compact in-memory CSR adjacency (NumPy arrays) loaded from the edge
+   table and cached per process; writers invalidate it after they commit,
+   and the next load reads the primary so a lagging replica can't cache
+   the graph without the new edges
+3. Bounded graph queries: top collaborators, k-hop neighbourhood and
+   shortest collaboration path (bidirectional BFS)
+"""
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import structlog
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.paper import coauthor_edges
+
+if TYPE_CHECKING:
+    # Imported on first use (from_edges) to keep startup light
+    import numpy as np
+
+logger = structlog.get_logger()
+
+PAPER_PAIRS = """
+    SELECT a.author_id AS author_a, b.author_id AS author_b
+    FROM paper_authors a
+    JOIN paper_authors b ON b.paper_id = a.paper_id AND a.author_id < b.author_id
+    WHERE a.paper_id = CAST(:paper_id AS varchar)
+"""
+
+# Pairs are upserted in key order so concurrent submissions lock rows consistently
+ADD_PAPER_EDGES_SQL = text("""
+INSERT INTO coauthor_edges (author_a, author_b, weight)
+SELECT pairs.author_a, pairs.author_b, 1
+FROM (""" + PAPER_PAIRS + """) pairs
+ORDER BY pairs.author_a, pairs.author_b
+ON CONFLICT (author_a, author_b) DO UPDATE
+SET weight = coauthor_edges.weight + EXCLUDED.weight
+""")
+
+REMOVE_PAPER_EDGES_SQL = text("""
+WITH pairs AS (""" + PAPER_PAIRS + """),
+decremented AS (
+    UPDATE coauthor_edges e SET weight = e.weight - 1
+    FROM pairs
+    WHERE e.author_a = pairs.author_a AND e.author_b = pairs.author_b AND e.weight > 1
+    RETURNING e.author_a
+)
+DELETE FROM coauthor_edges e
+USING pairs
+WHERE e.author_a = pairs.author_a AND e.author_b = pairs.author_b AND e.weight <= 1
+""")
+
+
+class CoauthorGraph:
+    """
+    Undirected weighted graph in CSR form. Neighbours of node i are
+    indices[indptr[i]:indptr[i + 1]], sorted by edge weight descending.
+    """
+
+    def __init__(self, ids: "np.ndarray", indptr: "np.ndarray", indices: "np.ndarray", weights: "np.ndarray"):
+        self.ids = ids
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.index: Dict[str, int] = {author_id: i for i, author_id in enumerate(ids)}
+
+    @classmethod
+    def from_edges(cls, sources: List[str], targets: List[str], weights: List[int]) -> "CoauthorGraph":
+        # numpy is only needed once the graph is built, not at import
+        import numpy as np
+
+        m = len(sources)
+        ids, inverse = np.unique(np.array(sources + targets, dtype=object), return_inverse=True)
+        n = len(ids)
+        src, dst = inverse[:m], inverse[m:]
+        w = np.asarray(weights, dtype=np.int32)
+
+        rows = np.concatenate([src, dst])
+        cols = np.concatenate([dst, src])
+        both = np.concatenate([w, w])
+        order = np.lexsort((-both, rows))
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return cls(ids, indptr, cols[order].astype(np.int32), both[order])
+
+    @property
+    def node_count(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices) // 2
+
+    def _neighbors(self, i: int) -> Tuple["np.ndarray", "np.ndarray"]:
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.weights[start:end]
+
+    def top_collaborators(self, author_id: str, limit: int) -> List[Tuple[str, int]]:
+        """Strongest co-authors as (author_id, shared_papers)"""
+        i = self.index.get(author_id)
+        if i is None:
+            return []
+        neighbors, weights = self._neighbors(i)
+        return [
+            (self.ids[j], int(w))
+            for j, w in zip(neighbors[:limit], weights[:limit])
+        ]
+
+    def neighborhood(
+        self, author_id: str, depth: int, max_nodes: int
+    ) -> Tuple[Dict[str, int], bool]:
+        """
+        Authors within `depth` hops as {author_id: distance}. Expansion
+        follows the strongest edges first and stops at max_nodes; the flag
+        reports whether the result was truncated.
+        """
+        i = self.index.get(author_id)
+        if i is None:
+            return {}, False
+
+        distances = {i: 0}
+        frontier = [i]
+        for hop in range(1, depth + 1):
+            next_frontier = []
+            for node in frontier:
+                for j in self._neighbors(node)[0]:
+                    j = int(j)
+                    if j in distances:
+                        continue
+                    if len(distances) >= max_nodes:
+                        return self._named(distances), True
+                    distances[j] = hop
+                    next_frontier.append(j)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return self._named(distances), False
+
+    def edges_within(self, author_ids: List[str], max_edges: int) -> List[Tuple[str, str, int]]:
+        """Edges among a set of authors (each undirected edge once)"""
+        nodes = {self.index[a] for a in author_ids if a in self.index}
+        edges = []
+        for i in sorted(nodes):
+            neighbors, weights = self._neighbors(i)
+            for j, w in zip(neighbors, weights):
+                if i < j and int(j) in nodes:
+                    edges.append((self.ids[i], self.ids[j], int(w)))
+                    if len(edges) >= max_edges:
+                        return edges
+        return edges
+
+    def shortest_path(
+        self, source_id: str, target_id: str, max_depth: int, max_visited: int
+    ) -> Optional[List[Tuple[str, int]]]:
+        """
+        Fewest-hop collaboration path as [(author_id, weight_of_edge_in)],
+        found with a bidirectional BFS. Returns None if the authors are not
+        connected within max_depth hops or the search budget runs out.
+        """
+        s, t = self.index.get(source_id), self.index.get(target_id)
+        if s is None or t is None:
+            return None
+        if s == t:
+            return [(source_id, 0)]
+
+        parents = [{s: None}, {t: None}]
+        depths = [{s: 0}, {t: 0}]
+        frontiers = [[s], [t]]
+        visited = 2
+
+        for _ in range(max_depth):
+            # Expand the smaller side one full level, then take the best meeting point
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            seen, other = parents[side], depths[1 - side]
+            best = None
+            next_frontier = []
+            for node in frontiers[side]:
+                for j in self._neighbors(node)[0]:
+                    j = int(j)
+                    if j in other and j not in seen:
+                        if best is None or other[j] < other[best[0]]:
+                            best = (j, node)
+                    if j in seen:
+                        continue
+                    seen[j] = node
+                    depths[side][j] = depths[side][node] + 1
+                    next_frontier.append(j)
+                    visited += 1
+            if best is not None:
+                meet, parent = best
+                parents[side][meet] = parent
+                return self._join_paths(parents, meet)
+            if not next_frontier or visited > max_visited:
+                return None
+            frontiers[side] = next_frontier
+        return None
+
+    def _join_paths(self, parents: List[Dict], meet: int) -> List[Tuple[str, int]]:
+        forward = []
+        node = meet
+        while node is not None:
+            forward.append(node)
+            node = parents[0][node]
+        forward.reverse()
+        node = parents[1][meet]
+        while node is not None:
+            forward.append(node)
+            node = parents[1][node]
+
+        path = [(self.ids[forward[0]], 0)]
+        for prev, node in zip(forward, forward[1:]):
+            neighbors, weights = self._neighbors(prev)
+            weight = int(weights[(neighbors == node).argmax()])
+            path.append((self.ids[node], weight))
+        return path
+
+    def _named(self, distances: Dict[int, int]) -> Dict[str, int]:
+        return {self.ids[i]: d for i, d in distances.items()}
+
+
+class CoauthorGraphCache:
+    """Per-process cache of the CSR graph, reloaded after a TTL or a local write"""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._graph: Optional[CoauthorGraph] = None
+        self._loaded_at = 0.0
+        self._stale = False
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Reload on next use; call after the write that changed coauthor_edges commits"""
+        self._stale = True
+
+    def _fresh(self) -> bool:
+        return (
+            self._graph is not None
+            and not self._stale
+            and time.monotonic() - self._loaded_at < self.ttl_seconds
+        )
+
+    async def get(self, db: AsyncSession) -> CoauthorGraph:
+        if self._fresh():
+            return self._graph
+        async with self._lock:
+            if not self._fresh():
+                written, self._stale = self._stale, False
+                if written:
+                    # `db` may be a replica that hasn't replayed the write yet
+                    async with AsyncSessionLocal() as primary:
+                        self._graph = await self._load(primary)
+                else:
+                    self._graph = await self._load(db)
+                self._loaded_at = time.monotonic()
+        return self._graph
+
+    async def _load(self, db: AsyncSession) -> CoauthorGraph:
+        start = time.perf_counter()
+        sources, targets, weights = [], [], []
+        result = await db.stream(
+            select(coauthor_edges.c.author_a, coauthor_edges.c.author_b, coauthor_edges.c.weight)
+        )
+        async for rows in result.partitions(50_000):
+            for author_a, author_b, weight in rows:
+                sources.append(author_a)
+                targets.append(author_b)
+                weights.append(weight)
+
+        graph = CoauthorGraph.from_edges(sources, targets, weights)
+        logger.info(
+            "Loaded co-authorship graph",
+            nodes=graph.node_count,
+            edges=graph.edge_count,
+            seconds=round(time.perf_counter() - start, 3),
+        )
+        return graph
+
+
+class CoauthorGraphService:
+    """
+    Keep coauthor_edges in sync with paper_authors. Callers invalidate
+    coauthor_graph_cache after committing, so no request reloads the graph
+    between the write and the commit.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add_paper(self, paper_id: str) -> None:
+        """Count a new paper's author pairs (call after its authors are linked)"""
+        await self.db.execute(ADD_PAPER_EDGES_SQL, {"paper_id": paper_id})
+
+    async def remove_paper(self, paper_id: str) -> None:
+        """Uncount a paper's author pairs (call before its authors are unlinked)"""
+        await self.db.execute(REMOVE_PAPER_EDGES_SQL, {"paper_id": paper_id})
+
+
+# Singleton instance
+coauthor_graph_cache = CoauthorGraphCache(settings.COAUTHOR_GRAPH_TTL_SECONDS)
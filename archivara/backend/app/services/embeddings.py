@@ -1,5 +1,4 @@
 from typing import List, Optional, Union
-import numpy as np
 import structlog
 from functools import lru_cache
 
@@ -19,7 +18,7 @@ class EmbeddingService:
         logger.warning("EmbeddingService initialized in stub mode - ML packages not installed")
 
     def _initialize_model(self):
-        """Stub - model not loaded"""
+        """Stub - model not loaded; a real model would be loaded here on first use"""
         pass
 
     def embed_text(
@@ -69,6 +68,8 @@ class EmbeddingService:
         embedding2: List[float]
     ) -> float:
         """Compute cosine similarity between two embeddings"""
+        import numpy as np
+
         vec1 = np.array(embedding1)
         vec2 = np.array(embedding2)
 
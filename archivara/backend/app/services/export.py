@@ -0,0 +1,210 @@
+"""
+Streaming catalogue export.
+
+Rows are read through a server-side cursor (AsyncSession.stream with
+yield_per) and serialized one partition at a time to NDJSON or CSV,
+optionally gzip-compressed on the fly, so memory stays flat regardless of
+how many papers match.
+"""
+
+import csv
+import io
+import json
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import and_, func, select, text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from app.db.filters import jsonb_contains_any
+from app.db.session import replica_router
+from app.models.paper import Author, Paper, PaperStatus, VisibilityTier, paper_authors
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS: Dict = {
+    "id": Paper.id,
+    "title": Paper.title,
+    "abstract": Paper.abstract,
+    "doi": Paper.doi,
+    "arxiv_id": Paper.arxiv_id,
+    "published_at": Paper.published_at,
+    "created_at": Paper.created_at,
+    "updated_at": Paper.updated_at,
+    "status": Paper.status,
+    "categories": Paper.categories,
+    "tags": Paper.tags,
+    "generation_method": Paper.generation_method,
+    "pdf_url": Paper.pdf_url,
+    "code_url": Paper.code_url,
+    "data_url": Paper.data_url,
+    "quality_score": Paper.quality_score,
+    "visibility_tier": Paper.visibility_tier,
+    "community_upvotes": Paper.community_upvotes,
+    "community_downvotes": Paper.community_downvotes,
+    "citation_count": Paper.citation_count,
+    "cited_by_count": Paper.cited_by_count,
+    "authors": (
+        # Author names in byline order
+        select(func.array_agg(aggregate_order_by(Author.name, paper_authors.c.order)))
+        .select_from(paper_authors.join(Author, Author.id == paper_authors.c.author_id))
+        .where(paper_authors.c.paper_id == Paper.id)
+        .correlate(Paper)
+        .scalar_subquery()
+    ),
+}
+
+DEFAULT_EXPORT_COLUMNS = [c for c in EXPORT_COLUMNS if c != "abstract"] + ["abstract"]
+
+
+def harvestable():
+    """Papers exposed publicly: to OAI-PMH harvesters and anonymous exports"""
+    return and_(
+        Paper.status != PaperStatus.REJECTED,
+        Paper.visibility_tier != VisibilityTier.HIDDEN,
+    )
+
+
+@dataclass
+class ExportFilters:
+    status: Optional[str] = None
+    visibility_tier: Optional[str] = None
+    categories: Optional[List[str]] = None  # Any of
+    updated_since: Optional[datetime] = None
+    updated_until: Optional[datetime] = None
+    min_quality: Optional[int] = None
+    public_only: bool = True  # Restrict to harvestable() papers
+
+
+def parse_columns(columns: Optional[str]) -> List[str]:
+    """Validate a comma-separated column projection"""
+    if not columns:
+        return DEFAULT_EXPORT_COLUMNS
+    selected = [c.strip() for c in columns.split(",") if c.strip()]
+    unknown = [c for c in selected if c not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(
+            f"Unknown export columns: {', '.join(unknown)}. "
+            f"Available: {', '.join(EXPORT_COLUMNS)}"
+        )
+    return selected
+
+
+def build_export_query(columns: List[str], filters: ExportFilters):
+    query = select(*[EXPORT_COLUMNS[c].label(c) for c in columns])
+
+    if filters.public_only:
+        query = query.where(harvestable())
+    if filters.status:
+        query = query.where(Paper.status == filters.status)
+    if filters.visibility_tier:
+        query = query.where(Paper.visibility_tier == filters.visibility_tier)
+    if filters.categories:
+        query = query.where(jsonb_contains_any(Paper.categories, filters.categories))
+    if filters.updated_since:
+        query = query.where(Paper.updated_at >= filters.updated_since)
+    if filters.updated_until:
+        query = query.where(Paper.updated_at < filters.updated_until)
+    if filters.min_quality is not None:
+        query = query.where(Paper.quality_score >= filters.min_quality)
+
+    # Stable order so exports are reproducible
+    return query.order_by(Paper.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _csv_cell(value):
+    value = _plain(value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return "" if value is None else value
+
+
+class _Serializer:
+    def __init__(self, fmt: str, columns: List[str]):
+        self.fmt = fmt
+        self.columns = columns
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer) if fmt == "csv" else None
+
+    def header(self) -> str:
+        if self.fmt != "csv":
+            return ""
+        self.writer.writerow(self.columns)
+        return self._drain()
+
+    def rows(self, rows) -> str:
+        if self.fmt == "csv":
+            self.writer.writerows([_csv_cell(v) for v in row] for row in rows)
+            return self._drain()
+        return "".join(
+            json.dumps(
+                {c: _plain(v) for c, v in zip(self.columns, row)},
+                ensure_ascii=False,
+                default=str,
+            ) + "\n"
+            for row in rows
+        )
+
+    def _drain(self) -> str:
+        data = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+
+async def stream_export(
+    columns: List[str],
+    filters: ExportFilters,
+    fmt: str = "ndjson",
+    compress: bool = False,
+    session_factory=replica_router.session,
+) -> AsyncIterator[bytes]:
+    """
+    Yield the export as byte chunks. Opens its own session so the cursor
+    outlives the request handler; runs in one REPEATABLE READ, READ ONLY
+    transaction for a consistent snapshot.
+    """
+    serializer = _Serializer(fmt, columns)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # 31 = gzip container
+
+    def encode(chunk: str) -> bytes:
+        data = chunk.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    async with session_factory() as db:
+        await db.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY"))
+
+        chunk = encode(serializer.header())
+        if chunk:
+            yield chunk
+
+        result = await db.stream(build_export_query(columns, filters))
+        async for rows in result.partitions():
+            chunk = encode(serializer.rows(rows))
+            if chunk:
+                yield chunk
+
+    if compressor:
+        yield compressor.flush()
+
+
+def export_media_type(fmt: str, compress: bool) -> str:
+    if compress:
+        return "application/gzip"
+    return "text/csv" if fmt == "csv" else "application/x-ndjson"
+
+
+def export_filename(fmt: str, compress: bool) -> str:
+    name = f"archivara-papers-{datetime.utcnow():%Y%m%d}.{'csv' if fmt == 'csv' else 'ndjson'}"
+    return name + ".gz" if compress else name
@@ -0,0 +1,144 @@
+"""
+Sparse fieldsets for paper reads.
+
+Implements:
+1. Parsing of `fields=` (paper columns) and `include=` (relationships)
+   query parameters against an allow-list
+2. Loader options that select only the requested columns (load_only) and
+   eager-load only the requested relationships; everything else raises
+   instead of lazy loading
+3. A response model built for the requested shape, cached per fieldset
+4. A `paper_fieldset` dependency for endpoints
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy.orm import load_only, raiseload, selectinload
+
+from app.models.paper import Paper
+from app.schemas.paper import AuthorInDB, ModelInDB, PaperResponse, ToolInDB
+
+PAPER_FIELDS: Dict[str, Any] = {
+    "id": Paper.id,
+    "title": Paper.title,
+    "abstract": Paper.abstract,
+    "doi": Paper.doi,
+    "arxiv_id": Paper.arxiv_id,
+    "published_at": Paper.published_at,
+    "created_at": Paper.created_at,
+    "updated_at": Paper.updated_at,
+    "status": Paper.status,
+    "categories": Paper.categories,
+    "tags": Paper.tags,
+    "generation_method": Paper.generation_method,
+    "pdf_url": Paper.pdf_url,
+    "tex_url": Paper.tex_url,
+    "code_url": Paper.code_url,
+    "data_url": Paper.data_url,
+    "meta": Paper.meta,
+    "submitter_id": Paper.submitter_id,
+    "quality_score": Paper.quality_score,
+    "visibility_tier": Paper.visibility_tier,
+    "baseline_status": Paper.baseline_status,
+    "community_upvotes": Paper.community_upvotes,
+    "community_downvotes": Paper.community_downvotes,
+    "citation_count": Paper.citation_count,
+    "cited_by_count": Paper.cited_by_count,
+}
+
+PAPER_INCLUDES: Dict[str, Tuple[Any, type]] = {
+    "authors": (Paper.authors, AuthorInDB),
+    "models": (Paper.models, ModelInDB),
+    "tools": (Paper.tools, ToolInDB),
+}
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+
+@dataclass(frozen=True)
+class PaperFieldset:
+    fields: Tuple[str, ...]
+    include: Tuple[str, ...]
+
+    @classmethod
+    def parse(cls, fields: Optional[str], include: Optional[str]) -> Optional["PaperFieldset"]:
+        """
+        Validate the query parameters. Returns None when neither is given,
+        meaning the endpoint's default representation. Raises ValueError on
+        unknown names.
+        """
+        if fields is None and include is None:
+            return None
+
+        selected = _split(fields) or [f for f in PAPER_FIELDS if f not in ("abstract", "meta")]
+        unknown = [f for f in selected if f not in PAPER_FIELDS]
+        if unknown:
+            raise ValueError(
+                f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(PAPER_FIELDS)}"
+            )
+        included = _split(include)
+        unknown = [i for i in included if i not in PAPER_INCLUDES]
+        if unknown:
+            raise ValueError(
+                f"Unknown include: {', '.join(unknown)}. Available: {', '.join(PAPER_INCLUDES)}"
+            )
+
+        # id is always returned; order follows the allow-list so cache keys are stable
+        selected_set = set(selected) | {"id"}
+        return cls(
+            fields=tuple(f for f in PAPER_FIELDS if f in selected_set),
+            include=tuple(i for i in PAPER_INCLUDES if i in included),
+        )
+
+    def options(self) -> list:
+        """Loader options for select(Paper)"""
+        return [
+            load_only(*(PAPER_FIELDS[f] for f in self.fields), raiseload=True),
+            *(selectinload(PAPER_INCLUDES[i][0]) for i in self.include),
+            raiseload("*"),
+        ]
+
+    @property
+    def response_model(self) -> type:
+        return _response_model(self.fields, self.include)
+
+    def serialize(self, paper: Paper) -> BaseModel:
+        values = {f: getattr(paper, f) for f in self.fields}
+        values.update({i: getattr(paper, i) for i in self.include})
+        return self.response_model.model_validate(values)
+
+
+@lru_cache(maxsize=256)
+def _response_model(fields: Tuple[str, ...], include: Tuple[str, ...]) -> type:
+    annotations = PaperResponse.model_fields
+    definitions = {
+        f: (Optional[annotations[f].annotation] if f in annotations else Any, None)
+        for f in fields
+    }
+    definitions.update({i: (List[PAPER_INCLUDES[i][1]], []) for i in include})
+    return create_model(
+        "PaperFields",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
+
+
+def paper_fieldset(
+    fields: Optional[str] = Query(
+        None, description=f"Comma-separated paper fields: {', '.join(PAPER_FIELDS)}"
+    ),
+    include: Optional[str] = Query(
+        None, description=f"Comma-separated relationships: {', '.join(PAPER_INCLUDES)}"
+    ),
+) -> Optional[PaperFieldset]:
+    """Dependency: parsed fieldset, or None for the endpoint's default shape"""
+    try:
+        return PaperFieldset.parse(fields, include)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -419,23 +419,45 @@ class ModerationService:
         - MAIN: 70+ score
         - FRONTPAGE: 70+ score + community endorsement
         """
+        return self.compute_visibility_tier(
+            baseline_status=paper.baseline_status,
+            quality_score=paper.quality_score,
+            flag_count=paper.flag_count,
+            needs_review=paper.needs_review,
+            community_upvotes=paper.community_upvotes,
+            community_downvotes=paper.community_downvotes,
+        )
+
+    @staticmethod
+    def compute_visibility_tier(
+        baseline_status,
+        quality_score: Optional[int],
+        flag_count: Optional[int],
+        needs_review: Optional[bool],
+        community_upvotes: Optional[int],
+        community_downvotes: Optional[int],
+    ) -> VisibilityTier:
+        """
+        Tier rules from raw column values, so callers that only have a
+        RETURNING row (e.g. vote counters) don't need a loaded Paper.
+        """
         # Check baseline status first
-        if paper.baseline_status == BaselineStatus.REJECT.value:
+        if baseline_status in (BaselineStatus.REJECT, BaselineStatus.REJECT.value):
             return VisibilityTier.HIDDEN
 
         # Calculate community score
-        net_votes = (paper.community_upvotes or 0) - (paper.community_downvotes or 0)
+        net_votes = (community_upvotes or 0) - (community_downvotes or 0)
 
         # Penalize flagged papers
-        score = paper.quality_score or 0
-        if (paper.flag_count or 0) > 0:
-            score -= ((paper.flag_count or 0) * 10)
+        score = quality_score or 0
+        if (flag_count or 0) > 0:
+            score -= ((flag_count or 0) * 10)
 
         # Consider community feedback
         score += (net_votes * 2)  # Each net vote adds 2 points
 
         # Assign tier
-        if score < 30 or paper.needs_review:
+        if score < 30 or needs_review:
             return VisibilityTier.RAW
         elif score < 70:
             return VisibilityTier.MAIN
@@ -0,0 +1,394 @@
+"""
+OAI-PMH 2.0 data provider.
+
+Implements:
+1. Identify, ListMetadataFormats, ListSets, GetRecord, ListIdentifiers and
+   ListRecords with oai_dc metadata
+2. Selective harvesting by datestamp (Paper.updated_at, second granularity)
+   and by set, where each paper category is a flat set
+3. Resumption tokens that encode a keyset position (updated_at, id), so
+   every page is an index range scan instead of an OFFSET
+4. XML written record by record from a server-side cursor
+"""
+
+import base64
+import binascii
+import json
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.filters import jsonb_contains_all
+from app.db.session import replica_router
+from app.models.paper import Paper
+from app.services.export import EXPORT_COLUMNS, harvestable
+
+DATESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# setSpec syntax from the OAI-PMH schema, minus ":" since sets are flat;
+# categories outside it are not exposed as sets
+SET_SPEC_RE = re.compile(r"[A-Za-z0-9\-_.!~*'()]+")
+
+OAI_DC_PREFIX = "oai_dc"
+METADATA_FORMATS = {
+    OAI_DC_PREFIX: (
+        "http://www.openarchives.org/OAI/2.0/oai_dc.xsd",
+        "http://www.openarchives.org/OAI/2.0/oai_dc/",
+    ),
+}
+
+OAI_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+    'xsi:schemaLocation="http://www.openarchives.org/OAI/2.0/ '
+    'http://www.openarchives.org/OAI/2.0/OAI-PMH.xsd">\n'
+)
+OAI_FOOTER = "</OAI-PMH>\n"
+
+RECORD_COLUMNS = [
+    Paper.id,
+    Paper.updated_at,
+    Paper.title,
+    Paper.abstract,
+    Paper.doi,
+    Paper.arxiv_id,
+    Paper.published_at,
+    Paper.categories,
+    EXPORT_COLUMNS["authors"].label("authors"),
+]
+IDENTIFIER_COLUMNS = [Paper.id, Paper.updated_at, Paper.categories]
+
+
+class OAIError(Exception):
+    """An OAI-PMH protocol error, reported inside a 200 response"""
+
+    def __init__(self, code: str, message: str):
+        self.code = code
+        self.message = message
+        super().__init__(message)
+
+
+@dataclass
+class HarvestState:
+    metadata_prefix: str
+    from_: Optional[datetime] = None
+    until: Optional[datetime] = None  # Exclusive upper bound
+    set_spec: Optional[str] = None
+    after: Optional[Tuple[datetime, str]] = None  # Keyset position
+
+
+def format_datestamp(value: datetime) -> str:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime(DATESTAMP_FORMAT)
+
+
+def parse_datestamp(value: str, upper: bool = False) -> datetime:
+    """
+    Parse a day- or second-granularity datestamp. Upper bounds are made
+    exclusive: "until" includes the whole day or second given.
+    """
+    try:
+        if len(value) == 10:
+            parsed = datetime.strptime(value, "%Y-%m-%d")
+            step = timedelta(days=1)
+        else:
+            parsed = datetime.strptime(value, DATESTAMP_FORMAT)
+            step = timedelta(seconds=1)
+    except ValueError:
+        raise OAIError("badArgument", f"Invalid datestamp: {value}")
+    parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed + step if upper else parsed
+
+
+def encode_token(state: HarvestState, last_updated_at: datetime, last_id: str) -> str:
+    payload = {
+        "p": state.metadata_prefix,
+        "f": state.from_.isoformat() if state.from_ else None,
+        "u": state.until.isoformat() if state.until else None,
+        "s": state.set_spec,
+        "t": last_updated_at.isoformat(),
+        "i": last_id,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_token(token: str) -> HarvestState:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        return HarvestState(
+            metadata_prefix=payload["p"],
+            from_=datetime.fromisoformat(payload["f"]) if payload["f"] else None,
+            until=datetime.fromisoformat(payload["u"]) if payload["u"] else None,
+            set_spec=payload.get("s"),
+            after=(datetime.fromisoformat(payload["t"]), payload["i"]),
+        )
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise OAIError("badResumptionToken", "The resumptionToken is invalid or expired")
+
+
+def oai_identifier(paper_id: str) -> str:
+    return f"oai:{settings.OAI_REPOSITORY_IDENTIFIER}:{paper_id}"
+
+
+def paper_id_from_identifier(identifier: str) -> str:
+    prefix = f"oai:{settings.OAI_REPOSITORY_IDENTIFIER}:"
+    if not identifier.startswith(prefix):
+        raise OAIError("idDoesNotExist", f"Unknown identifier: {identifier}")
+    return identifier[len(prefix):]
+
+
+def is_set_spec(value) -> bool:
+    return isinstance(value, str) and SET_SPEC_RE.fullmatch(value) is not None
+
+
+def _request_element(base_url: str, args: Dict[str, str]) -> str:
+    attrs = "".join(f" {k}={quoteattr(v)}" for k, v in args.items() if v is not None)
+    return f"  <request{attrs}>{escape(base_url)}</request>\n"
+
+
+def _envelope_start(base_url: str, args: Dict[str, str]) -> str:
+    now = format_datestamp(datetime.now(timezone.utc))
+    return OAI_HEADER + f"  <responseDate>{now}</responseDate>\n" + _request_element(base_url, args)
+
+
+def error_response(base_url: str, args: Dict[str, str], error: OAIError) -> str:
+    # Per spec, the request element carries no attributes for badVerb/badArgument
+    if error.code in ("badVerb", "badArgument"):
+        args = {}
+    return (
+        _envelope_start(base_url, args)
+        + f"  <error code={quoteattr(error.code)}>{escape(error.message)}</error>\n"
+        + OAI_FOOTER
+    )
+
+
+def _header_xml(row) -> str:
+    sets = "".join(
+        f"      <setSpec>{escape(c)}</setSpec>\n" for c in (row.categories or []) if is_set_spec(c)
+    )
+    return (
+        "    <header>\n"
+        f"      <identifier>{escape(oai_identifier(row.id))}</identifier>\n"
+        f"      <datestamp>{format_datestamp(row.updated_at)}</datestamp>\n"
+        f"{sets}"
+        "    </header>\n"
+    )
+
+
+def _dc_xml(row) -> str:
+    elements = [("title", row.title)]
+    elements += [("creator", name) for name in (row.authors or [])]
+    elements += [("subject", str(c)) for c in (row.categories or [])]
+    elements.append(("description", row.abstract))
+    if row.published_at:
+        elements.append(("date", row.published_at.date().isoformat()))
+    elements.append(("type", "text"))
+    elements.append(("identifier", f"{settings.FRONTEND_URL.rstrip('/')}/papers/{row.id}"))
+    if row.doi:
+        elements.append(("identifier", f"doi:{row.doi}"))
+    if row.arxiv_id:
+        elements.append(("identifier", f"arXiv:{row.arxiv_id}"))
+
+    body = "".join(
+        f"        <dc:{name}>{escape(value)}</dc:{name}>\n"
+        for name, value in elements
+        if value
+    )
+    return (
+        "    <metadata>\n"
+        '      <oai_dc:dc xmlns:oai_dc="http://www.openarchives.org/OAI/2.0/oai_dc/" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        'xsi:schemaLocation="http://www.openarchives.org/OAI/2.0/oai_dc/ '
+        'http://www.openarchives.org/OAI/2.0/oai_dc.xsd">\n'
+        f"{body}"
+        "      </oai_dc:dc>\n"
+        "    </metadata>\n"
+    )
+
+
+def _record_xml(row) -> str:
+    return "   <record>\n" + _header_xml(row) + _dc_xml(row) + "   </record>\n"
+
+
+async def identify(db: AsyncSession, base_url: str, args: Dict[str, str]) -> str:
+    # Served by ix_papers_updated_at_id; an empty repository reports now
+    earliest = await db.scalar(select(func.min(Paper.updated_at)).where(harvestable()))
+    return (
+        _envelope_start(base_url, args)
+        + "  <Identify>\n"
+        + f"    <repositoryName>{escape(settings.APP_NAME)}</repositoryName>\n"
+        + f"    <baseURL>{escape(base_url)}</baseURL>\n"
+        + "    <protocolVersion>2.0</protocolVersion>\n"
+        + f"    <adminEmail>{escape(settings.OAI_ADMIN_EMAIL)}</adminEmail>\n"
+        + f"    <earliestDatestamp>{format_datestamp(earliest or datetime.now(timezone.utc))}</earliestDatestamp>\n"
+        + "    <deletedRecord>no</deletedRecord>\n"
+        + "    <granularity>YYYY-MM-DDThh:mm:ssZ</granularity>\n"
+        + "  </Identify>\n"
+        + OAI_FOOTER
+    )
+
+
+def list_metadata_formats(base_url: str, args: Dict[str, str]) -> str:
+    formats = "".join(
+        "    <metadataFormat>\n"
+        f"      <metadataPrefix>{prefix}</metadataPrefix>\n"
+        f"      <schema>{schema}</schema>\n"
+        f"      <metadataNamespace>{namespace}</metadataNamespace>\n"
+        "    </metadataFormat>\n"
+        for prefix, (schema, namespace) in METADATA_FORMATS.items()
+    )
+    return (
+        _envelope_start(base_url, args)
+        + f"  <ListMetadataFormats>\n{formats}  </ListMetadataFormats>\n"
+        + OAI_FOOTER
+    )
+
+
+async def list_sets(db: AsyncSession, base_url: str, args: Dict[str, str]) -> str:
+    """One set per category in use; the list is small, so no resumption token"""
+    if args.get("resumptionToken"):
+        raise OAIError("badResumptionToken", "The resumptionToken is invalid or expired")
+    category = func.jsonb_array_elements_text(Paper.categories).label("category")
+    result = await db.execute(
+        select(category)
+        .where(harvestable(), func.jsonb_typeof(Paper.categories) == "array")
+        .distinct()
+        .order_by(category)
+    )
+    sets = "".join(
+        "    <set>\n"
+        f"      <setSpec>{escape(c)}</setSpec>\n"
+        f"      <setName>{escape(c)}</setName>\n"
+        "    </set>\n"
+        for c in result.scalars()
+        if is_set_spec(c)
+    )
+    if not sets:
+        raise OAIError("noSetHierarchy", "This repository has no sets")
+    return (
+        _envelope_start(base_url, args)
+        + f"  <ListSets>\n{sets}  </ListSets>\n"
+        + OAI_FOOTER
+    )
+
+
+async def get_record(db: AsyncSession, base_url: str, args: Dict[str, str]) -> str:
+    paper_id = paper_id_from_identifier(args["identifier"])
+    result = await db.execute(
+        select(*RECORD_COLUMNS).where(Paper.id == paper_id, harvestable())
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise OAIError("idDoesNotExist", f"Unknown identifier: {args['identifier']}")
+    return (
+        _envelope_start(base_url, args)
+        + "  <GetRecord>\n"
+        + _record_xml(row)
+        + "  </GetRecord>\n"
+        + OAI_FOOTER
+    )
+
+
+def harvest_state(args: Dict[str, str]) -> HarvestState:
+    """Validate ListRecords/ListIdentifiers arguments"""
+    if args.get("resumptionToken"):
+        extra = set(args) - {"verb", "resumptionToken"}
+        if extra:
+            raise OAIError("badArgument", "resumptionToken is an exclusive argument")
+        return decode_token(args["resumptionToken"])
+
+    prefix = args.get("metadataPrefix")
+    if not prefix:
+        raise OAIError("badArgument", "metadataPrefix is required")
+    if prefix not in METADATA_FORMATS:
+        raise OAIError("cannotDisseminateFormat", f"Unsupported metadataPrefix: {prefix}")
+
+    from_ = parse_datestamp(args["from"]) if args.get("from") else None
+    until = parse_datestamp(args["until"], upper=True) if args.get("until") else None
+    if args.get("from") and args.get("until") and len(args["from"]) != len(args["until"]):
+        raise OAIError("badArgument", "from and until must have the same granularity")
+    if from_ and until and from_ >= until:
+        raise OAIError("badArgument", "from must not be later than until")
+    return HarvestState(metadata_prefix=prefix, from_=from_, until=until, set_spec=args.get("set"))
+
+
+def _harvest_query(state: HarvestState, with_metadata: bool, limit: int):
+    query = select(*(RECORD_COLUMNS if with_metadata else IDENTIFIER_COLUMNS)).where(harvestable())
+    if state.from_:
+        query = query.where(Paper.updated_at >= state.from_)
+    if state.until:
+        query = query.where(Paper.updated_at < state.until)
+    if state.set_spec:
+        query = query.where(jsonb_contains_all(Paper.categories, [state.set_spec]))
+    if state.after:
+        last_updated_at, last_id = state.after
+        query = query.where(tuple_(Paper.updated_at, Paper.id) > tuple_(last_updated_at, last_id))
+    return (
+        query.order_by(Paper.updated_at, Paper.id)
+        .limit(limit + 1)
+        .execution_options(yield_per=100)
+    )
+
+
+async def stream_list(
+    base_url: str,
+    args: Dict[str, str],
+    state: HarvestState,
+    with_metadata: bool,
+    session_factory=replica_router.session,
+) -> AsyncIterator[str]:
+    """
+    Stream a ListRecords/ListIdentifiers page. The envelope is only opened
+    once the first row arrives, so an empty result can still be reported
+    as noRecordsMatch.
+    """
+    verb = "ListRecords" if with_metadata else "ListIdentifiers"
+    page_size = settings.OAI_PAGE_SIZE if with_metadata else settings.OAI_PAGE_SIZE * 5
+
+    async with session_factory() as db:
+        result = await db.stream(_harvest_query(state, with_metadata, page_size))
+
+        emitted = 0
+        last = None
+        has_more = False
+        async for row in result:
+            if emitted == page_size:
+                has_more = True
+                break
+            if emitted == 0:
+                yield _envelope_start(base_url, args) + f"  <{verb}>\n"
+            yield _record_xml(row) if with_metadata else _header_xml(row)
+            emitted += 1
+            last = row
+        await result.close()
+
+    if emitted == 0:
+        if state.after:
+            # Last page was exactly full: finish with an empty token
+            yield _envelope_start(base_url, args) + f"  <{verb}>\n"
+            yield "    <resumptionToken/>\n"
+            yield f"  </{verb}>\n" + OAI_FOOTER
+            return
+        yield error_response(
+            base_url, args, OAIError("noRecordsMatch", "No records match the request")
+        )
+        return
+
+    if has_more:
+        token = encode_token(state, last.updated_at, last.id)
+        yield f"    <resumptionToken>{token}</resumptionToken>\n"
+    elif state.after:
+        # Final page of a resumed harvest
+        yield "    <resumptionToken/>\n"
+    yield f"  </{verb}>\n" + OAI_FOOTER
@@ -3,7 +3,6 @@ OpenRouter API client for LLM-powered moderation.
 Supports GPT-4, Claude, and other models via OpenRouter.
 """
 
-import httpx
 import json
 from typing import Dict, List, Optional, Any
 from app.core.config import settings
@@ -12,11 +11,15 @@ from app.core.config import settings
 class OpenRouterClient:
     """Client for OpenRouter API"""
 
-    BASE_URL = "https://openrouter.ai/api/v1"
-
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        base_url: Optional[str] = None
+    ):
         self.api_key = api_key or settings.OPENROUTER_API_KEY
         self.model = model or settings.OPENROUTER_MODEL
+        self.base_url = (base_url or settings.OPENROUTER_BASE_URL).rstrip("/")
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "HTTP-Referer": "https://archivara.org",
@@ -61,9 +64,11 @@ class OpenRouterClient:
         if plugins:
             payload["plugins"] = plugins
 
+        import httpx
+
         async with httpx.AsyncClient(timeout=60.0) as client:
             response = await client.post(
-                f"{self.BASE_URL}/chat/completions",
+                f"{self.base_url}/chat/completions",
                 headers=self.headers,
                 json=payload
             )
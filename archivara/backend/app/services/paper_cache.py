@@ -0,0 +1,169 @@
+"""
+Read-through cache of serialized paper responses.
+
+Implements:
+1. Multi-key get/set so batch reads cost one cache round trip
+2. A per-process LRU backend and a shared Redis backend
+3. Explicit invalidation from writes (edits, deletes, votes, moderation),
+   with a short TTL as the bound on any staleness that slips through
+
+Entries hold PaperResponse JSON as stored in the database, minus bulky
+internal meta keys (the submitted PDF as base64); pending write-behind vote
+deltas are merged after reading, never cached.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import structlog
+
+from app.core.config import settings
+from app.schemas.paper import PaperResponse
+
+logger = structlog.get_logger()
+
+# Kept in papers.meta for moderation, never needed by readers
+UNCACHED_META_KEYS = ("pdf_base64",)
+
+
+def without_bulky_meta(paper: PaperResponse) -> PaperResponse:
+    """The response without UNCACHED_META_KEYS, so hits and misses look alike"""
+    if not paper.meta or not any(key in paper.meta for key in UNCACHED_META_KEYS):
+        return paper
+    meta = {key: value for key, value in paper.meta.items() if key not in UNCACHED_META_KEYS}
+    return paper.model_copy(update={"meta": meta})
+
+
+class MemoryPaperCache:
+    """Per-process LRU with expiry, bounded by entries and bytes; each worker caches independently"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= len(entry[1])
+
+    async def get_many(self, keys: List[str]) -> Dict[str, str]:
+        now = time.monotonic()
+        found = {}
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            expires_at, value = entry
+            if expires_at <= now:
+                self._pop(key)
+                continue
+            self._entries.move_to_end(key)
+            found[key] = value
+        return found
+
+    async def set_many(self, values: Dict[str, str], ttl: int) -> None:
+        expires_at = time.monotonic() + ttl
+        for key, value in values.items():
+            self._pop(key)
+            # Sizes are in characters; the JSON is nearly all ASCII
+            if len(value) > self.max_bytes:
+                continue
+            self._entries[key] = (expires_at, value)
+            self.size_bytes += len(value)
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            self._pop(next(iter(self._entries)))
+
+    async def delete_many(self, keys: List[str]) -> None:
+        for key in keys:
+            self._pop(key)
+
+
+class RedisPaperCache:
+    """Shared cache; MGET for reads and one pipeline for writes"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as aioredis
+
+        self.client = aioredis.from_url(url, decode_responses=True)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, str]:
+        values = await self.client.mget(keys)
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    async def set_many(self, values: Dict[str, str], ttl: int) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in values.items():
+                pipe.set(key, value, ex=ttl)
+            await pipe.execute()
+
+    async def delete_many(self, keys: List[str]) -> None:
+        await self.client.delete(*keys)
+
+
+class PaperCache:
+    """Cache of PaperResponse by paper id; failures degrade to misses"""
+
+    PREFIX = "paper:v1:"
+
+    def __init__(self):
+        self.enabled = settings.PAPER_CACHE_ENABLED
+        if self.enabled is None:
+            # Per-worker copies multiply memory and miss other workers' invalidations
+            self.enabled = settings.PAPER_CACHE_BACKEND == "redis" or settings.WORKERS < 2
+        self.ttl = settings.PAPER_CACHE_TTL_SECONDS
+        self.backend = None
+
+        if self.enabled:
+            if settings.PAPER_CACHE_BACKEND == "redis":
+                self.backend = RedisPaperCache(settings.REDIS_URL)
+            else:
+                self.backend = MemoryPaperCache(
+                    settings.PAPER_CACHE_MAX_ENTRIES, settings.PAPER_CACHE_MAX_MB * 1024 * 1024
+                )
+
+    def _key(self, paper_id: str) -> str:
+        return f"{self.PREFIX}{paper_id}"
+
+    async def get_many(self, paper_ids: Iterable[str]) -> Dict[str, PaperResponse]:
+        paper_ids = list(paper_ids)
+        if not self.enabled or not paper_ids:
+            return {}
+        try:
+            found = await self.backend.get_many([self._key(i) for i in paper_ids])
+        except Exception as e:
+            logger.warning("Paper cache read failed", error=str(e))
+            return {}
+        prefix = len(self.PREFIX)
+        return {key[prefix:]: PaperResponse.model_validate_json(value) for key, value in found.items()}
+
+    async def get(self, paper_id: str) -> Optional[PaperResponse]:
+        return (await self.get_many([paper_id])).get(paper_id)
+
+    async def set_many(self, papers: Iterable[PaperResponse]) -> None:
+        if not self.enabled:
+            return
+        values = {self._key(str(p.id)): without_bulky_meta(p).model_dump_json() for p in papers}
+        if not values:
+            return
+        try:
+            await self.backend.set_many(values, self.ttl)
+        except Exception as e:
+            logger.warning("Paper cache write failed", error=str(e))
+
+    async def invalidate(self, paper_ids: Iterable[str]) -> None:
+        if not self.enabled:
+            return
+        keys = [self._key(str(i)) for i in paper_ids]
+        if not keys:
+            return
+        try:
+            await self.backend.delete_many(keys)
+        except Exception as e:
+            logger.warning("Paper cache invalidation failed", error=str(e))
+
+
+# Singleton instance
+paper_cache = PaperCache()
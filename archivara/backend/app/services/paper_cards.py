@@ -0,0 +1,81 @@
+"""
+Card projections for list and feed views.
+
+Selects only the columns a paper card renders (with the abstract truncated
+in SQL and authors aggregated into one JSON column) instead of hydrating
+full Paper entities plus their authors/models/tools relationships.
+"""
+
+from typing import List
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from app.models.paper import Author, Paper, paper_authors
+from app.schemas.paper import PaperCard
+
+CARD_ABSTRACT_CHARS = 300
+
+CARD_COLUMNS = [
+    Paper.id,
+    Paper.title,
+    func.left(Paper.abstract, CARD_ABSTRACT_CHARS).label("abstract"),
+    (func.char_length(Paper.abstract) > CARD_ABSTRACT_CHARS).label("abstract_truncated"),
+    (
+        # [{"id": ..., "name": ...}] in byline order
+        select(
+            func.json_agg(
+                aggregate_order_by(
+                    func.json_build_object(literal_column("'id'"), Author.id, literal_column("'name'"), Author.name),
+                    paper_authors.c.order,
+                )
+            )
+        )
+        .select_from(paper_authors.join(Author, Author.id == paper_authors.c.author_id))
+        .where(paper_authors.c.paper_id == Paper.id)
+        .correlate(Paper)
+        .scalar_subquery()
+        .label("authors")
+    ),
+    Paper.categories,
+    # Only ai_tools from meta; the rest of it can hold the base64 PDF
+    Paper.meta["ai_tools"].label("ai_tools"),
+    Paper.generation_method,
+    Paper.status,
+    Paper.visibility_tier,
+    Paper.published_at,
+    Paper.created_at,
+    Paper.quality_score,
+    Paper.community_upvotes,
+    Paper.community_downvotes,
+    Paper.citation_count,
+]
+
+
+def card_query():
+    """select() of card columns; callers add filters, order and paging"""
+    return select(*CARD_COLUMNS)
+
+
+def to_cards(rows) -> List[PaperCard]:
+    return [
+        PaperCard(
+            id=row.id,
+            title=row.title,
+            abstract=row.abstract or "",
+            abstract_truncated=bool(row.abstract_truncated),
+            authors=row.authors or [],
+            categories=row.categories or [],
+            meta={"ai_tools": row.ai_tools or []},
+            generation_method=row.generation_method,
+            status=row.status.value,
+            visibility_tier=row.visibility_tier.value,
+            published_at=row.published_at,
+            created_at=row.created_at,
+            quality_score=row.quality_score or 0,
+            community_upvotes=row.community_upvotes or 0,
+            community_downvotes=row.community_downvotes or 0,
+            citation_count=row.citation_count or 0,
+        )
+        for row in rows
+    ]
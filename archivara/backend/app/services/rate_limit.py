@@ -0,0 +1,586 @@
+"""
+Rate limiting backed by Redis with an in-memory fallback.
+
+Implements:
+1. Sliding-window counters (weighted current + previous window, O(1) state)
+2. Sliding-window logs (exact, bounded by the limit; for small limits
+   over long windows such as the submission cooldown)
+3. Token buckets (burst capacity with a steady refill rate)
+4. Per-route policies with verified / unverified / anonymous tiers
+5. A FastAPI dependency that emits standard RateLimit-* headers and
+   rejects clients before the endpoint touches the database
+6. Client IPs from X-Forwarded-For only behind trusted proxies, so
+   anonymous clients can't pick a fresh bucket per request
+"""
+
+import ipaddress
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from uuid import uuid4
+from typing import Callable, Dict, List, Optional
+
+import structlog
+from fastapi import HTTPException, Request, Response, status
+
+from app.core.config import settings
+from app.lib.verification import isVerifiedEmailDomain
+
+logger = structlog.get_logger()
+
+SLIDING_WINDOW = "sliding_window"
+SLIDING_LOG = "sliding_log"
+TOKEN_BUCKET = "token_bucket"
+
+
+@dataclass(frozen=True)
+class Policy:
+    """A single limit: `limit` requests per `window` seconds"""
+    limit: int
+    window: int
+    algorithm: str = SLIDING_WINDOW
+
+    @property
+    def refill_rate(self) -> float:
+        """Tokens per second for token-bucket policies"""
+        return self.limit / self.window
+
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    """Limits for one route, by caller tier"""
+    anonymous: Policy
+    unverified: Policy
+    verified: Policy
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # Seconds until the limit fully resets
+    retry_after: float  # Seconds until the request would be allowed (0 if allowed)
+    window: int
+    meta: Optional[str] = None
+    fallback: bool = False  # Answered from per-worker memory, not Redis
+
+    def headers(self) -> Dict[str, str]:
+        """Standard RateLimit-* response headers (IETF draft)"""
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(max(self.remaining, 0)),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+            "RateLimit-Policy": f"{self.limit};w={self.window}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(math.ceil(self.retry_after), 1))
+        return headers
+
+
+# Default route policies. Values can be overridden per route and tier with
+# settings.RATE_LIMIT_OVERRIDES, e.g. {"papers:submit:unverified": "5/3600"}.
+DEFAULT_POLICIES: Dict[str, RoutePolicy] = {
+    "default": RoutePolicy(
+        anonymous=Policy(120, 60),
+        unverified=Policy(300, 60),
+        verified=Policy(600, 60),
+    ),
+    "auth:login": RoutePolicy(
+        anonymous=Policy(10, 60),
+        unverified=Policy(10, 60),
+        verified=Policy(10, 60),
+    ),
+    "auth:register": RoutePolicy(
+        anonymous=Policy(5, 3600, SLIDING_LOG),
+        unverified=Policy(5, 3600, SLIDING_LOG),
+        verified=Policy(5, 3600, SLIDING_LOG),
+    ),
+    "papers:submit": RoutePolicy(
+        anonymous=Policy(2, 3600),
+        unverified=Policy(5, 3600),
+        verified=Policy(20, 3600),
+    ),
+    "papers:export": RoutePolicy(
+        anonymous=Policy(5, 3600),
+        unverified=Policy(10, 3600),
+        verified=Policy(30, 3600),
+    ),
+    "moderation:vote": RoutePolicy(
+        anonymous=Policy(10, 60, TOKEN_BUCKET),
+        unverified=Policy(30, 60, TOKEN_BUCKET),
+        verified=Policy(120, 60, TOKEN_BUCKET),
+    ),
+    "moderation:flag": RoutePolicy(
+        anonymous=Policy(5, 3600),
+        unverified=Policy(10, 3600),
+        verified=Policy(50, 3600),
+    ),
+}
+
+# Rejected submissions allowed per 6 hours before a cooldown applies
+SUBMISSION_COOLDOWN = {
+    "verified": Policy(4, 6 * 3600, SLIDING_LOG),
+    "unverified": Policy(1, 6 * 3600, SLIDING_LOG),
+}
+
+
+def parse_policy(value: str, algorithm: str = SLIDING_WINDOW) -> Policy:
+    """Parse "<limit>/<window seconds>" into a Policy"""
+    limit, window = value.split("/", 1)
+    return Policy(int(limit), int(window), algorithm)
+
+
+def get_route_policy(route: str) -> RoutePolicy:
+    """Resolve a route's policy, applying settings overrides"""
+    policy = DEFAULT_POLICIES.get(route, DEFAULT_POLICIES["default"])
+    overrides = {}
+    for tier in ("anonymous", "unverified", "verified"):
+        value = settings.RATE_LIMIT_OVERRIDES.get(f"{route}:{tier}")
+        if value:
+            overrides[tier] = parse_policy(value, getattr(policy, tier).algorithm)
+    return replace(policy, **overrides) if overrides else policy
+
+
+def _sliding_window_result(
+    policy: Policy,
+    cost: int,
+    consume: bool,
+    now: float,
+    current: float,
+    previous: float,
+) -> RateLimitResult:
+    """Build a result from sliding-window state read *before* this hit"""
+    window = policy.window
+    elapsed = now % window
+    weight = 1 - (elapsed / window)
+    used = previous * weight + current
+    allowed = used + cost <= policy.limit
+    if allowed and consume:
+        used += cost
+        current += cost
+
+    retry_after = 0.0
+    if not allowed:
+        if current + cost <= policy.limit and previous > 0:
+            # Wait until the previous window's weight decays enough
+            needed = 1 - (policy.limit - current - cost) / previous
+            retry_after = max(needed * window - elapsed, 0.0)
+        elif cost <= policy.limit and current > 0:
+            # Wait into the next window, where this window becomes "previous"
+            needed = max(1 - (policy.limit - cost) / current, 0.0)
+            retry_after = (window - elapsed) + needed * window
+        else:
+            retry_after = window - elapsed
+
+    # Fully reset once both windows have rolled over
+    reset_after = (window - elapsed) + (window if current > 0 else 0)
+
+    return RateLimitResult(
+        allowed=allowed,
+        limit=policy.limit,
+        remaining=int(policy.limit - math.ceil(used)),
+        reset_after=reset_after,
+        retry_after=retry_after,
+        window=window,
+    )
+
+
+def _sliding_log_result(
+    policy: Policy,
+    cost: int,
+    consume: bool,
+    now: float,
+    timestamps: List[float],
+    meta: Optional[str] = None,
+) -> RateLimitResult:
+    """Build a result from the in-window timestamps read *before* this hit"""
+    timestamps = sorted(timestamps)
+    allowed = len(timestamps) + cost <= policy.limit
+    if allowed and consume:
+        timestamps = timestamps + [now] * cost
+
+    retry_after = 0.0
+    if not allowed:
+        # Wait until enough of the oldest entries leave the window
+        overflow = len(timestamps) + cost - policy.limit
+        if cost <= policy.limit:
+            retry_after = max(timestamps[overflow - 1] + policy.window - now, 0.0)
+        else:
+            retry_after = float(policy.window)
+
+    return RateLimitResult(
+        allowed=allowed,
+        limit=policy.limit,
+        remaining=policy.limit - len(timestamps),
+        reset_after=(timestamps[-1] + policy.window - now) if timestamps else 0.0,
+        retry_after=retry_after,
+        window=policy.window,
+        meta=meta,
+    )
+
+
+def check_log(policy: Policy, timestamps: List[float], meta: Optional[str] = None) -> RateLimitResult:
+    """
+    Check one more hit of a sliding-log policy against timestamps kept
+    elsewhere, e.g. rows in the database
+    """
+    now = time.time()
+    in_window = [ts for ts in timestamps if ts > now - policy.window]
+    return _sliding_log_result(policy, 1, False, now, in_window, meta)
+
+
+def _token_bucket_result(policy: Policy, cost: int, tokens: float, allowed: bool) -> RateLimitResult:
+    """Build a result from token-bucket state read *after* this hit"""
+    rate = policy.refill_rate
+    return RateLimitResult(
+        allowed=allowed,
+        limit=policy.limit,
+        remaining=int(tokens),
+        reset_after=(policy.limit - tokens) / rate,
+        retry_after=0.0 if allowed else (cost - tokens) / rate,
+        window=policy.window,
+    )
+
+
+class MemoryRateLimitBackend:
+    """
+    Process-local backend used when Redis is not configured or unreachable.
+    Limits are per worker process.
+    """
+
+    MAX_KEYS = 100_000
+
+    def __init__(self):
+        self._state: "OrderedDict[str, dict]" = OrderedDict()
+
+    def _get(self, key: str) -> dict:
+        state = self._state.get(key)
+        if state is None:
+            state = {}
+            self._state[key] = state
+            if len(self._state) > self.MAX_KEYS:
+                self._state.popitem(last=False)
+        else:
+            self._state.move_to_end(key)
+        return state
+
+    async def sliding_window(
+        self, key: str, policy: Policy, cost: int, consume: bool, now: float
+    ) -> RateLimitResult:
+        state = self._get(key)
+        window_id = int(now // policy.window)
+        if state.get("win") == window_id:
+            current, previous = state["cur"], state["prev"]
+        elif state.get("win") == window_id - 1:
+            current, previous = 0, state["cur"]
+        else:
+            current, previous = 0, 0
+
+        result = _sliding_window_result(policy, cost, consume, now, current, previous)
+        if result.allowed and consume:
+            state.update(win=window_id, cur=current + cost, prev=previous)
+        return result
+
+    async def sliding_log(
+        self, key: str, policy: Policy, cost: int, consume: bool, now: float, meta: Optional[str]
+    ) -> RateLimitResult:
+        state = self._get(key)
+        timestamps = [ts for ts in state.get("log", []) if ts > now - policy.window]
+        state["log"] = timestamps
+
+        result = _sliding_log_result(policy, cost, consume, now, timestamps, state.get("meta"))
+        if result.allowed and consume:
+            state["log"] = timestamps + [now] * cost
+            if meta is not None:
+                state["meta"] = meta
+                result.meta = meta
+        return result
+
+    async def token_bucket(
+        self, key: str, policy: Policy, cost: int, consume: bool, now: float
+    ) -> RateLimitResult:
+        state = self._get(key)
+        tokens = state.get("tokens", float(policy.limit))
+        last = state.get("ts", now)
+        tokens = min(float(policy.limit), tokens + max(0.0, now - last) * policy.refill_rate)
+        allowed = tokens >= cost
+        if allowed and consume:
+            tokens -= cost
+            state.update(tokens=tokens, ts=now)
+        return _token_bucket_result(policy, cost, tokens, allowed)
+
+
+class RedisRateLimitBackend:
+    """Redis backend; each check is a single atomic Lua script call"""
+
+    # Hash fields: win (window id), cur, prev
+    SLIDING_WINDOW_SCRIPT = """
+    local window = tonumber(ARGV[1])
+    local now = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local limit = tonumber(ARGV[4])
+    local consume = ARGV[5] == '1'
+    local window_id = math.floor(now / window)
+    local state = redis.call('HMGET', KEYS[1], 'win', 'cur', 'prev')
+    local win = tonumber(state[1])
+    local cur = 0
+    local prev = 0
+    if win == window_id then
+        cur = tonumber(state[2]) or 0
+        prev = tonumber(state[3]) or 0
+    elseif win == window_id - 1 then
+        prev = tonumber(state[2]) or 0
+    end
+    local weight = 1 - ((now % window) / window)
+    if consume and prev * weight + cur + cost <= limit then
+        redis.call('HSET', KEYS[1], 'win', window_id, 'cur', cur + cost, 'prev', prev)
+        redis.call('EXPIRE', KEYS[1], window * 2)
+    end
+    return {tostring(cur), tostring(prev)}
+    """
+
+    # KEYS[1]: sorted set of hit timestamps, KEYS[2]: last stored meta
+    SLIDING_LOG_SCRIPT = """
+    local window = tonumber(ARGV[1])
+    local now = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local limit = tonumber(ARGV[4])
+    local consume = ARGV[5] == '1'
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+    local entries = redis.call('ZRANGE', KEYS[1], 0, -1, 'WITHSCORES')
+    local meta = redis.call('GET', KEYS[2])
+    if consume and (#entries / 2) + cost <= limit then
+        for i = 1, cost do
+            redis.call('ZADD', KEYS[1], now, now .. ':' .. i .. ':' .. ARGV[7])
+        end
+        redis.call('EXPIRE', KEYS[1], window)
+        if ARGV[6] ~= '' then
+            redis.call('SET', KEYS[2], ARGV[6], 'EX', window)
+        end
+    end
+    local timestamps = {}
+    for i = 2, #entries, 2 do
+        table.insert(timestamps, entries[i])
+    end
+    return {timestamps, meta}
+    """
+
+    # Hash fields: tokens, ts
+    TOKEN_BUCKET_SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local cost = tonumber(ARGV[4])
+    local consume = ARGV[5] == '1'
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    if tokens >= cost then
+        allowed = 1
+        if consume then
+            tokens = tokens - cost
+            redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+            redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+        end
+    end
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url: str):
+        import redis.asyncio as aioredis
+
+        self.client = aioredis.from_url(
+            url,
+            socket_timeout=0.25,
+            socket_connect_timeout=0.25,
+            decode_responses=True,
+        )
+        self._sliding_window = self.client.register_script(self.SLIDING_WINDOW_SCRIPT)
+        self._sliding_log = self.client.register_script(self.SLIDING_LOG_SCRIPT)
+        self._token_bucket = self.client.register_script(self.TOKEN_BUCKET_SCRIPT)
+
+    async def sliding_window(
+        self, key: str, policy: Policy, cost: int, consume: bool, now: float
+    ) -> RateLimitResult:
+        current, previous = await self._sliding_window(
+            keys=[key],
+            args=[policy.window, now, cost, policy.limit, int(consume)],
+        )
+        return _sliding_window_result(policy, cost, consume, now, float(current), float(previous))
+
+    async def sliding_log(
+        self, key: str, policy: Policy, cost: int, consume: bool, now: float, meta: Optional[str]
+    ) -> RateLimitResult:
+        timestamps, stored_meta = await self._sliding_log(
+            keys=[key, f"{key}:meta"],
+            args=[policy.window, now, cost, policy.limit, int(consume), meta or "", uuid4().hex],
+        )
+        result = _sliding_log_result(
+            policy, cost, consume, now, [float(ts) for ts in timestamps], stored_meta or None
+        )
+        if result.allowed and consume and meta is not None:
+            result.meta = meta
+        return result
+
+    async def token_bucket(
+        self, key: str, policy: Policy, cost: int, consume: bool, now: float
+    ) -> RateLimitResult:
+        allowed, tokens = await self._token_bucket(
+            keys=[key],
+            args=[policy.limit, policy.refill_rate, now, cost, int(consume)],
+        )
+        return _token_bucket_result(policy, cost, float(tokens), bool(int(allowed)))
+
+
+class RateLimiter:
+    """Apply policies against Redis, falling back to memory if Redis is down"""
+
+    KEY_PREFIX = "ratelimit"
+    REDIS_RETRY_SECONDS = 30
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.memory = MemoryRateLimitBackend()
+        self.redis_url = redis_url
+        self._redis: Optional[RedisRateLimitBackend] = None
+        self._redis_down_until = 0.0
+
+    @property
+    def redis(self) -> Optional[RedisRateLimitBackend]:
+        """Redis backend, created on first use so importing the app stays cheap"""
+        if self._redis is None and self.redis_url:
+            try:
+                self._redis = RedisRateLimitBackend(self.redis_url)
+            except Exception as e:
+                logger.warning("Redis rate limiting unavailable, using memory", error=str(e))
+                self.redis_url = None
+        return self._redis
+
+    async def hit(
+        self,
+        key: str,
+        policy: Policy,
+        cost: int = 1,
+        consume: bool = True,
+        meta: Optional[str] = None,
+    ) -> RateLimitResult:
+        """
+        Check (and, if allowed, consume) `cost` units of a policy for `key`.
+
+        consume=False only checks whether `cost` units would be allowed.
+        `meta` is stored alongside sliding-log state (e.g. a rejection
+        reason) and returned by later checks.
+        """
+        full_key = f"{self.KEY_PREFIX}:{key}"
+        now = time.time()
+
+        if self.redis and now >= self._redis_down_until:
+            try:
+                return await self._apply(self.redis, full_key, policy, cost, consume, now, meta)
+            except Exception as e:
+                self._redis_down_until = now + self.REDIS_RETRY_SECONDS
+                logger.warning("Redis rate limiting failed, using memory", error=str(e))
+
+        result = await self._apply(self.memory, full_key, policy, cost, consume, now, meta)
+        result.fallback = True
+        return result
+
+    @staticmethod
+    async def _apply(
+        backend, key: str, policy: Policy, cost: int, consume: bool, now: float, meta: Optional[str]
+    ) -> RateLimitResult:
+        if policy.algorithm == TOKEN_BUCKET:
+            return await backend.token_bucket(key, policy, cost, consume, now)
+        if policy.algorithm == SLIDING_LOG:
+            return await backend.sliding_log(key, policy, cost, consume, now, meta)
+        return await backend.sliding_window(key, policy, cost, consume, now)
+
+
+@lru_cache(maxsize=1)
+def _trusted_networks(cidrs: tuple) -> tuple:
+    return tuple(ipaddress.ip_network(cidr, strict=False) for cidr in cidrs)
+
+
+def _is_trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    networks = _trusted_networks(tuple(settings.RATE_LIMIT_TRUSTED_PROXIES))
+    return any(ip in network for network in networks)
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    Client IP for per-IP limits. X-Forwarded-For is honoured only when the
+    peer is a trusted proxy; then the client is the right-most hop that
+    isn't one (entries left of it are whatever the client chose to send).
+    """
+    peer = request.client.host if request.client else "unknown"
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded or not _is_trusted(peer):
+        return peer
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+def get_token_subject(request: Request) -> Optional[str]:
+    """
+    Email from the bearer token, verified without a database lookup so
+    limits can be enforced before the endpoint runs any queries.
+    """
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    from jose import JWTError, jwt
+
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+
+def rate_limit(route: str) -> Callable:
+    """
+    Dependency factory enforcing `route`'s policy.
+
+    Authenticated callers are limited per user (tiered by
+    isVerifiedEmailDomain); anonymous callers are limited per IP.
+    """
+    async def dependency(request: Request, response: Response) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        route_policy = get_route_policy(route)
+        email = get_token_subject(request)
+        if email:
+            tier = "verified" if isVerifiedEmailDomain(email) else "unverified"
+            key = f"{route}:user:{email.lower()}"
+        else:
+            tier = "anonymous"
+            key = f"{route}:ip:{get_client_ip(request)}"
+
+        result = await rate_limiter.hit(key, getattr(route_policy, tier))
+        if not result.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded. Please slow down.",
+                headers=result.headers(),
+            )
+        response.headers.update(result.headers())
+
+    return dependency
+
+
+# Singleton instance
+rate_limiter = RateLimiter(settings.RATE_LIMIT_REDIS_URL or settings.REDIS_URL)
@@ -0,0 +1,270 @@
+"""
+Warm-up and readiness gating, so a new instance doesn't serve cold.
+
+Implements:
+1. Warm-up, started from the app lifespan in every worker:
+   a. Pre-fill the primary (and replica) pools with
+      settings.READINESS_PREFILL_CONNECTIONS connections, retrying until
+      the primary accepts them
+   b. Warm hot paths by requesting them in-process: the first feed pages,
+      the papers on page one (paper cache), the most prolific authors'
+      profiles and one collaborator graph (coauthor graph cache). This also
+      loads lazily imported code and fills statement caches on the pooled
+      connections. Bounded by READINESS_WARMUP_TIMEOUT_SECONDS
+2. Latency probes for the database, Redis and Supabase Storage (when
+   configured), cached for READINESS_PROBE_INTERVAL_SECONDS so frequent
+   polling adds no load. "redis" covers the features that need it (Redis
+   paper cache, Redis vote buffer); Redis used with a fallback (rate
+   limits, replica stickiness) is probed as "redis_fallback", which only
+   marks the instance degraded
+3. Readiness: warm-up done and every required probe answering within its
+   latency budget
+4. Warm before serving: under app.server each worker finishes warm-up in
+   its lifespan startup, before it accepts connections, and then reports
+   to the supervisor (on_warm), so no worker takes traffic cold
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db.replicas import RedisStickyStore
+from app.db.session import ReadSessionLocal, engine, replica_router
+from app.models.paper import AuthorStats
+from app.services.paper_cache import RedisPaperCache, paper_cache
+from app.services.rate_limit import rate_limiter
+from app.services.storage import storage_service
+from app.services.votes import RedisVoteBuffer, vote_aggregator
+
+logger = structlog.get_logger()
+
+
+async def prefill_pool(pool_engine: AsyncEngine, size: int) -> int:
+    """Open `size` connections at once and return them to the pool; returns how many opened"""
+    results = await asyncio.gather(*(pool_engine.connect() for _ in range(size)), return_exceptions=True)
+    connections = [c for c in results if not isinstance(c, BaseException)]
+    for connection in connections:
+        await connection.close()
+    errors = [e for e in results if isinstance(e, BaseException)]
+    if errors and not connections:
+        raise errors[0]
+    return len(connections)
+
+
+class Readiness:
+    """Per-process warm-up state and dependency probes"""
+
+    def __init__(self):
+        self.warmed = False
+        self.warmup: Dict = {"status": "pending"}
+        self._task: Optional[asyncio.Task] = None
+        self._checks: Dict[str, Dict] = {}
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        # Set by app.server in each worker
+        self.warm_before_serving = False
+        self.on_warm: Optional[Callable[[], None]] = None
+
+    def start(self, app) -> None:
+        """Start warming up in the background (call from the app lifespan)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._warm_up(app))
+
+    async def wait(self) -> None:
+        """Wait for warm-up to finish"""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _warm_up(self, app) -> None:
+        started = time.monotonic()
+        self.warmup = {"status": "prefilling"}
+
+        # The pool must fill before we are ready; keep retrying until the primary is up
+        delay = 0.5
+        while True:
+            try:
+                opened = await prefill_pool(engine, settings.READINESS_PREFILL_CONNECTIONS)
+                break
+            except Exception as e:
+                logger.warning("Pool pre-fill failed, retrying", error=str(e), retry_in=delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 10.0)
+        self.warmup["connections"] = opened
+        for replica in replica_router.replicas:
+            try:
+                await prefill_pool(replica.engine, settings.READINESS_PREFILL_CONNECTIONS)
+            except Exception as e:
+                # Reads fall back to the primary; not a reason to stay out of rotation
+                logger.warning("Replica pool pre-fill failed", replica=replica.name, error=str(e))
+
+        self.warmup["status"] = "warming"
+        try:
+            failed = await asyncio.wait_for(self._warm_caches(app), settings.READINESS_WARMUP_TIMEOUT_SECONDS)
+            self.warmup["failed_requests"] = failed
+        except asyncio.TimeoutError:
+            logger.warning("Cache warm-up timed out", timeout=settings.READINESS_WARMUP_TIMEOUT_SECONDS)
+            self.warmup["timed_out"] = True
+        except Exception as e:
+            logger.warning("Cache warm-up failed", error=str(e))
+            self.warmup["error"] = str(e)
+
+        self.warmup["status"] = "done"
+        self.warmup["seconds"] = round(time.monotonic() - started, 2)
+        self.warmed = True
+        logger.info("Warm-up complete", **self.warmup)
+        if self.on_warm is not None:
+            self.on_warm()
+
+    async def _warm_caches(self, app) -> int:
+        """Request the hot read paths in-process; returns the number of failed requests"""
+        import httpx
+
+        api = settings.API_V1_STR
+        failed = 0
+        # A failing endpoint answers 500 instead of raising, so one bad read
+        # path does not abort the remaining warm-up requests
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://warmup", headers={"user-agent": "archivara-warmup"}
+        ) as client:
+
+            async def fetch(url: str, **params) -> Optional[httpx.Response]:
+                nonlocal failed
+                try:
+                    response = await client.get(url, params=params)
+                except Exception as e:
+                    failed += 1
+                    logger.warning("Warm-up request failed", url=url, error=str(e))
+                    return None
+                if response.status_code != 200:
+                    failed += 1
+                    logger.warning("Warm-up request failed", url=url, status=response.status_code)
+                    return None
+                return response
+
+            first_page: List[str] = []
+            for page in range(1, settings.READINESS_WARM_FEED_PAGES + 1):
+                response = await fetch(f"{api}/papers/", page=page)
+                if response is not None and page == 1:
+                    first_page = [item["id"] for item in response.json()["items"]]
+            if first_page:
+                await fetch(f"{api}/papers/batch", ids=",".join(first_page))
+
+            async with ReadSessionLocal() as db:
+                top_authors = (await db.scalars(
+                    select(AuthorStats.author_id)
+                    .order_by(AuthorStats.total_papers.desc())
+                    .limit(settings.READINESS_WARM_TOP_AUTHORS)
+                )).all()
+            for author_id in top_authors:
+                await fetch(f"{api}/authors/{author_id}")
+            if top_authors:
+                # Loads the process-wide coauthor graph
+                await fetch(f"{api}/authors/{top_authors[0]}/graph/collaborators")
+        return failed
+
+    def _redis_clients(self) -> List:
+        """Redis clients of features that don't work without it"""
+        clients = []
+        if isinstance(paper_cache.backend, RedisPaperCache):
+            clients.append(paper_cache.backend.client)
+        if isinstance(vote_aggregator.buffer, RedisVoteBuffer):
+            clients.append(vote_aggregator.buffer.client)
+        return clients
+
+    def _fallback_redis_clients(self) -> List:
+        """Redis clients of features that fall back to something else when it's down"""
+        clients = []
+        if settings.RATE_LIMIT_ENABLED and rate_limiter.redis is not None:
+            clients.append(rate_limiter.redis.client)
+        if isinstance(replica_router.sticky, RedisStickyStore):
+            clients.append(replica_router.sticky.client)
+        return clients
+
+    async def _check_database(self) -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    async def _check_redis(self) -> None:
+        await asyncio.gather(*(client.ping() for client in self._redis_clients()))
+
+    async def _check_fallback_redis(self) -> None:
+        await asyncio.gather(*(client.ping() for client in self._fallback_redis_clients()))
+
+    async def _check_storage(self) -> None:
+        await asyncio.to_thread(storage_service.ping)
+
+    async def _probe(self, check: Callable[[], Awaitable[None]], budget_ms: float) -> Dict:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(), settings.READINESS_PROBE_TIMEOUT_SECONDS)
+        except Exception as e:
+            return {
+                "status": "fail",
+                "error": str(e) or type(e).__name__,
+                "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            }
+        latency = (time.perf_counter() - start) * 1000
+        return {
+            "status": "ok" if latency <= budget_ms else "slow",
+            "latency_ms": round(latency, 1),
+            "budget_ms": budget_ms,
+        }
+
+    async def checks(self) -> Dict[str, Dict]:
+        """Probe results, refreshed at most every READINESS_PROBE_INTERVAL_SECONDS"""
+        async with self._lock:
+            if time.monotonic() - self._checked_at < settings.READINESS_PROBE_INTERVAL_SECONDS:
+                return self._checks
+
+            skipped = {"status": "skipped"}
+            probes = {
+                "database": self._probe(self._check_database, settings.READINESS_DB_MAX_LATENCY_MS),
+                "redis": self._probe(self._check_redis, settings.READINESS_REDIS_MAX_LATENCY_MS)
+                if self._redis_clients() else None,
+                "redis_fallback": self._probe(self._check_fallback_redis, settings.READINESS_REDIS_MAX_LATENCY_MS)
+                if self._fallback_redis_clients() else None,
+                "storage": self._probe(self._check_storage, settings.READINESS_STORAGE_MAX_LATENCY_MS)
+                if storage_service.enabled else None,
+            }
+            names = [name for name, probe in probes.items() if probe is not None]
+            results = await asyncio.gather(*(probes[name] for name in names))
+            self._checks = {name: skipped for name in probes}
+            self._checks.update(zip(names, results))
+            self._checked_at = time.monotonic()
+            return self._checks
+
+    async def status(self) -> Tuple[bool, Dict]:
+        """(ready, details) for /health/ready"""
+        if not self.warmed:
+            return False, {"status": "warming", "warmup": self.warmup}
+        checks = await self.checks()
+        required = set(settings.READINESS_REQUIRED_PROBES)
+        healthy = {name: check["status"] in ("ok", "skipped") for name, check in checks.items()}
+        ready = all(ok for name, ok in healthy.items() if name in required)
+        if not ready:
+            state = "unready"
+        elif not all(healthy.values()):
+            # Serving, but something optional is slow or down
+            state = "degraded"
+        else:
+            state = "ready"
+        return ready, {"status": state, "warmup": self.warmup, "checks": checks}
+
+
+# Singleton instance
+readiness = Readiness()
@@ -14,11 +14,17 @@ class SupabaseStorageService:
     def __init__(self):
         self.bucket_name = "Papers"  # Capital P to match Supabase bucket
         self.enabled = bool(settings.SUPABASE_URL and settings.SUPABASE_SERVICE_KEY)
+        self._client = None
+        if not self.enabled:
+            logger.warning("Supabase storage disabled - credentials not configured")
 
-        if self.enabled:
+    @property
+    def client(self):
+        """Supabase client, created on first use so importing the app stays cheap"""
+        if self._client is None and self.enabled:
             try:
-                from supabase import create_client, Client
-                self.client: Client = create_client(
+                from supabase import create_client
+                self._client = create_client(
                     settings.SUPABASE_URL,
                     settings.SUPABASE_SERVICE_KEY
                 )
@@ -26,10 +32,7 @@ class SupabaseStorageService:
             except Exception as e:
                 logger.error("Failed to initialize Supabase client", error=str(e))
                 self.enabled = False
-                self.client = None
-        else:
-            self.client = None
-            logger.warning("Supabase storage disabled - credentials not configured")
+        return self._client
 
     async def upload_file(
         self,
@@ -58,8 +61,8 @@ class SupabaseStorageService:
         # Generate unique filename
         file_path = f"{folder}/{uuid4()}{file_extension}"
 
-        # If Supabase is not enabled, return placeholder
-        if not self.enabled:
+        # If Supabase is not enabled (or the client failed to start), return placeholder
+        if not self.enabled or self.client is None:
             logger.warning("Supabase disabled - returning placeholder URL", hash=file_hash)
             return f"/api/v1/files/{file_path}", file_hash
 
@@ -86,6 +89,10 @@ class SupabaseStorageService:
             # Return placeholder on error
             return f"/api/v1/files/{file_path}", file_hash
 
+    def ping(self) -> None:
+        """Round trip to Supabase Storage (blocking; raises if unreachable)"""
+        self.client.storage.get_bucket(self.bucket_name)
+
     def _get_content_type(self, file_extension: str) -> str:
         """Get content type based on file extension"""
         content_types = {
@@ -0,0 +1,534 @@
+"""
+Atomic vote counting for papers.
+
+A vote is applied with a single statement: the user's paper_votes row is
+inserted, updated or deleted and the papers counters are adjusted by the
+resulting delta in SQL (community_upvotes = community_upvotes + :d), so
+concurrent voters never overwrite each other's counts.
+
+With settings.VOTE_WRITE_BEHIND enabled, the statement only writes the
+user's paper_votes row and the counter delta is buffered instead (Redis or
+per-process counters). A background flusher applies buffered deltas to
+papers in one batched UPDATE and re-evaluates visibility tiers once per
+flush, so a viral paper no longer serializes every vote on its row lock.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import uuid4
+
+import structlog
+from sqlalchemy import text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.models.paper import Paper, VisibilityTier, uuid_str
+from app.services.moderation import ModerationService
+from app.services.paper_cache import paper_cache
+
+logger = structlog.get_logger()
+
+
+# The `old` CTE locks the user's existing vote (if any); exactly one of
+# ins/upd/del fires and `delta` turns their effect into counter deltas.
+VOTE_CTES = """
+WITH target AS (
+    SELECT id FROM papers WHERE id = CAST(:paper_id AS varchar)
+),
+old AS (
+    SELECT pv.id, pv.vote FROM paper_votes pv
+    WHERE pv.paper_id = CAST(:paper_id AS varchar)
+      AND pv.user_id = CAST(:user_id AS varchar)
+    FOR UPDATE
+),
+ins AS (
+    INSERT INTO paper_votes (id, paper_id, user_id, vote, created_at, updated_at)
+    SELECT CAST(:vote_id AS varchar), target.id, CAST(:user_id AS varchar),
+           CAST(:vote AS integer), now(), now()
+    FROM target
+    WHERE CAST(:vote AS integer) <> 0 AND NOT EXISTS (SELECT 1 FROM old)
+    ON CONFLICT (paper_id, user_id) DO NOTHING
+    RETURNING vote
+),
+upd AS (
+    UPDATE paper_votes pv
+    SET vote = CAST(:vote AS integer), updated_at = now()
+    FROM old
+    WHERE pv.id = old.id
+      AND CAST(:vote AS integer) <> 0
+      AND old.vote <> CAST(:vote AS integer)
+    RETURNING pv.vote
+),
+del AS (
+    DELETE FROM paper_votes pv
+    USING old
+    WHERE pv.id = old.id AND CAST(:vote AS integer) = 0
+    RETURNING pv.id
+),
+changes AS (
+    SELECT vote, 1 AS sign FROM ins
+    UNION ALL
+    SELECT vote, 1 AS sign FROM upd
+    UNION ALL
+    SELECT old.vote, -1 AS sign FROM old
+    WHERE EXISTS (SELECT 1 FROM upd) OR EXISTS (SELECT 1 FROM del)
+),
+delta AS (
+    SELECT COALESCE(SUM(sign) FILTER (WHERE vote = 1), 0) AS up,
+           COALESCE(SUM(sign) FILTER (WHERE vote = -1), 0) AS down
+    FROM changes
+)
+"""
+
+PAPER_COLUMNS = """
+    papers.community_upvotes,
+    papers.community_downvotes,
+    papers.quality_score,
+    papers.flag_count,
+    papers.needs_review,
+    papers.baseline_status,
+    papers.visibility_tier
+"""
+
+CAST_VOTE_SQL = text(VOTE_CTES + """
+UPDATE papers SET
+    community_upvotes = GREATEST(COALESCE(papers.community_upvotes, 0) + delta.up, 0),
+    community_downvotes = GREATEST(COALESCE(papers.community_downvotes, 0) + delta.down, 0)
+FROM delta
+WHERE papers.id = CAST(:paper_id AS varchar)
+RETURNING""" + PAPER_COLUMNS + """,
+    delta.up,
+    delta.down,
+    (SELECT vote FROM old) AS old_vote,
+    EXISTS (SELECT 1 FROM ins) AS inserted
+""")
+
+# Write-behind variant: records the vote row but only *reads* the paper
+CAST_VOTE_DEFERRED_SQL = text(VOTE_CTES + """
+SELECT""" + PAPER_COLUMNS + """,
+    delta.up,
+    delta.down,
+    (SELECT vote FROM old) AS old_vote,
+    EXISTS (SELECT 1 FROM ins) AS inserted
+FROM delta, papers
+WHERE papers.id = CAST(:paper_id AS varchar)
+""")
+
+# Apply many buffered deltas at once; rows are locked in id order so
+# flushers in different workers cannot deadlock.
+FLUSH_DELTAS_SQL = text("""
+WITH v AS (
+    SELECT unnest(CAST(:ids AS varchar[])) AS id,
+           unnest(CAST(:ups AS integer[])) AS up,
+           unnest(CAST(:downs AS integer[])) AS down
+),
+locked AS (
+    SELECT papers.id FROM papers
+    WHERE papers.id = ANY(CAST(:ids AS varchar[]))
+    ORDER BY papers.id
+    FOR UPDATE
+)
+UPDATE papers SET
+    community_upvotes = GREATEST(COALESCE(papers.community_upvotes, 0) + v.up, 0),
+    community_downvotes = GREATEST(COALESCE(papers.community_downvotes, 0) + v.down, 0)
+FROM v JOIN locked ON locked.id = v.id
+WHERE papers.id = v.id
+RETURNING papers.id,""" + PAPER_COLUMNS)
+
+UPDATE_TIERS_SQL = text("""
+UPDATE papers SET visibility_tier = CAST(v.tier AS visibilitytier)
+FROM (
+    SELECT unnest(CAST(:ids AS varchar[])) AS id,
+           unnest(CAST(:tiers AS varchar[])) AS tier
+) v
+WHERE papers.id = v.id
+""")
+
+
+def _tier_for_row(row, up_delta: int = 0, down_delta: int = 0) -> VisibilityTier:
+    return ModerationService.compute_visibility_tier(
+        baseline_status=row["baseline_status"],
+        quality_score=row["quality_score"],
+        flag_count=row["flag_count"],
+        needs_review=row["needs_review"],
+        community_upvotes=(row["community_upvotes"] or 0) + up_delta,
+        community_downvotes=(row["community_downvotes"] or 0) + down_delta,
+    )
+
+
+@dataclass
+class VoteResult:
+    community_upvotes: int
+    community_downvotes: int
+    visibility_tier: VisibilityTier
+    previous_vote: int
+
+    @property
+    def net_votes(self) -> int:
+        return self.community_upvotes - self.community_downvotes
+
+
+class VoteService:
+    """Apply votes with single-statement upserts and SQL-side counters"""
+
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def cast_vote(self, paper_id: str, user_id: str, vote: int) -> Optional[VoteResult]:
+        """
+        Set a user's vote on a paper (1, -1, or 0 to remove) and adjust the
+        paper's counters in the same statement (or buffer the delta in
+        write-behind mode).
+
+        Returns None if the paper does not exist. The caller commits.
+        """
+        write_behind = vote_aggregator.enabled
+        statement = CAST_VOTE_DEFERRED_SQL if write_behind else CAST_VOTE_SQL
+
+        for _ in range(self.MAX_ATTEMPTS):
+            result = await self.db.execute(
+                statement,
+                {
+                    "paper_id": paper_id,
+                    "user_id": user_id,
+                    "vote": vote,
+                    "vote_id": uuid_str(),
+                },
+            )
+            row = result.mappings().one_or_none()
+            if row is None:
+                return None
+
+            # A concurrent first vote by the same user won the insert race;
+            # retry so this vote is applied as an update on top of it.
+            lost_insert = vote != 0 and row["old_vote"] is None and not row["inserted"]
+            if not lost_insert:
+                break
+
+        if write_behind:
+            return await self._buffer_delta(paper_id, row)
+
+        self.db.info.setdefault("voted_paper_ids", set()).add(paper_id)
+        tier = _tier_for_row(row)
+
+        # The paper row is still locked by this transaction, so the tier we
+        # write matches the counters we just returned.
+        if tier.value != row["visibility_tier"]:
+            await self.db.execute(
+                update(Paper)
+                .where(Paper.id == paper_id)
+                .values(visibility_tier=tier)
+            )
+
+        return VoteResult(
+            community_upvotes=row["community_upvotes"],
+            community_downvotes=row["community_downvotes"],
+            visibility_tier=tier,
+            previous_vote=row["old_vote"] or 0,
+        )
+
+    async def _buffer_delta(self, paper_id: str, row) -> VoteResult:
+        """
+        Queue the counter delta once the vote row is committed. The
+        response reports counts merged with all pending deltas; the tier is
+        persisted by the next flush.
+        """
+        up, down = int(row["up"]), int(row["down"])
+        if up or down:
+            # Only buffer if the vote row actually commits
+            self.db.info.setdefault("pending_vote_deltas", []).append(
+                (paper_id, up, down)
+            )
+
+        pending_up, pending_down = (await vote_aggregator.pending([paper_id])).get(paper_id, (0, 0))
+        total_up = pending_up + up
+        total_down = pending_down + down
+        return VoteResult(
+            community_upvotes=max((row["community_upvotes"] or 0) + total_up, 0),
+            community_downvotes=max((row["community_downvotes"] or 0) + total_down, 0),
+            visibility_tier=_tier_for_row(row, total_up, total_down),
+            previous_vote=row["old_vote"] or 0,
+        )
+
+    async def commit(self) -> None:
+        """Commit the vote and hand any buffered deltas to the aggregator"""
+        await self.db.commit()
+        deltas = self.db.info.pop("pending_vote_deltas", [])
+        for paper_id, up, down in deltas:
+            await vote_aggregator.add(paper_id, up, down)
+        # Counters written directly are stale in the read cache
+        await paper_cache.invalidate(self.db.info.pop("voted_paper_ids", ()))
+
+
+class MemoryVoteBuffer:
+    """
+    Per-process counters. Each worker process holds its own shard of the
+    pending deltas and flushes it independently.
+    """
+
+    def __init__(self):
+        self._deltas: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+
+    async def add(self, paper_id: str, up: int, down: int) -> None:
+        counts = self._deltas[paper_id]
+        counts[0] += up
+        counts[1] += down
+
+    async def pending(self, paper_ids: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+        return {
+            paper_id: tuple(self._deltas[paper_id])
+            for paper_id in paper_ids
+            if paper_id in self._deltas
+        }
+
+    async def drain(self) -> Dict[str, Tuple[int, int]]:
+        deltas, self._deltas = self._deltas, defaultdict(lambda: [0, 0])
+        return {paper_id: tuple(counts) for paper_id, counts in deltas.items()}
+
+    async def ack(self) -> None:
+        """The drained deltas are committed (nothing to release in memory)"""
+
+    async def restore(self, deltas: Dict[str, Tuple[int, int]]) -> None:
+        for paper_id, (up, down) in deltas.items():
+            await self.add(paper_id, up, down)
+
+    async def recover(self) -> int:
+        return 0
+
+
+class RedisVoteBuffer:
+    """
+    Shared counters in a Redis hash ("<paper_id>:up" / "<paper_id>:down").
+
+    A flush renames the hash to a unique flushing key, registered with its
+    start time in a sorted set, and deletes it only after the database
+    commit. A failed flush merges the key back; keys left by a worker that
+    died mid-flush are merged back once older than STALE_FLUSH_SECONDS.
+    """
+
+    KEY = "votes:pending"
+    FLUSHING = "votes:flushing"  # Sorted set of flushing keys, scored by start time
+    STALE_FLUSH_SECONDS = 300
+
+    # KEYS: pending, flushing key, flushing set; ARGV: now
+    DRAIN_SCRIPT = """
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return {}
+    end
+    redis.call('RENAME', KEYS[1], KEYS[2])
+    redis.call('ZADD', KEYS[3], ARGV[1], KEYS[2])
+    return redis.call('HGETALL', KEYS[2])
+    """
+
+    # KEYS: flushing key, pending, flushing set
+    MERGE_SCRIPT = """
+    local fields = redis.call('HGETALL', KEYS[1])
+    for i = 1, #fields, 2 do
+        redis.call('HINCRBY', KEYS[2], fields[i], fields[i + 1])
+    end
+    redis.call('DEL', KEYS[1])
+    redis.call('ZREM', KEYS[3], KEYS[1])
+    return #fields / 2
+    """
+
+    def __init__(self, url: str):
+        import redis.asyncio as aioredis
+
+        self.client = aioredis.from_url(url, decode_responses=True)
+        self._drain = self.client.register_script(self.DRAIN_SCRIPT)
+        self._merge = self.client.register_script(self.MERGE_SCRIPT)
+        self._flushing_key: Optional[str] = None
+
+    async def add(self, paper_id: str, up: int, down: int) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            if up:
+                pipe.hincrby(self.KEY, f"{paper_id}:up", up)
+            if down:
+                pipe.hincrby(self.KEY, f"{paper_id}:down", down)
+            await pipe.execute()
+
+    async def pending(self, paper_ids: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+        paper_ids = list(paper_ids)
+        if not paper_ids:
+            return {}
+        fields = [f"{paper_id}:{kind}" for paper_id in paper_ids for kind in ("up", "down")]
+        values = await self.client.hmget(self.KEY, fields)
+        pending = {}
+        for i, paper_id in enumerate(paper_ids):
+            up, down = values[2 * i], values[2 * i + 1]
+            if up or down:
+                pending[paper_id] = (int(up or 0), int(down or 0))
+        return pending
+
+    async def drain(self) -> Dict[str, Tuple[int, int]]:
+        # RENAME is atomic: votes arriving during the flush go to a fresh hash
+        flushing_key = f"{self.KEY}:flushing:{uuid4().hex}"
+        raw = await self._drain(keys=[self.KEY, flushing_key, self.FLUSHING], args=[time.time()])
+        if not raw:
+            return {}
+        self._flushing_key = flushing_key
+
+        deltas: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        for field, value in zip(raw[::2], raw[1::2]):
+            paper_id, _, kind = field.rpartition(":")
+            deltas[paper_id][0 if kind == "up" else 1] += int(value)
+        return {paper_id: tuple(counts) for paper_id, counts in deltas.items()}
+
+    async def ack(self) -> None:
+        """The drained deltas are committed; drop the flushing key"""
+        if self._flushing_key is None:
+            return
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(self._flushing_key)
+            pipe.zrem(self.FLUSHING, self._flushing_key)
+            await pipe.execute()
+        self._flushing_key = None
+
+    async def restore(self, deltas: Dict[str, Tuple[int, int]]) -> None:
+        """The flush failed; merge the flushing key back into the buffer"""
+        if self._flushing_key is None:
+            return
+        await self._merge(keys=[self._flushing_key, self.KEY, self.FLUSHING])
+        self._flushing_key = None
+
+    async def recover(self) -> int:
+        """Merge back flushing keys abandoned by workers that died mid-flush; returns keys merged"""
+        stale = await self.client.zrangebyscore(self.FLUSHING, "-inf", time.time() - self.STALE_FLUSH_SECONDS)
+        for flushing_key in stale:
+            fields = await self._merge(keys=[flushing_key, self.KEY, self.FLUSHING])
+            logger.warning("Recovered votes from an abandoned flush", key=flushing_key, fields=fields)
+        return len(stale)
+
+
+class VoteAggregator:
+    """Buffer vote deltas and flush them to papers in periodic batches"""
+
+    def __init__(self):
+        self.enabled = settings.VOTE_WRITE_BEHIND
+        self.interval = settings.VOTE_FLUSH_INTERVAL_SECONDS
+        self.buffer = None
+        self._task: Optional[asyncio.Task] = None
+
+        if self.enabled:
+            if settings.VOTE_WRITE_BEHIND_BACKEND == "redis":
+                self.buffer = RedisVoteBuffer(settings.REDIS_URL)
+            else:
+                self.buffer = MemoryVoteBuffer()
+
+    async def add(self, paper_id: str, up: int, down: int) -> None:
+        await self.buffer.add(paper_id, up, down)
+
+    async def pending(self, paper_ids: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+        """Pending (up, down) deltas for the given papers"""
+        if not self.enabled:
+            return {}
+        return await self.buffer.pending(paper_ids)
+
+    async def merge_pending(self, papers: Iterable) -> None:
+        """
+        Add pending deltas to loaded papers so reads stay fresh. ORM
+        instances are updated without being marked dirty, so the merged
+        counts are never written back by the session.
+        """
+        if not self.enabled:
+            return
+        papers = [p for p in papers if p is not None]
+        # Response models carry UUID ids; the buffers are keyed by str
+        pending = await self.buffer.pending({str(p.id) for p in papers})
+        for paper in papers:
+            if str(paper.id) not in pending:
+                continue
+            up, down = pending[str(paper.id)]
+            for attr, delta in (("community_upvotes", up), ("community_downvotes", down)):
+                if not isinstance(paper, Paper) and not hasattr(paper, attr):
+                    continue  # Sparse fieldset without vote counters
+                value = max((getattr(paper, attr) or 0) + delta, 0)
+                if isinstance(paper, Paper):
+                    set_committed_value(paper, attr, value)
+                else:
+                    setattr(paper, attr, value)
+
+    async def flush(self) -> int:
+        """Apply all pending deltas in one batched UPDATE. Returns papers updated."""
+        if not self.enabled:
+            return 0
+
+        await self.buffer.recover()
+        deltas = await self.buffer.drain()
+        deltas = {pid: (up, down) for pid, (up, down) in deltas.items() if up or down}
+        if not deltas:
+            await self.buffer.ack()
+            return 0
+
+        from app.db.session import AsyncSessionLocal
+
+        ids = sorted(deltas)
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    FLUSH_DELTAS_SQL,
+                    {
+                        "ids": ids,
+                        "ups": [deltas[pid][0] for pid in ids],
+                        "downs": [deltas[pid][1] for pid in ids],
+                    },
+                )
+                rows = result.mappings().all()
+
+                # Re-evaluate visibility once per paper per flush
+                changed = {}
+                for row in rows:
+                    tier = _tier_for_row(row)
+                    if tier.value != row["visibility_tier"]:
+                        changed[row["id"]] = tier.value
+                if changed:
+                    await db.execute(
+                        UPDATE_TIERS_SQL,
+                        {"ids": list(changed), "tiers": list(changed.values())},
+                    )
+
+                await db.commit()
+        except Exception:
+            await self.buffer.restore(deltas)
+            raise
+        await self.buffer.ack()
+
+        # Cached responses hold pre-flush counters and no longer have pending deltas
+        await paper_cache.invalidate(ids)
+
+        logger.info("Flushed vote deltas", papers=len(rows), tier_changes=len(changed))
+        return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Vote flush failed, deltas kept for retry", error=str(e))
+
+    def start(self) -> None:
+        """Start the periodic flusher (call from the app lifespan)"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write out anything still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+# Singleton instance
+vote_aggregator = VoteAggregator()
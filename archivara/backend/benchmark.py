@@ -0,0 +1,289 @@
+"""Benchmark the API hot paths in-process against a Postgres database seeded by seed_corpus.py"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Settings are read at import time; the benchmark measures the endpoints,
+# not the rate limiter, so disable it unless explicitly configured.
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+SCENARIOS = ["list_papers", "get_feed", "get_paper", "get_author", "vote_on_paper", "submit_paper", "graphql_page"]
+
+# One page render as the frontend sends it: ids bound through a variable
+GRAPHQL_PAGE_QUERY = """
+query Page($ids: [ID!]!) {
+  papers(ids: $ids) {
+    id title myVote
+    authors { name stats { hIndex } }
+    moderation { visibilityTier }
+  }
+}
+"""
+GRAPHQL_PAGE_SIZE = 20
+
+CATEGORIES = ["cs.LG", "cs.AI", "cs.CL", "cs.CV", "stat.ML", "math.OC", "q-bio.NC", "physics.comp-ph"]
+WORDS = (
+    "model learning neural training data language graph network optimization inference "
+    "benchmark agent reasoning transformer retrieval diffusion sparse scaling robust causal"
+).split()
+
+# Smallest well-formed PDF; moderation only needs bytes to encode
+PDF_BYTES = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[]/Count 0>>endobj\ntrailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+async def load_ids(Session, limit: int) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Ids of synthetic rows from seed_corpus.py; ids are uuid5 hashes, so the
+    first `limit` by id are a spread-out sample rather than the newest rows
+    """
+    from sqlalchemy import select
+
+    from app.models.paper import Author, Paper
+    from app.models.user import User
+    from seed_corpus import AUTHOR_MARKER, PAPER_MARKER, USER_MARKER
+
+    async with Session() as db:
+        papers = (await db.scalars(
+            select(Paper.id).where(Paper.arxiv_id.like(f"{PAPER_MARKER}%")).order_by(Paper.id).limit(limit)
+        )).all()
+        authors = (await db.scalars(
+            select(Author.id).where(Author.email.like(f"{AUTHOR_MARKER}%")).order_by(Author.id).limit(limit)
+        )).all()
+        users = (await db.scalars(
+            select(User.email).where(User.email.like(f"{USER_MARKER}%")).order_by(User.id).limit(limit)
+        )).all()
+    return list(papers), list(authors), list(users)
+
+
+def build_scenarios(paper_ids, author_ids, tokens, rng: random.Random) -> Dict[str, Callable[[], Tuple]]:
+    """Each scenario returns (method, url, request kwargs) for its next request"""
+    from seed_corpus import person_name
+
+    api = "/api/v1"
+    submitters = iter(range(10 ** 9))
+
+    def auth() -> Dict[str, str]:
+        return {"Authorization": f"Bearer {rng.choice(tokens)}"}
+
+    def submit():
+        # Rotate submitters so no one hits the per-user submission cooldown
+        token = tokens[next(submitters) % len(tokens)]
+        return "POST", f"{api}/papers/submit", dict(
+            headers={"Authorization": f"Bearer {token}"},
+            data={
+                "title": _text(rng, 10).capitalize(),
+                "abstract": _text(rng, 200),
+                "authors": json.dumps([{"name": person_name(rng.randrange(len(author_ids)))}]),
+                "categories": json.dumps(rng.sample(CATEGORIES, 2)),
+                "ai_tools": json.dumps(["benchmark"]),
+                "generation_method": "benchmark",
+            },
+            files={"pdf_file": ("paper.pdf", PDF_BYTES, "application/pdf")},
+        )
+
+    return {
+        "list_papers": lambda: ("GET", f"{api}/papers/", dict(params={"page": rng.randint(1, 5)})),
+        "get_feed": lambda: ("GET", f"{api}/moderation/feed", dict(params={"tier": "main", "page": rng.randint(1, 3)})),
+        "get_paper": lambda: ("GET", f"{api}/papers/{rng.choice(paper_ids)}", {}),
+        "get_author": lambda: ("GET", f"{api}/authors/{rng.choice(author_ids)}", {}),
+        "vote_on_paper": lambda: (
+            "POST",
+            f"{api}/moderation/papers/{rng.choice(paper_ids)}/vote",
+            dict(headers=auth(), json={"vote": rng.choice([1, -1])}),
+        ),
+        "submit_paper": submit,
+        "graphql_page": lambda: (
+            "POST",
+            f"{api}/graphql",
+            dict(headers=auth(), json={
+                "query": GRAPHQL_PAGE_QUERY,
+                "variables": {"ids": rng.sample(paper_ids, min(GRAPHQL_PAGE_SIZE, len(paper_ids)))},
+            }),
+        ),
+    }
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+async def run_scenario(client, next_request, requests: int, concurrency: int, sql_counter: List[int]) -> Dict:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        method, url, kwargs = next_request()
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                status = str(response.status_code)
+                if url.endswith("/graphql") and response.is_success and response.json().get("errors"):
+                    # e.g. rejected by the complexity limit, still HTTP 200
+                    status = "graphql_errors"
+            except Exception as e:
+                # Counted under errors; one failure must not abort the run
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+        statuses[status] = statuses.get(status, 0) + 1
+
+    statements_before = sql_counter[0]
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    statements = sql_counter[0] - statements_before
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+        "sql_per_request": round(statements / requests, 2),
+        "statuses": statuses,
+        "errors": sum(n for code, n in statuses.items() if not code.startswith("2")),
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: Dict[str, Dict], baseline: Optional[Dict] = None) -> None:
+    print(f"{'scenario':<15}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'sql/req':>9}{'errors':>8}")
+    for name, r in results.items():
+        print(f"{name:<15}{r['rps']:>9}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}"
+              f"{r['sql_per_request']:>9}{r['errors']:>8}")
+        old = (baseline or {}).get(name)
+        if old:
+            deltas = [
+                f"{key} {(r[key] - old[key]) / old[key] * 100:+.1f}%"
+                for key in ("rps", "p50_ms", "p95_ms", "p99_ms", "sql_per_request")
+                if old.get(key)
+            ]
+            print(f"{'':<15}vs baseline: {', '.join(deltas)}")
+
+
+async def benchmark(args) -> bool:
+    """Warm up and drive each scenario; write JSON results"""
+    if not os.getenv("DATABASE_URL"):
+        print("ERROR: DATABASE_URL not set")
+        return False
+
+    import httpx
+    from sqlalchemy import event
+
+    from app.core.security import create_access_token
+    from app.db.session import AsyncSessionLocal, engine, replica_router
+    from app.main import app
+    from app.services.readiness import readiness
+
+    rng = random.Random(args.seed)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    try:
+        paper_ids, author_ids, emails = await load_ids(AsyncSessionLocal, args.sample)
+        if not paper_ids or not author_ids or not emails:
+            print("ERROR: No synthetic data; run seed_corpus.py first")
+            return False
+
+        # Count statements on the primary and every replica
+        sql_counter = [0]
+
+        def count_statement(*_):
+            sql_counter[0] += 1
+
+        for sync_engine in [engine.sync_engine, *(r.engine.sync_engine for r in replica_router.replicas)]:
+            event.listen(sync_engine, "before_cursor_execute", count_statement)
+
+        tokens = [create_access_token({"sub": email}) for email in emails]
+        scenarios = build_scenarios(paper_ids, author_ids, tokens, rng)
+        selected = args.scenario or SCENARIOS
+
+        results = {}
+        async with app.router.lifespan_context(app):
+            # Lifespan starts the readiness warm-up; keep its traffic out of the measurements
+            await readiness.wait()
+            # App exceptions become 500 responses (counted as errors) instead of aborting the run
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for name in selected:
+                    if args.warmup:
+                        await run_scenario(client, scenarios[name], args.warmup, args.concurrency, sql_counter)
+                    results[name] = await run_scenario(
+                        client, scenarios[name], args.requests, args.concurrency, sql_counter
+                    )
+                    print(f"  {name}: {results[name]['rps']} req/s")
+
+    except Exception as e:
+        print(f"ERROR: Benchmark failed: {e}")
+        return False
+
+    finally:
+        await engine.dispose()
+
+    print_results(results, baseline)
+    report = {
+        "revision": git_revision(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "papers": len(paper_ids),
+            "authors": len(author_ids),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+    return all(r["errors"] == 0 for r in results.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Run only these (repeatable)")
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per scenario (> 0)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight")
+    parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests per scenario")
+    parser.add_argument("--sample", type=int, default=10000, help="Synthetic papers/authors/users to draw requests from")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the request mix")
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--compare", help="Baseline results JSON to diff against")
+    args = parser.parse_args()
+
+    success = asyncio.run(benchmark(args))
+    exit(0 if success else 1)
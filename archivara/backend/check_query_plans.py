@@ -0,0 +1,205 @@
+"""EXPLAIN the hot read queries and fail if any of them cannot use an index"""
+import argparse
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import desc, or_, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.db.filters import jsonb_contains_all, jsonb_contains_any
+from app.models.paper import (
+    BaselineStatus,
+    Paper,
+    PaperStatus,
+    SubmissionAttempt,
+    VisibilityTier,
+    paper_authors,
+)
+from app.services.oai_pmh import HarvestState, _harvest_query
+from app.services.paper_cards import card_query
+
+# Tables large enough that a sequential scan on the hot path is a bug
+LARGE_TABLES = {"papers", "paper_authors", "submission_attempts"}
+
+SAMPLE_ID = "00000000-0000-0000-0000-000000000000"
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement>, keeping its bind parameters"""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def hot_queries():
+    """(name, statement, indexes expected in the plan), mirroring the endpoints"""
+    feed = (
+        card_query()
+        .where(Paper.status != "rejected")
+        .where(or_(
+            Paper.visibility_tier == VisibilityTier.MAIN,
+            Paper.visibility_tier == VisibilityTier.FRONTPAGE,
+        ))
+        .where(Paper.baseline_status != BaselineStatus.REJECT)
+        .where(Paper.flag_count < 5)
+        .order_by(desc(Paper.quality_score + Paper.community_upvotes - Paper.community_downvotes))
+        .limit(20)
+    )
+    return [
+        ("moderation feed", feed, {"ix_papers_feed_score"}),
+        (
+            "list papers",
+            card_query().order_by(Paper.created_at.desc()).limit(20),
+            {"ix_papers_created_at"},
+        ),
+        (
+            "list papers by status",
+            card_query().where(Paper.status == PaperStatus.PUBLISHED).order_by(Paper.created_at.desc()).limit(20),
+            {"ix_papers_status_created_at"},
+        ),
+        (
+            "list papers by category",
+            card_query().where(jsonb_contains_any(Paper.categories, ["cs.LG", "cs.AI"])).limit(20),
+            {"ix_papers_categories_gin"},
+        ),
+        (
+            "list papers by tag",
+            card_query().where(jsonb_contains_all(Paper.tags, ["benchmark"])).limit(20),
+            {"ix_papers_tags_gin"},
+        ),
+        (
+            "my submissions",
+            select(Paper.id).where(Paper.submitter_id == SAMPLE_ID).order_by(Paper.created_at.desc()),
+            {"ix_papers_submitter_created_at"},
+        ),
+        (
+            "author recent papers",
+            select(Paper.id)
+            .join(paper_authors)
+            .where(paper_authors.c.author_id == SAMPLE_ID)
+            .order_by(Paper.published_at.desc())
+            .limit(10),
+            {"ix_paper_authors_author_id"},
+        ),
+        (
+            "paper by id",
+            select(Paper.id).where(Paper.id == SAMPLE_ID),
+            {"papers_pkey"},
+        ),
+        (
+            "OAI-PMH harvest page",
+            _harvest_query(
+                HarvestState("oai_dc", after=(datetime.now(timezone.utc), SAMPLE_ID)),
+                with_metadata=False,
+                limit=100,
+            ),
+            {"ix_papers_updated_at_id"},
+        ),
+        (
+            "review queue",
+            select(Paper.id)
+            # Bare column, matching the partial index's WHERE needs_review;
+            # IS TRUE would not imply it and the index would be skipped
+            .where(Paper.needs_review)
+            .order_by(Paper.flag_count.desc(), Paper.created_at)
+            .limit(50),
+            {"ix_papers_needs_review"},
+        ),
+        (
+            "recent rejected submissions",
+            select(SubmissionAttempt.id)
+            .where(
+                SubmissionAttempt.user_id == SAMPLE_ID,
+                SubmissionAttempt.status == "rejected",
+                SubmissionAttempt.created_at >= datetime.now(timezone.utc) - timedelta(days=1),
+            )
+            .order_by(SubmissionAttempt.created_at.desc()),
+            {"ix_submission_attempts_user_status_created"},
+        ),
+    ]
+
+
+def plan_nodes(node):
+    """Flatten an EXPLAIN JSON plan tree"""
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def problems(plan, expected_indexes):
+    nodes = list(plan_nodes(plan))
+    found = []
+    for node in nodes:
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in LARGE_TABLES:
+            found.append(f"sequential scan on {node['Relation Name']}")
+    used = {node["Index Name"] for node in nodes if "Index Name" in node}
+    for index in sorted(expected_indexes - used):
+        found.append(f"{index} not used (used: {', '.join(sorted(used)) or 'none'})")
+    return found
+
+
+async def check(verbose: bool) -> bool:
+    """EXPLAIN each query with sequential scans priced out and report the plans"""
+    db_url = os.getenv("DATABASE_URL")
+
+    if not db_url:
+        print("ERROR: DATABASE_URL not set")
+        return False
+
+    # Convert to asyncpg if needed
+    if db_url.startswith("postgresql://"):
+        db_url = db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    engine = create_async_engine(db_url)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    failures = 0
+    try:
+        async with Session() as db:
+            # On a small dev database a sequential scan is always cheapest;
+            # pricing it out makes the planner show whether an index *can*
+            # serve the query, independent of table size.
+            await db.execute(text("SET LOCAL enable_seqscan = off"))
+            for name, statement, expected in hot_queries():
+                result = await db.execute(Explain(statement))
+                plan = result.scalar()[0]["Plan"]
+                issues = problems(plan, expected)
+                print(f"{'FAIL' if issues else 'ok  '} {name}")
+                for issue in issues:
+                    print(f"       {issue}")
+                if verbose:
+                    for node in plan_nodes(plan):
+                        target = node.get("Index Name") or node.get("Relation Name") or ""
+                        print(f"       - {node['Node Type']} {target}".rstrip())
+                failures += bool(issues)
+            await db.rollback()
+
+    except Exception as e:
+        print(f"ERROR: Failed to explain queries: {e}")
+        return False
+
+    finally:
+        await engine.dispose()
+
+    if failures:
+        print(f"{failures} quer{'y' if failures == 1 else 'ies'} without a usable index")
+    return failures == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--verbose", action="store_true", help="Print every plan node")
+    args = parser.parse_args()
+
+    success = asyncio.run(check(args.verbose))
+    exit(0 if success else 1)
@@ -0,0 +1,86 @@
+"""Export the paper catalogue as NDJSON or CSV (optionally gzipped) with flat memory use"""
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.services.export import ExportFilters, parse_columns, stream_export
+
+
+async def export_papers(args) -> bool:
+    """Stream matching papers to a file or stdout"""
+    db_url = os.getenv("DATABASE_URL")
+
+    if not db_url:
+        print("ERROR: DATABASE_URL not set", file=sys.stderr)
+        return False
+
+    # Convert to asyncpg if needed
+    if db_url.startswith("postgresql://"):
+        db_url = db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    try:
+        columns = parse_columns(args.columns)
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return False
+
+    filters = ExportFilters(
+        status=args.status,
+        visibility_tier=args.visibility_tier,
+        categories=args.category,
+        updated_since=datetime.fromisoformat(args.updated_since) if args.updated_since else None,
+        updated_until=datetime.fromisoformat(args.updated_until) if args.updated_until else None,
+        min_quality=args.min_quality,
+        public_only=args.public_only,  # Operators see every paper unless they ask otherwise
+    )
+    compress = args.gzip or (args.output or "").endswith(".gz")
+
+    engine = create_async_engine(db_url)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+
+    try:
+        written = 0
+        async for chunk in stream_export(
+            columns, filters, fmt=args.format, compress=compress, session_factory=Session
+        ):
+            out.write(chunk)
+            written += len(chunk)
+        out.flush()
+        print(f"Wrote {written} bytes", file=sys.stderr)
+        return True
+
+    except Exception as e:
+        print(f"ERROR: Export failed: {e}", file=sys.stderr)
+        return False
+
+    finally:
+        if args.output:
+            out.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-o", "--output", help="Output file (stdout if omitted; .gz implies --gzip)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--columns", help="Comma-separated column projection")
+    parser.add_argument("--status")
+    parser.add_argument("--visibility-tier")
+    parser.add_argument("--category", action="append", help="Match any of these (repeatable)")
+    parser.add_argument("--updated-since", help="ISO timestamp")
+    parser.add_argument("--updated-until", help="ISO timestamp")
+    parser.add_argument("--min-quality", type=int)
+    parser.add_argument(
+        "--public-only", action="store_true",
+        help="Only papers the public export serves (not rejected, not hidden)",
+    )
+    args = parser.parse_args()
+
+    success = asyncio.run(export_papers(args))
+    exit(0 if success else 1)
@@ -0,0 +1,231 @@
+"""
+Local stand-in for the OpenRouter chat completions API, for load-testing moderation offline.
+
+Run it and point the backend at it:
+
+    python fake_openrouter.py --port 8100 --latency lognormal:1200,0.6 --error-rate 0.01 --rate-limit-rate 0.02
+    OPENROUTER_BASE_URL=http://127.0.0.1:8100 OPENROUTER_API_KEY=fake uvicorn app.main:app
+
+Replies are canned JSON matching the prompts in app/services/openrouter.py
+(quality analysis, LLM-babble detection, spam check), chosen from the system
+message and seeded from the request, so the same submission gets the same
+scores across runs. `"stream": true` is answered with server-sent events.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Latency distribution in milliseconds, returned as a sampler of seconds:
+    fixed:MS, uniform:LO,HI, normal:MEAN,SD, lognormal:MEDIAN,SIGMA
+    """
+    kind, _, raw = spec.partition(":")
+    params = [float(p) for p in raw.split(",") if p]
+    samplers = {
+        "fixed": (1, lambda rng, ms: ms),
+        "uniform": (2, lambda rng, lo, hi: rng.uniform(lo, hi)),
+        "normal": (2, lambda rng, mean, sd: rng.gauss(mean, sd)),
+        "lognormal": (2, lambda rng, median, sigma: median * rng.lognormvariate(0, sigma)),
+    }
+    if kind not in samplers or len(params) != samplers[kind][0]:
+        raise ValueError(f"Invalid latency spec {spec!r}; e.g. fixed:800, uniform:200,900, lognormal:1200,0.6")
+    sample = samplers[kind][1]
+    return lambda rng: max(0.0, sample(rng, *params)) / 1000
+
+
+@dataclass
+class FakeConfig:
+    latency: Callable[[random.Random], float]
+    error_rate: float = 0.0  # Fraction answered with a 5xx
+    rate_limit_rate: float = 0.0  # Fraction answered with a 429
+    rpm: int = 0  # Requests per minute before every call gets a 429; 0 is unlimited
+    malformed_rate: float = 0.0  # Fraction whose content is not valid JSON
+    stream_chunk_chars: int = 40
+    seed: int = 0
+
+
+def _text(content) -> str:
+    """Flatten OpenAI-style message content (string or list of parts)"""
+    if isinstance(content, str):
+        return content
+    return "\n".join(part.get("text", "") for part in content or [] if isinstance(part, dict))
+
+
+def canned_reply(messages: List[Dict], rng: random.Random) -> Dict:
+    """A reply in the JSON shape the matching prompt asks for"""
+    system = _text(messages[0].get("content")) if messages else ""
+    if "quality assessment" in system:
+        scores = {
+            "abstract_quality": rng.randint(6, 15),
+            "methodology": rng.randint(5, 15),
+            "research_question": rng.randint(4, 10),
+            "results": rng.randint(5, 15),
+            "structure": rng.randint(4, 10),
+            "novelty": rng.randint(4, 15),
+            "technical_depth": rng.randint(3, 10),
+            "writing_quality": rng.randint(4, 10),
+        }
+        return {
+            "quality_score": sum(scores.values()),
+            "category_scores": scores,
+            "strengths": ["Clear problem statement", "Reproducible setup"][: rng.randint(1, 2)],
+            "weaknesses": ["Limited baselines", "Small evaluation set"][: rng.randint(0, 2)],
+            "suggestions": ["Add ablations"],
+        }
+    if "content detection" in system:
+        babble = rng.random() < 0.1
+        return {
+            "is_llm_babble": babble,
+            "confidence": round(rng.uniform(0.6, 0.95) if babble else rng.uniform(0.0, 0.3), 2),
+            "red_flags": ["High buzzword density"] if babble else [],
+            "reasoning": "Generic claims without methodology" if babble else "Concrete methods and results",
+            "detected_patterns": ["delve", "paradigm shift"] if babble else [],
+        }
+    if "spam detection" in system:
+        spam = rng.random() < 0.02
+        return {
+            "is_spam": spam,
+            "confidence": round(rng.uniform(0.7, 0.99) if spam else rng.uniform(0.0, 0.2), 2),
+            "reasons": ["Promotional language"] if spam else [],
+        }
+    return {"reply": "ok"}
+
+
+def completion(model: str, content: str, prompt_chars: int) -> Dict:
+    prompt_tokens = prompt_chars // 4
+    completion_tokens = len(content) // 4
+    return {
+        "id": f"gen-{uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "provider": "fake",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content},
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def error(status: int, message: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    return JSONResponse({"error": {"code": status, "message": message}}, status_code=status, headers=headers)
+
+
+def create_app(config: FakeConfig) -> FastAPI:
+    app = FastAPI(title="Fake OpenRouter")
+    rng = random.Random(config.seed)
+    window = {"started": time.monotonic(), "count": 0}
+    stats = {"requests": 0, "errors": 0, "rate_limited": 0, "malformed": 0, "streamed": 0}
+
+    def rate_limited() -> bool:
+        if config.rpm <= 0:
+            return False
+        now = time.monotonic()
+        if now - window["started"] >= 60:
+            window.update(started=now, count=0)
+        window["count"] += 1
+        return window["count"] > config.rpm
+
+    async def stream(completion_body: Dict, content: str) -> AsyncIterator[str]:
+        yield ": OPENROUTER PROCESSING\n\n"
+        size = max(1, config.stream_chunk_chars)
+        for i in range(0, len(content), size):
+            chunk = {
+                "id": completion_body["id"],
+                "object": "chat.completion.chunk",
+                "created": completion_body["created"],
+                "model": completion_body["model"],
+                "choices": [{"index": 0, "delta": {"content": content[i:i + size]}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(0)
+        final = {**completion_body, "object": "chat.completion.chunk", "choices": [
+            {"index": 0, "delta": {}, "finish_reason": "stop"}
+        ]}
+        yield f"data: {json.dumps(final)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    async def chat_completions(request: Request):
+        stats["requests"] += 1
+        payload = await request.json()
+        messages = payload.get("messages") or []
+        if not request.headers.get("authorization", "").startswith("Bearer "):
+            return error(401, "No auth credentials found")
+
+        await asyncio.sleep(config.latency(rng))
+
+        if rate_limited() or rng.random() < config.rate_limit_rate:
+            stats["rate_limited"] += 1
+            return error(429, "Rate limit exceeded", headers={"Retry-After": "1"})
+        if rng.random() < config.error_rate:
+            stats["errors"] += 1
+            status = rng.choice([500, 502, 503])
+            return error(status, "Upstream provider error")
+
+        # Same prompt and seed -> same reply, regardless of request order
+        prompt = json.dumps(messages, sort_keys=True)
+        digest = hashlib.sha256(f"{config.seed}:{prompt}".encode()).digest()
+        reply_rng = random.Random(digest)
+        if reply_rng.random() < config.malformed_rate:
+            stats["malformed"] += 1
+            content = "I'm sorry, I can't produce JSON for this paper."
+        else:
+            content = json.dumps(canned_reply(messages, reply_rng))
+
+        body = completion(payload.get("model", "fake/model"), content, len(prompt))
+        if payload.get("stream"):
+            stats["streamed"] += 1
+            return StreamingResponse(stream(body, content), media_type="text/event-stream")
+        return body
+
+    # Accept both base URL forms: http://host:port and http://host:port/api/v1
+    for path in ("/chat/completions", "/api/v1/chat/completions"):
+        app.add_api_route(path, chat_completions, methods=["POST"])
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake OpenRouter chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default="lognormal:1200,0.6", help="fixed:MS | uniform:LO,HI | normal:MEAN,SD | lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 5xx responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of random 429 responses")
+    parser.add_argument("--rpm", type=int, default=0, help="Requests per minute before 429s (0 = unlimited)")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Fraction of non-JSON replies")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = FakeConfig(
+        latency=parse_latency(args.latency),
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        rpm=args.rpm,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
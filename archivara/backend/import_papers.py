@@ -0,0 +1,81 @@
+"""Bulk import paper metadata from a JSONL/CSV file (optionally gzipped)"""
+import argparse
+import asyncio
+import os
+import time
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.paper import PaperStatus, VisibilityTier
+from app.services.bulk_import import BulkImportService
+
+
+async def import_papers(args) -> bool:
+    """Create (or resume) an import job and run it to completion"""
+    db_url = os.getenv("DATABASE_URL")
+
+    if not db_url:
+        print("ERROR: DATABASE_URL not set")
+        return False
+
+    # Convert to asyncpg if needed
+    if db_url.startswith("postgresql://"):
+        db_url = db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    engine = create_async_engine(db_url)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    try:
+        async with Session() as db:
+            service = BulkImportService(db, batch_size=args.batch_size)
+            if args.resume:
+                job_id = args.resume
+                print(f"Resuming import job {job_id}...")
+            else:
+                fmt = args.format or ("csv" if ".csv" in args.path else "jsonl")
+                job = await service.create_job(
+                    os.path.abspath(args.path), fmt,
+                    status=args.status, visibility_tier=args.visibility_tier,
+                )
+                job_id = job.id
+                print(f"Started import job {job_id} (resume with --resume {job_id})")
+
+            start = time.perf_counter()
+            job = await service.run(job_id)
+            elapsed = time.perf_counter() - start
+
+        print(f"Processed {job.records_processed} records in {elapsed:.1f}s")
+        print(f"Inserted: {job.inserted}, duplicates: {job.duplicates}, failed: {job.failed}")
+        for error in (job.errors or [])[:10]:
+            print(f"  line {error['line']}: {error['error'][:200]}")
+        return True
+
+    except Exception as e:
+        print(f"ERROR: Import failed: {e}")
+        return False
+
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?", help="JSONL/CSV file (.gz supported)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Defaults from the file name")
+    parser.add_argument("--resume", metavar="JOB_ID", help="Resume an interrupted import job")
+    parser.add_argument("--batch-size", type=int, default=None, help="Records per COPY batch")
+    parser.add_argument(
+        "--status", default="published", choices=[s.value for s in PaperStatus],
+        help="Status for imported papers",
+    )
+    parser.add_argument(
+        "--visibility-tier", default="main", choices=[t.value for t in VisibilityTier],
+        help="Visibility tier for imported papers",
+    )
+    args = parser.parse_args()
+
+    if not args.path and not args.resume:
+        parser.error("a file path or --resume JOB_ID is required")
+
+    success = asyncio.run(import_papers(args))
+    exit(0 if success else 1)
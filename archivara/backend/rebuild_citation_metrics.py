@@ -0,0 +1,46 @@
+"""Rebuild citation links, paper citation counts and author h-index from scratch"""
+import argparse
+import asyncio
+import os
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.services.citations import CitationService
+
+
+async def rebuild(batch_size: int) -> bool:
+    """Relink citations to hosted papers, recount, and refresh author stats in batches"""
+    db_url = os.getenv("DATABASE_URL")
+
+    if not db_url:
+        print("ERROR: DATABASE_URL not set")
+        return False
+
+    # Convert to asyncpg if needed
+    if db_url.startswith("postgresql://"):
+        db_url = db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    engine = create_async_engine(db_url)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    try:
+        async with Session() as db:
+            authors = await CitationService(db).rebuild(batch_size=batch_size)
+        print(f"Rebuilt citation metrics for {authors} authors")
+        return True
+
+    except Exception as e:
+        print(f"ERROR: Failed to rebuild citation metrics: {e}")
+        return False
+
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=500, help="Authors refreshed per transaction")
+    args = parser.parse_args()
+
+    success = asyncio.run(rebuild(args.batch_size))
+    exit(0 if success else 1)
@@ -0,0 +1,390 @@
+"""Generate a deterministic synthetic corpus and bulk-load it with parallel COPY"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Rows are recognisable by these markers (benchmark.py samples them)
+PAPER_MARKER = "synth."  # papers.arxiv_id prefix
+USER_MARKER = "synth-"  # users.email prefix
+AUTHOR_MARKER = "synth-author-"  # authors.email prefix
+
+# Papers link to a PDF here (never fetched; the API only redirects to it)
+PDF_BASE_URL = "https://example.com/synth"
+
+# Fixed reference time, so the same seed produces identical rows on every run
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+CATEGORIES = [
+    "cs.LG", "cs.AI", "cs.CL", "cs.CV", "stat.ML", "cs.RO", "cs.IR", "cs.NE", "cs.CR", "cs.DC",
+    "cs.SE", "cs.HC", "math.OC", "math.ST", "math.PR", "q-bio.NC", "q-bio.QM", "physics.comp-ph",
+    "cond-mat.dis-nn", "astro-ph.IM", "econ.EM", "eess.SP", "eess.IV", "quant-ph",
+]
+VOCABULARY = (
+    "model learning neural training data language graph network optimization inference benchmark "
+    "agent reasoning transformer retrieval diffusion sparse scaling robust causal evaluation dataset "
+    "representation attention gradient convergence stochastic bayesian policy reward simulation "
+    "generalization adversarial contrastive embedding latent variational kernel spectral federated "
+    "distributed efficient approximate bound theorem analysis empirical framework method approach "
+    "results performance accuracy baseline ablation architecture layer parameter loss objective "
+    "we propose show demonstrate novel improved existing prior work study the of and for with in on "
+    "a to by from using across under via towards between"
+).split()
+FIRST_NAMES = "Ada Alan Grace Claude Barbara John Margaret Edsger Donald Frances Leslie Radia Tim Shafi Yoshua Fei-Fei Geoffrey Daphne Judea Cynthia".split()
+LAST_NAMES = "Lovelace Turing Hopper Shannon Liskov McCarthy Hamilton Dijkstra Knuth Allen Lamport Perlman Berners-Lee Goldwasser Bengio Li Hinton Koller Pearl Dwork".split()
+AI_TOOLS = ["gpt-4o", "claude-3.5-sonnet", "gemini-1.5-pro", "llama-3-70b", "copilot", "cursor"]
+FLAG_REASONS = ["spam", "plagiarism", "low-quality", "other"]
+MAX_AUTHOR_WEIGHT = 1000
+
+PAPER_COLUMNS = [
+    "id", "title", "abstract", "arxiv_id", "published_at", "created_at", "updated_at", "pdf_url",
+    "categories", "tags", "generation_method", "metadata", "status", "submitter_id",
+    "baseline_status", "baseline_checks", "quality_score", "needs_review", "red_flags",
+    "community_upvotes", "community_downvotes", "flag_count", "citation_count",
+    "cited_by_count", "visibility_tier",
+]
+
+
+def entity_id(seed: int, kind: str, index: int) -> str:
+    """Stable id for the index-th user/author/paper of a seed"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"archivara-synth:{seed}:{kind}:{index}"))
+
+
+def chunk_rng(seed: int, kind: int, chunk: int) -> np.random.Generator:
+    """Each chunk has its own stream, so output doesn't depend on worker count"""
+    return np.random.default_rng([seed, kind, chunk])
+
+
+def zipf_cdf(n: int, s: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** s
+    return np.cumsum(weights) / weights.sum()
+
+
+def author_cdf(seed: int, authors: int, exponent: float) -> np.ndarray:
+    """
+    Author productivity follows Lotka's law: each author's weight is drawn
+    from a Zipf distribution (capped), and bylines sample authors in
+    proportion to it. Unlike rank-Zipf, the most prolific author's share
+    doesn't grow with corpus size.
+    """
+    weights = np.minimum(np.random.default_rng([seed, 0]).zipf(exponent, authors), MAX_AUTHOR_WEIGHT)
+    return np.cumsum(weights) / weights.sum()
+
+
+def sample(rng: np.random.Generator, cdf: np.ndarray, size: int) -> np.ndarray:
+    """Indexes 0..n-1 drawn according to a cumulative distribution"""
+    return np.minimum(np.searchsorted(cdf, rng.random(size)), len(cdf) - 1)
+
+
+def words(rng: np.random.Generator, count: int) -> str:
+    return " ".join(VOCABULARY[i] for i in rng.integers(0, len(VOCABULARY), count))
+
+
+def random_uuid(rng: np.random.Generator) -> str:
+    return str(uuid.UUID(bytes=rng.bytes(16), version=4))
+
+
+def person_name(index: int) -> str:
+    first = FIRST_NAMES[index % len(FIRST_NAMES)]
+    last = LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    return f"{first} {last} {index}"
+
+
+def user_rows(config: Dict, chunk: int) -> Dict[str, List[Tuple]]:
+    start, stop = chunk * config["chunk_size"], min((chunk + 1) * config["chunk_size"], config["users"])
+    rng = chunk_rng(config["seed"], 1, chunk)
+    rows = []
+    for i in range(start, stop):
+        joined = EPOCH - timedelta(days=float(rng.uniform(0, 365 * config["years"])))
+        rows.append((
+            entity_id(config["seed"], "user", i), f"{USER_MARKER}{i}@example.com", person_name(i),
+            True, bool(rng.random() < 0.3), False, joined, joined,
+        ))
+    return {"users": rows}
+
+
+def author_rows(config: Dict, chunk: int) -> Dict[str, List[Tuple]]:
+    start, stop = chunk * config["chunk_size"], min((chunk + 1) * config["chunk_size"], config["authors"])
+    rng = chunk_rng(config["seed"], 2, chunk)
+    rows = []
+    for i in range(start, stop):
+        joined = EPOCH - timedelta(days=float(rng.uniform(0, 365 * config["years"])))
+        rows.append((
+            entity_id(config["seed"], "author", i), person_name(i), f"{AUTHOR_MARKER}{i}@example.com",
+            f"University {int(rng.integers(1, 500))}", bool(rng.random() < 0.05), joined, joined,
+        ))
+    return {"authors": rows}
+
+
+def paper_rows(config: Dict, chunk: int) -> Dict[str, List[Tuple]]:
+    """Papers with their bylines, votes and flags; counters match the rows"""
+    seed = config["seed"]
+    start, stop = chunk * config["chunk_size"], min((chunk + 1) * config["chunk_size"], config["papers"])
+    rng = chunk_rng(seed, 3, chunk)
+    authors = author_cdf(seed, config["authors"], config["zipf"])
+    category_cdf = zipf_cdf(len(CATEGORIES), 1.0)
+
+    papers, links, votes, flags = [], [], [], []
+    for i in range(start, stop):
+        paper_id = entity_id(seed, "paper", i)
+        published = EPOCH - timedelta(seconds=float(rng.uniform(0, 365 * 86400 * config["years"])))
+        updated = published + timedelta(hours=float(rng.exponential(48)))
+
+        # Mostly 1-5 authors per paper, drawn by productivity
+        byline_size = min(int(rng.geometric(0.4)) + int(rng.random() < 0.7), 15)
+        byline = list(dict.fromkeys(int(a) for a in sample(rng, authors, byline_size)))
+        links += [(paper_id, entity_id(seed, "author", a), order) for order, a in enumerate(byline)]
+
+        category_count = 1 + int(rng.random() < 0.5) + int(rng.random() < 0.2)
+        categories = list(dict.fromkeys(CATEGORIES[c] for c in sample(rng, category_cdf, category_count)))
+
+        quality = int(np.clip(rng.normal(58, 18), 0, 100))
+        rejected = quality < 15 and rng.random() < 0.8
+        baseline = "reject" if rejected else ("warn" if rng.random() < 0.1 else "pass")
+
+        # Heavy-tailed vote counts; upvote odds rise with quality
+        vote_count = min(int(rng.lognormal(0.8, 1.3)), config["users"])
+        voters = np.unique(rng.integers(0, config["users"], vote_count))
+        ups = downs = 0
+        for voter in voters:
+            vote = 1 if rng.random() < 0.35 + quality / 200 else -1
+            ups += vote == 1
+            downs += vote == -1
+            voted_at = updated + timedelta(hours=float(rng.exponential(72)))
+            votes.append((random_uuid(rng), paper_id, entity_id(seed, "user", int(voter)), vote, voted_at, voted_at))
+
+        flag_count = 0
+        if rng.random() < 0.04:
+            flaggers = np.unique(rng.integers(0, config["users"], int(rng.integers(1, 8))))
+            flag_count = len(flaggers)
+            for flagger in flaggers:
+                flagged_at = updated + timedelta(hours=float(rng.exponential(24)))
+                flags.append((
+                    random_uuid(rng), paper_id, entity_id(seed, "user", int(flagger)),
+                    FLAG_REASONS[int(rng.integers(0, len(FLAG_REASONS)))], None, "pending", flagged_at,
+                ))
+
+        net = ups - downs
+        if rejected:
+            tier = "raw"
+        elif quality >= 80 and net >= 5:
+            tier = "frontpage"
+        elif quality >= 40:
+            tier = "main"
+        else:
+            tier = "raw"
+
+        # Submissions keep the PDF (base64) in metadata; sizes vary by orders of magnitude
+        pdf_bytes = int(rng.lognormal(np.log(max(config["meta_kb"], 0.001) * 1024 * 0.75), 0.8)) if config["meta_kb"] else 0
+        meta = {"ai_tools": [AI_TOOLS[t] for t in np.unique(rng.integers(0, len(AI_TOOLS), 2))]}
+        if pdf_bytes:
+            meta["pdf_base64"] = base64.b64encode(rng.bytes(pdf_bytes)).decode()
+
+        papers.append((
+            paper_id,
+            words(rng, int(np.clip(rng.normal(11, 3), 4, 25))).capitalize(),
+            words(rng, int(np.clip(rng.lognormal(np.log(180), 0.3), 60, 450))).capitalize() + ".",
+            f"{PAPER_MARKER}{i:08d}",
+            published, published, updated,
+            f"{PDF_BASE_URL}/{paper_id}.pdf",
+            json.dumps(categories),
+            json.dumps([]),
+            "ai-assisted" if rng.random() < 0.7 else "ai-generated",
+            json.dumps(meta),
+            "rejected" if rejected else ("published" if rng.random() < 0.9 else "submitted"),
+            entity_id(seed, "user", int(rng.integers(0, config["users"]))),
+            baseline,
+            json.dumps({}),
+            quality,
+            flag_count >= 3 or baseline == "warn",
+            json.dumps(["High buzzword density"] if quality < 30 else []),
+            ups, downs, flag_count, 0, 0,
+            tier,
+        ))
+
+    return {"papers": papers, "paper_authors": links, "paper_votes": votes, "paper_flags": flags}
+
+
+TABLES = {
+    "users": ["id", "email", "full_name", "is_active", "is_verified", "is_superuser", "created_at", "updated_at"],
+    "authors": ["id", "name", "email", "affiliation", "is_ai_model", "created_at", "updated_at"],
+    "papers": PAPER_COLUMNS,
+    "paper_authors": ["paper_id", "author_id", "order"],
+    "paper_votes": ["id", "paper_id", "user_id", "vote", "created_at", "updated_at"],
+    "paper_flags": ["id", "paper_id", "user_id", "reason", "details", "status", "created_at"],
+}
+GENERATORS = {"users": user_rows, "authors": author_rows, "papers": paper_rows}
+
+
+async def _copy_chunk(dsn: str, rows: Dict[str, List[Tuple]]) -> Dict[str, int]:
+    import asyncpg
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        async with conn.transaction():
+            for table, records in rows.items():
+                if records:
+                    await conn.copy_records_to_table(table, records=records, columns=TABLES[table])
+    finally:
+        await conn.close()
+    return {table: len(records) for table, records in rows.items()}
+
+
+def load_chunk(dsn: str, kind: str, config: Dict, chunk: int) -> Dict[str, int]:
+    """Worker process: generate one chunk and COPY it in a single transaction"""
+    return asyncio.run(_copy_chunk(dsn, GENERATORS[kind](config, chunk)))
+
+
+def run_stage(pool: ProcessPoolExecutor, dsn: str, kind: str, config: Dict, total: int) -> Dict[str, int]:
+    chunks = (total + config["chunk_size"] - 1) // config["chunk_size"]
+    counts: Dict[str, int] = {}
+    futures = [pool.submit(load_chunk, dsn, kind, config, chunk) for chunk in range(chunks)]
+    for done, future in enumerate(futures, 1):
+        for table, n in future.result().items():
+            counts[table] = counts.get(table, 0) + n
+        print(f"  {kind}: {done}/{chunks} chunks", end="\r", flush=True)
+    print()
+    return counts
+
+
+async def derive(db_url: str) -> None:
+    """Materialize co-author edges and refresh author stats for the new rows"""
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.services.citations import CitationService
+
+    engine = create_async_engine(db_url)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with Session() as db:
+            await db.execute(text("""
+                INSERT INTO coauthor_edges (author_a, author_b, weight)
+                SELECT a.author_id, b.author_id, COUNT(*)
+                FROM paper_authors a
+                JOIN paper_authors b ON b.paper_id = a.paper_id AND a.author_id < b.author_id
+                JOIN papers p ON p.id = a.paper_id
+                WHERE p.arxiv_id LIKE :marker
+                GROUP BY a.author_id, b.author_id
+                ON CONFLICT (author_a, author_b) DO UPDATE
+                SET weight = coauthor_edges.weight + EXCLUDED.weight
+            """), {"marker": f"{PAPER_MARKER}%"})
+            await db.commit()
+            await CitationService(db).rebuild()
+    finally:
+        await engine.dispose()
+
+
+async def smoke_check(dsn: str) -> bool:
+    """Serve one synthetic paper through the API in-process; the benchmark needs these to be readable"""
+    import asyncpg
+    import httpx
+
+    from app.core.config import settings
+    from app.db.session import engine
+    from app.main import app
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        paper_id = await conn.fetchval(
+            "SELECT id FROM papers WHERE arxiv_id LIKE $1 ORDER BY id LIMIT 1", f"{PAPER_MARKER}%"
+        )
+    finally:
+        await conn.close()
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://seed") as client:
+            response = await client.get(f"{settings.API_V1_STR}/papers/{paper_id}")
+    finally:
+        await engine.dispose()
+    if response.status_code != 200:
+        print(f"ERROR: GET /papers/{paper_id} returned {response.status_code}: {response.text[:500]}")
+        return False
+    print(f"Smoke check passed: GET /papers/{paper_id} returned 200")
+    return True
+
+
+async def existing_rows(dsn: str) -> int:
+    import asyncpg
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        return await conn.fetchval(
+            "SELECT count(*) FROM (SELECT 1 FROM papers WHERE arxiv_id LIKE $1 LIMIT 1) s", f"{PAPER_MARKER}%"
+        )
+    finally:
+        await conn.close()
+
+
+def seed(args) -> bool:
+    """Load users, authors, then papers (with bylines, votes, flags) in parallel chunks"""
+    db_url = os.getenv("DATABASE_URL")
+
+    if not db_url:
+        print("ERROR: DATABASE_URL not set")
+        return False
+
+    # asyncpg takes a plain DSN; SQLAlchemy needs the asyncpg driver name
+    dsn = db_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+    if db_url.startswith("postgresql://"):
+        db_url = db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    config = {
+        "seed": args.seed,
+        "papers": args.papers,
+        "authors": args.authors or max(1, args.papers // 3),
+        "users": args.users,
+        "chunk_size": args.chunk_size,
+        "years": args.years,
+        "zipf": args.zipf,
+        "meta_kb": args.meta_kb,
+    }
+
+    try:
+        if asyncio.run(existing_rows(dsn)):
+            print("ERROR: Synthetic corpus already present; reset the database first")
+            return False
+
+        start = time.perf_counter()
+        counts: Dict[str, int] = {}
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            # Papers reference users and authors, so those stages finish first
+            for kind, total in (("users", config["users"]), ("authors", config["authors"]), ("papers", config["papers"])):
+                counts.update(run_stage(pool, dsn, kind, config, total))
+        print(f"Loaded in {time.perf_counter() - start:.1f}s: " + ", ".join(f"{n} {t}" for t, n in counts.items()))
+
+        if args.derive:
+            print("Deriving co-author edges and author stats...")
+            asyncio.run(derive(db_url))
+        return asyncio.run(smoke_check(dsn))
+
+    except Exception as e:
+        print(f"ERROR: Failed to seed corpus: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--papers", type=int, default=100_000)
+    parser.add_argument("--authors", type=int, default=0, help="Defaults to papers / 3")
+    parser.add_argument("--users", type=int, default=50_000, help="Submitters, voters and flaggers")
+    parser.add_argument("--zipf", type=float, default=2.0, help="Zipf (Lotka) exponent of author productivity, > 1")
+    parser.add_argument("--years", type=float, default=5, help="Publication dates span this many years")
+    parser.add_argument("--meta-kb", type=float, default=8, help="Median metadata size (PDF base64) per paper; 0 omits it")
+    parser.add_argument("--chunk-size", type=int, default=5_000, help="Rows per COPY transaction")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Parallel loader processes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--derive", action="store_true", help="Also build coauthor_edges and author_stats")
+    args = parser.parse_args()
+
+    success = seed(args)
+    exit(0 if success else 1)
@@ -8,6 +8,7 @@ echo "DATABASE_URL: ${DATABASE_URL:0:30}..."
 python -m alembic upgrade head
 
 echo "=== Migrations complete ==="
-echo "=== Starting uvicorn on port $PORT ==="
+echo "=== Starting server on port $PORT ==="
 
-uvicorn app.main:app --host 0.0.0.0 --port $PORT
+# exec so SIGTERM on deploy reaches the supervisor, which drains workers
+exec python -m app.server --host 0.0.0.0 --port $PORT
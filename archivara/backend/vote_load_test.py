@@ -0,0 +1,113 @@
+"""Load test for atomic vote counting: concurrent voters must not lose updates"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.paper import Paper, PaperVote
+from app.models.user import User
+from app.services.votes import VoteService, vote_aggregator
+
+
+async def run_load_test(voters: int, concurrency: int, revotes: float, seed: int) -> bool:
+    """Cast votes from `voters` users concurrently and verify the counters"""
+    db_url = os.getenv("DATABASE_URL")
+
+    if not db_url:
+        print("ERROR: DATABASE_URL not set")
+        return False
+
+    # Convert to asyncpg if needed
+    if db_url.startswith("postgresql://"):
+        db_url = db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    engine = create_async_engine(db_url, pool_size=concurrency, max_overflow=0)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    rng = random.Random(seed)
+    run_id = f"loadtest-{int(time.time())}"
+
+    # Seed one paper and the voting users
+    async with Session() as db:
+        paper = Paper(title=f"{run_id} paper", abstract="Vote load test paper " * 10)
+        db.add(paper)
+        users = [
+            User(email=f"{run_id}-{i}@example.com", full_name=f"Voter {i}")
+            for i in range(voters)
+        ]
+        db.add_all(users)
+        await db.commit()
+        paper_id = paper.id
+        user_ids = [u.id for u in users]
+
+    # Every voter votes once; a fraction change or remove their vote afterwards
+    operations = [(user_id, rng.choice([1, -1])) for user_id in user_ids]
+    operations += [
+        (user_id, rng.choice([1, -1, 0]))
+        for user_id in rng.sample(user_ids, int(voters * revotes))
+    ]
+    rng.shuffle(operations)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def vote(user_id: str, value: int):
+        async with semaphore:
+            start = time.perf_counter()
+            async with Session() as db:
+                vote_service = VoteService(db)
+                await vote_service.cast_vote(paper_id, user_id, value)
+                await vote_service.commit()
+            latencies.append(time.perf_counter() - start)
+
+    print(f"Casting {len(operations)} votes from {voters} users (concurrency={concurrency})...")
+    start = time.perf_counter()
+    await asyncio.gather(*(vote(user_id, value) for user_id, value in operations))
+    elapsed = time.perf_counter() - start
+
+    # Write-behind mode: apply buffered deltas before checking
+    if vote_aggregator.enabled:
+        await vote_aggregator.flush()
+
+    # Compare denormalized counters with the vote rows
+    async with Session() as db:
+        paper = await db.get(Paper, paper_id)
+        upvotes = await db.scalar(
+            select(func.count()).where(PaperVote.paper_id == paper_id, PaperVote.vote == 1)
+        )
+        downvotes = await db.scalar(
+            select(func.count()).where(PaperVote.paper_id == paper_id, PaperVote.vote == -1)
+        )
+
+        ok = paper.community_upvotes == upvotes and paper.community_downvotes == downvotes
+
+        latencies.sort()
+        print(f"Elapsed: {elapsed:.2f}s ({len(operations) / elapsed:.0f} votes/s)")
+        print(f"p50: {latencies[len(latencies) // 2] * 1000:.1f}ms, "
+              f"p99: {latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms")
+        print(f"Counters: +{paper.community_upvotes} / -{paper.community_downvotes}")
+        print(f"Rows:     +{upvotes} / -{downvotes}")
+        print("OK: no lost updates" if ok else "FAIL: counters drifted from vote rows")
+
+        # Clean up
+        await db.execute(delete(Paper).where(Paper.id == paper_id))
+        await db.execute(delete(User).where(User.id.in_(user_ids)))
+        await db.commit()
+
+    await engine.dispose()
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--voters", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--revotes", type=float, default=0.3, help="Fraction of voters who change their vote")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    success = asyncio.run(run_load_test(args.voters, args.concurrency, args.revotes, args.seed))
+    exit(0 if success else 1)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 import asyncio
-from app.database import get_db
+from app.db.session import get_db
 from app.models.paper import Paper
 from sqlalchemy import select
 